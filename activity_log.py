@@ -0,0 +1,87 @@
+"""Buffered writer for observer_activity_logs.
+
+Events are queued in-process and written by a background thread in bulk
+inserts, whenever batch_size events are waiting or flush_interval seconds have
+passed. Session-level events (e.g. login) can be deduplicated per session, and
+the queue is drained when the process exits.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogger:
+    def __init__(self, client, table='observer_activity_logs', batch_size=50, flush_interval=5.0,
+                 max_queue=10000, max_sessions=10000):
+        self.client = client
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_sessions = max_sessions
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._seen = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="activity-log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, event):
+        """Queue an event row for insertion; never blocks the caller"""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            logger.warning(f"Activity log queue full, dropping {event.get('action')} event")
+
+    def log_once(self, session_id, event):
+        """Queue an event only the first time its action is seen for this session"""
+        key = (session_id, event.get('action'))
+        with self._seen_lock:
+            if key in self._seen:
+                return False
+            self._seen[key] = True
+            while len(self._seen) > self.max_sessions:
+                self._seen.popitem(last=False)
+        self.log(event)
+        return True
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while not self._stopped.is_set():
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+        self._write(batch + self._drain())
+
+    def _drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _write(self, events):
+        for start in range(0, len(events), self.batch_size):
+            chunk = events[start:start + self.batch_size]
+            try:
+                self.client.table(self.table).insert(chunk).execute()
+            except Exception as e:
+                logger.error(f"Failed to write {len(chunk)} activity log rows: {str(e)}")
+
+    def close(self, timeout=10):
+        """Stop the flusher after writing everything still queued"""
+        if not self._stopped.is_set():
+            self._stopped.set()
+            self._thread.join(timeout)
@@ -4,11 +4,12 @@ import base64
 import json
 import uuid
 import calendar
+import tempfile
 from datetime import datetime, timedelta
+from functools import lru_cache
 from flask import Flask, request, jsonify, send_from_directory, abort
 from flask_cors import CORS
 from dotenv import load_dotenv
-import requests
 
 # Load .env
 load_dotenv()
@@ -28,12 +29,86 @@ GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 EMAIL_PASSWORD = os.environ.get("EMAIL_PASSWORD")
 ADMIN_USER = os.environ.get("ADMIN_USER", "admin")
 ADMIN_PASS = os.environ.get("ADMIN_PASS", "hello")
+OCR_CACHE_PATH = os.environ.get("OCR_CACHE_PATH")
+OCR_CACHE_TTL_SECONDS = int(os.environ.get("OCR_CACHE_TTL_SECONDS", 86400))
+OCR_CACHE_MAX_ENTRIES = int(os.environ.get("OCR_CACHE_MAX_ENTRIES", 256))
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", 7 * 86400))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 512))
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", ".cache/jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 4))
+# Finished jobs are deleted from the job store after this many hours (0 keeps them)
+JOB_RETENTION_HOURS = float(os.environ.get("JOB_RETENTION_HOURS", 168))
+# Unfinished jobs whose worker hasn't refreshed them for JOB_STALE_SECONDS are failed
+JOB_HEARTBEAT_SECONDS = float(os.environ.get("JOB_HEARTBEAT_SECONDS", 15))
+JOB_STALE_SECONDS = float(os.environ.get("JOB_STALE_SECONDS", 90))
+# gunicorn.conf.py recovers jobs once in the master and turns this off, so a
+# restarted worker never fails jobs that other workers are still running
+JOB_RECOVERY_ON_IMPORT = os.environ.get("JOB_RECOVERY_ON_IMPORT", "true").lower() == "true"
+ASSEMBLYAI_BASE_URL = os.environ.get("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com/v2")
+OCR_API_URL = os.environ.get("OCR_API_URL", "https://api.ocr.space/parse/image")
+GROQ_API_URL = os.environ.get("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+# e.g. http://127.0.0.1:8090 to send Gemini calls (over REST) to a local stand-in
+GEMINI_API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT")
+# Public URL of /api/assemblyai/webhook; enables webhook completion instead of polling
+ASSEMBLYAI_WEBHOOK_URL = os.environ.get("ASSEMBLYAI_WEBHOOK_URL")
+ASSEMBLYAI_WEBHOOK_SECRET = os.environ.get("ASSEMBLYAI_WEBHOOK_SECRET")
+TRANSCRIPTION_DEADLINE_SECONDS = int(os.environ.get("TRANSCRIPTION_DEADLINE_SECONDS", 900))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 20))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 120))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", 3))
+OCR_PREPROCESS = os.environ.get("OCR_PREPROCESS", "true").lower() == "true"
+OCR_MAX_DIMENSION = int(os.environ.get("OCR_MAX_DIMENSION", 2000))
+OCR_TARGET_BYTES = int(os.environ.get("OCR_TARGET_BYTES", 1024 * 1024))
+OCR_ENHANCE_HANDWRITING = os.environ.get("OCR_ENHANCE_HANDWRITING", "false").lower() == "true"
+ADMIN_STATS_TTL_SECONDS = int(os.environ.get("ADMIN_STATS_TTL_SECONDS", 30))
+MESSAGE_PAGE_SIZE = int(os.environ.get("MESSAGE_PAGE_SIZE", 50))
+REPORTS_PAGE_SIZE = int(os.environ.get("REPORTS_PAGE_SIZE", 20))
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 5))
+STATIC_ASSETS = ("index.html", "script.js", "style.css")
 
 # External services
 from supabase import create_client
-import google.generativeai as genai
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-genai.configure(api_key=GOOGLE_API_KEY)
+
+@lru_cache(maxsize=1)
+def get_genai():
+    """google.generativeai, imported and configured on first use (its import alone takes most of a second)"""
+    import google.generativeai as genai
+    if GEMINI_API_ENDPOINT:
+        genai.configure(api_key=GOOGLE_API_KEY, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=GOOGLE_API_KEY)
+    return genai
+
+from messaging import MessageStore, encode_cursor
+from observation_store import ObservationStore
+from read_models import ObserverMappingReadModel, count_admin_stats
+from reports import LIST_FIELDS, ReportStore, parse_fields
+message_store = MessageStore(supabase, page_size=MESSAGE_PAGE_SIZE)
+report_store = ReportStore(supabase, page_size=REPORTS_PAGE_SIZE)
+observation_store = ObservationStore(supabase)
+from cache import LRUCache, build_cache, llm_cache_key, sha256_hexdigest
+ocr_cache = build_cache(max_entries=OCR_CACHE_MAX_ENTRIES, ttl=OCR_CACHE_TTL_SECONDS, disk_path=OCR_CACHE_PATH)
+llm_cache = build_cache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL_SECONDS, disk_path=LLM_CACHE_PATH or None)
+admin_stats_cache = LRUCache(max_entries=1, ttl=ADMIN_STATS_TTL_SECONDS)
+
+from http_client import HTTPClient
+from image_preprocessing import ImagePreprocessor
+http = HTTPClient(pool_maxsize=HTTP_POOL_MAXSIZE, timeout=(5, HTTP_TIMEOUT_SECONDS), retries=HTTP_MAX_RETRIES)
+
+from transcription import AssemblyAITranscriber, TranscriptionError, WebhookRegistry, WEBHOOK_AUTH_HEADER
+transcriber = AssemblyAITranscriber(
+    ASSEMBLYAI_API_KEY,
+    base_url=ASSEMBLYAI_BASE_URL,
+    deadline=TRANSCRIPTION_DEADLINE_SECONDS,
+    webhook_url=ASSEMBLYAI_WEBHOOK_URL,
+    webhook_secret=ASSEMBLYAI_WEBHOOK_SECRET,
+    http=http
+)
+webhook_registry = WebhookRegistry()
 
 # --- Helper Classes ---
 class ObservationExtractor:
@@ -41,12 +116,27 @@ class ObservationExtractor:
         self.ocr_api_key = OCR_API_KEY
         self.groq_api_key = GROQ_API_KEY
         self.gemini_api_key = GOOGLE_API_KEY
+        self.preprocessor = ImagePreprocessor(
+            max_dimension=OCR_MAX_DIMENSION,
+            target_bytes=OCR_TARGET_BYTES,
+            enhance_handwriting=OCR_ENHANCE_HANDWRITING,
+            enabled=OCR_PREPROCESS
+        )
 
     def extract_text_with_ocr(self, image_file):
         file_type = image_file.filename.split('.')[-1].lower()
         if file_type == 'jpeg':
             file_type = 'jpg'
-        base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+        image_bytes = image_file.read()
+        # Different preprocessing settings send OCR a different image, so they get their own entries
+        cache_key = f"ocr:{self.preprocessor.cache_tag}:{sha256_hexdigest(image_bytes)}"
+        cached_text = ocr_cache.get(cache_key)
+        if cached_text is not None:
+            return cached_text
+        processed_bytes, processed_type = self.preprocessor.process(image_bytes)
+        if processed_bytes:
+            image_bytes, file_type = processed_bytes, processed_type
+        base64_image = base64.b64encode(image_bytes).decode('utf-8')
         base64_image_with_prefix = f"data:image/{file_type};base64,{base64_image}"
         payload = {
             'apikey': self.ocr_api_key,
@@ -57,10 +147,11 @@ class ObservationExtractor:
             'scale': True,
             'base64Image': base64_image_with_prefix
         }
-        response = requests.post(
-            'https://api.ocr.space/parse/image',
+        response = http.post(
+            OCR_API_URL,
             data=payload,
-            headers={'apikey': self.ocr_api_key}
+            headers={'apikey': self.ocr_api_key},
+            idempotent=True  # parsing an image has no side effects, so it is safe to retry
         )
         response.raise_for_status()
         data = response.json()
@@ -72,9 +163,10 @@ class ObservationExtractor:
         extracted_text = parsed_result['ParsedText']
         if not extracted_text or not extracted_text.strip():
             raise Exception("No text was detected in the image")
+        ocr_cache.set(cache_key, extracted_text)
         return extracted_text
 
-    def process_with_groq(self, extracted_text):
+    def process_with_groq(self, extracted_text, use_cache=True):
         system_prompt = """You are an AI assistant for a learning observation system. Extract and structure information from the provided observation sheet text.
         Format your response as JSON with the following structure:
         {
@@ -87,64 +179,43 @@ class ObservationExtractor:
           "areasOfDevelopment": [],
           "recommendations": []
         }"""
-        response = requests.post(
-            'https://api.groq.com/openai/v1/chat/completions',
+        request_body = {
+            "model": "llama-3.3-70b-versatile",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Extract and structure: {extracted_text}"}
+            ],
+            "temperature": 0.2,
+            "response_format": {"type": "json_object"}
+        }
+        cache_key = llm_cache_key(request_body["model"], request_body["messages"],
+                                  temperature=request_body["temperature"],
+                                  response_format=request_body["response_format"])
+        if use_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        response = http.post(
+            GROQ_API_URL,
             headers={
                 'Authorization': f'Bearer {self.groq_api_key}',
                 'Content-Type': 'application/json'
             },
-            json={
-                "model": "llama-3.3-70b-versatile",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Extract and structure: {extracted_text}"}
-                ],
-                "temperature": 0.2,
-                "response_format": {"type": "json_object"}
-            }
+            json=request_body
         )
         response.raise_for_status()
         ai_response = response.json()['choices'][0]['message']['content']
-        return json.loads(ai_response)
+        structured_data = json.loads(ai_response)
+        llm_cache.set(cache_key, structured_data)
+        return structured_data
 
     def transcribe_with_assemblyai(self, audio_file):
-        headers = {"authorization": ASSEMBLYAI_API_KEY}
-        upload_response = requests.post(
-            "https://api.assemblyai.com/v2/upload",
-            headers=headers,
-            data=audio_file.read()
-        )
-        if upload_response.status_code != 200:
-            return f"Error uploading audio: {upload_response.text}"
-        upload_url = upload_response.json()["upload_url"]
-        transcript_request = {
-            "audio_url": upload_url,
-            "language_code": "en"
-        }
-        transcript_response = requests.post(
-            "https://api.assemblyai.com/v2/transcript",
-            json=transcript_request,
-            headers=headers
-        )
-        if transcript_response.status_code != 200:
-            return f"Error requesting transcription: {transcript_response.text}"
-        transcript_id = transcript_response.json()["id"]
-        status = "processing"
-        while status != "completed" and status != "error":
-            polling_response = requests.get(
-                f"https://api.assemblyai.com/v2/transcript/{transcript_id}",
-                headers=headers
-            )
-            polling_data = polling_response.json()
-            status = polling_data["status"]
-            if status == "completed":
-                return polling_data["text"]
-            elif status == "error":
-                return f"Transcription error: {polling_data.get('error', 'Unknown error')}"
-            import time; time.sleep(2)
-        return "Error: Transcription timed out or failed."
-
-    def generate_report_from_text(self, text_content, user_info):
+        try:
+            return transcriber.transcribe(audio_file)
+        except TranscriptionError as e:
+            return str(e)
+
+    def generate_report_from_text(self, text_content, user_info, use_cache=True):
         prompt = f"""
         Based on this text from a student observation, create a detailed observer report following the new Daily Growth Report format.
 
@@ -158,8 +229,15 @@ class ObservationExtractor:
         ...
         Use the exact section titles, emojis and format as above. For items that cannot be determined from the text, make reasonable inferences based on the available information.
         """
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model_name = 'gemini-2.0-flash'
+        cache_key = llm_cache_key(model_name, prompt)
+        if use_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        model = get_genai().GenerativeModel(model_name)
         response = model.generate_content([{"role": "user", "parts": [{"text": prompt}]}])
+        llm_cache.set(cache_key, response.text)
         return response.text
 
     def send_email(self, recipient_email, subject, message):
@@ -188,15 +266,121 @@ class ObservationExtractor:
 
 extractor = ObservationExtractor()
 
+# Background jobs for the slow ingestion endpoints
+from jobs import DEFERRED, JobRunner, JobStore
+job_store = JobStore(JOB_STORE_PATH)
+if JOB_RECOVERY_ON_IMPORT:
+    job_store.fail_unfinished()
+job_runner = JobRunner(job_store, max_workers=JOB_WORKERS, retention_seconds=JOB_RETENTION_HOURS * 3600,
+                       heartbeat_interval=JOB_HEARTBEAT_SECONDS, stale_after=JOB_STALE_SECONDS)
+
+def run_image_job(job, image_bytes, child_id, observer_id, session_info):
+    image_file = io.BytesIO(image_bytes)
+    image_file.filename = "observation.jpg"
+    job.set_stage("ocr")
+    extracted_text = extractor.extract_text_with_ocr(image_file)
+    job.set_stage("structuring")
+    structured_data = extractor.process_with_groq(extracted_text)
+    observations_text = structured_data.get("observations", "")
+    job.set_stage("report")
+    report = extractor.generate_report_from_text(observations_text, session_info)
+    job.set_stage("saving")
+    observation_store.insert_observation({
+        "student_id": child_id,
+        "username": observer_id,
+        "student_name": structured_data.get("studentName", session_info['student_name']),
+        "observer_name": session_info['observer_name'],
+        "class_name": structured_data.get("className", ""),
+        "date": structured_data.get("date", session_info['session_date']),
+        "observations": observations_text,
+        "strengths": structured_data.get("strengths", []),
+        "areas_of_development": structured_data.get("areasOfDevelopment", []),
+        "recommendations": structured_data.get("recommendations", []),
+        "timestamp": datetime.now().isoformat(),
+        "filename": "observation.jpg",
+        "full_data": structured_data,
+        "theme_of_day": structured_data.get("themeOfDay", ""),
+        "curiosity_seed": structured_data.get("curiositySeed", "")
+    })
+    return {'report': report}
+
+def run_audio_job(job, audio_path, filename, child_id, observer_id, session_info):
+    job.set_stage("transcription")
+    if not transcriber.webhook_url:
+        try:
+            with open(audio_path, 'rb') as audio_file:
+                transcript = extractor.transcribe_with_assemblyai(audio_file)
+        finally:
+            os.remove(audio_path)
+        return finish_audio_job(job, transcript, filename, child_id, observer_id, session_info)
+
+    # Webhook mode: no worker waits for the transcript; the webhook (or the deadline) resumes the job
+    try:
+        with open(audio_path, 'rb') as audio_file:
+            transcript_id = transcriber.submit(audio_file)
+    except TranscriptionError as e:
+        return finish_audio_job(job, str(e), filename, child_id, observer_id, session_info)
+    finally:
+        os.remove(audio_path)
+
+    def on_transcript_done(status):
+        job.resume(fetch_transcript_and_finish, transcript_id, filename, child_id, observer_id, session_info)
+
+    job.set_stage("awaiting_transcript")
+    webhook_registry.register(transcript_id, on_transcript_done, deadline=transcriber.deadline)
+    return DEFERRED
+
+def fetch_transcript_and_finish(job, transcript_id, filename, child_id, observer_id, session_info):
+    try:
+        transcript = transcriber.result_text(transcript_id)
+    except TranscriptionError as e:
+        transcript = str(e)
+    return finish_audio_job(job, transcript, filename, child_id, observer_id, session_info)
+
+def finish_audio_job(job, transcript, filename, child_id, observer_id, session_info):
+    job.set_stage("report")
+    report = extractor.generate_report_from_text(transcript, session_info)
+    job.set_stage("saving")
+    observation_store.insert_observation({
+        "student_id": child_id,
+        "username": observer_id,
+        "student_name": session_info['student_name'],
+        "observer_name": session_info['observer_name'],
+        "class_name": "",
+        "date": session_info['session_date'],
+        "observations": transcript,
+        "strengths": [],
+        "areas_of_development": [],
+        "recommendations": [],
+        "timestamp": datetime.now().isoformat(),
+        "filename": filename,
+        "full_data": {"transcript": transcript, "report": report}
+    })
+    return {'report': report, 'transcript': transcript}
+
+# --- Response compression and static assets ---
+from compression import ResponseCompressor, StaticAssets
+compressor = ResponseCompressor(min_size=COMPRESS_MIN_BYTES, level=COMPRESS_LEVEL, brotli_quality=BROTLI_QUALITY)
+static_assets = StaticAssets('.', STATIC_ASSETS, min_size=COMPRESS_MIN_BYTES)
+
+@app.after_request
+def compress_response(response):
+    return compressor(response, request.headers.get('Accept-Encoding'))
+
 # --- Frontend routes ---
 @app.route('/')
 def index():
-    return send_from_directory('.', 'index.html')
+    return static_files('index.html')
 
 @app.route('/<path:filename>')
 def static_files(filename):
+    name, immutable = static_assets.resolve(filename)
+    if name:
+        return static_assets.response(name, immutable, request)
     if os.path.exists(filename):
-        return send_from_directory('.', filename)
+        response = send_from_directory('.', filename)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     abort(404)
 
 # --- API Endpoints ---
@@ -257,6 +441,78 @@ def get_observer_children():
     else:
         return jsonify({'success': True, 'children': []})
 
+def observer_for_child(child_id):
+    mapping = supabase.table('observer_child_mappings').select("observer_id").eq("child_id", child_id).limit(1).execute().data
+    return mapping[0]['observer_id'] if mapping else None
+
+@app.route('/api/messages', methods=['GET'])
+def get_messages():
+    """One page of a parent-observer conversation.
+
+    Without a cursor returns the newest page; `before` pages back through older
+    messages and `since` returns only messages newer than the client's latest.
+    has_more means older messages remain (or, with since, newer ones).
+    """
+    parent_id = request.args.get('parent_id')
+    observer_id = request.args.get('observer_id')
+    if not parent_id:
+        return jsonify({"success": False, "message": "parent_id is required"}), 400
+
+    parent = supabase.table('users').select("id, name, child_id").eq("id", parent_id).execute().data
+    if not parent:
+        return jsonify({"success": False, "message": "Parent not found"}), 404
+    parent = parent[0]
+
+    child_info = None
+    if parent.get('child_id'):
+        child = supabase.table('children').select("id, name").eq("id", parent['child_id']).execute().data
+        child_info = child[0] if child else None
+        observer_id = observer_id or observer_for_child(parent['child_id'])
+    if not observer_id:
+        return jsonify({"success": True, "messages": [], "has_more": False, "child_info": child_info})
+
+    observer = supabase.table('users').select("id, name").eq("id", observer_id).execute().data
+    observer_info = observer[0] if observer else None
+
+    limit = max(1, min(request.args.get('limit', MESSAGE_PAGE_SIZE, type=int), 200))
+    try:
+        if request.args.get('since'):
+            messages, has_more = message_store.since(parent_id, observer_id, request.args['since'], limit)
+        elif request.args.get('before'):
+            messages, has_more = message_store.before(parent_id, observer_id, request.args['before'], limit)
+        else:
+            messages, has_more = message_store.latest(parent_id, observer_id, limit)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    names = {parent_id: parent.get('name', 'Parent'), observer_id: (observer_info or {}).get('name', 'Observer')}
+    for message in messages:
+        message['sender_name'] = names.get(message['sender_id'], '')
+
+    return jsonify({
+        "success": True,
+        "messages": messages,
+        "has_more": has_more,
+        "before": encode_cursor(messages[0]) if messages else request.args.get('before'),
+        "since": encode_cursor(messages[-1]) if messages else request.args.get('since'),
+        "child_info": child_info,
+        "observer_info": observer_info
+    })
+
+@app.route('/api/messages', methods=['POST'])
+def send_message():
+    data = request.json or {}
+    sender_id = data.get('sender_id')
+    receiver_id = data.get('recipient_id')
+    content = (data.get('content') or '').strip()
+    if not receiver_id and data.get('recipient_type') == 'observer' and data.get('child_id'):
+        receiver_id = observer_for_child(data['child_id'])
+    if not (sender_id and receiver_id and content):
+        return jsonify({"success": False, "message": "sender, recipient and content are required"}), 400
+
+    sent = message_store.send(sender_id, receiver_id, content, datetime.now().isoformat())
+    return jsonify({"success": True, "sent_message": sent})
+
 @app.route('/api/process-image', methods=['POST'])
 def process_image():
     data = request.json
@@ -265,30 +521,8 @@ def process_image():
     observer_id = data['observer_id']
     session_info = data['session_info']
     image_bytes = base64.b64decode(image_data.split(',')[1])
-    image_file = io.BytesIO(image_bytes)
-    image_file.filename = "observation.jpg"
-    extracted_text = extractor.extract_text_with_ocr(image_file)
-    structured_data = extractor.process_with_groq(extracted_text)
-    observations_text = structured_data.get("observations", "")
-    report = extractor.generate_report_from_text(observations_text, session_info)
-    supabase.table('observations').insert({
-        "student_id": child_id,
-        "username": observer_id,
-        "student_name": structured_data.get("studentName", session_info['student_name']),
-        "observer_name": session_info['observer_name'],
-        "class_name": structured_data.get("className", ""),
-        "date": structured_data.get("date", session_info['session_date']),
-        "observations": observations_text,
-        "strengths": json.dumps(structured_data.get("strengths", [])),
-        "areas_of_development": json.dumps(structured_data.get("areasOfDevelopment", [])),
-        "recommendations": json.dumps(structured_data.get("recommendations", [])),
-        "timestamp": datetime.now().isoformat(),
-        "filename": "observation.jpg",
-        "full_data": json.dumps(structured_data),
-        "theme_of_day": structured_data.get("themeOfDay", ""),
-        "curiosity_seed": structured_data.get("curiositySeed", "")
-    }).execute()
-    return jsonify({'success': True, 'report': report})
+    job_id = job_runner.submit("process-image", run_image_job, image_bytes, child_id, observer_id, session_info)
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
 
 @app.route('/api/process-audio', methods=['POST'])
 def process_audio():
@@ -296,30 +530,70 @@ def process_audio():
     child_id = request.form.get('child_id')
     observer_id = request.form.get('observer_id')
     session_info = json.loads(request.form.get('session_info'))
-    transcript = extractor.transcribe_with_assemblyai(audio_file)
-    report = extractor.generate_report_from_text(transcript, session_info)
-    supabase.table('observations').insert({
-        "student_id": child_id,
-        "username": observer_id,
-        "student_name": session_info['student_name'],
-        "observer_name": session_info['observer_name'],
-        "class_name": "",
-        "date": session_info['session_date'],
-        "observations": transcript,
-        "strengths": json.dumps([]),
-        "areas_of_development": json.dumps([]),
-        "recommendations": json.dumps([]),
-        "timestamp": datetime.now().isoformat(),
-        "filename": audio_file.filename,
-        "full_data": json.dumps({"transcript": transcript, "report": report})
-    }).execute()
-    return jsonify({'success': True, 'report': report, 'transcript': transcript})
+    # The upload stream is closed once the request ends, so spool it to disk for the worker
+    fd, audio_path = tempfile.mkstemp(prefix="observer-audio-")
+    with os.fdopen(fd, 'wb') as tmp:
+        audio_file.save(tmp)
+    job_id = job_runner.submit("process-audio", run_audio_job, audio_path, audio_file.filename,
+                               child_id, observer_id, session_info)
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
+
+@app.route('/api/assemblyai/webhook', methods=['POST'])
+def assemblyai_webhook():
+    if ASSEMBLYAI_WEBHOOK_SECRET and request.headers.get(WEBHOOK_AUTH_HEADER) != ASSEMBLYAI_WEBHOOK_SECRET:
+        abort(403)
+    data = request.get_json(silent=True) or {}
+    transcript_id = data.get('transcript_id')
+    if not transcript_id:
+        return jsonify({'success': False, 'message': 'transcript_id is required'}), 400
+    webhook_registry.notify(transcript_id, data.get('status'))
+    return jsonify({'success': True})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+def conditional_json(payload):
+    """JSON response with a strong ETag; 304 when it matches the request's If-None-Match"""
+    response = jsonify(payload)
+    response.add_etag()
+    # Cached copies may be reused only after revalidating against the ETag
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/api/reports', methods=['GET'])
 def get_reports():
+    """Newest-first page of a child's reports.
+
+    `fields` picks columns (default: the list view's, without full_data) and
+    `before` is the next_cursor of the previous page.
+    """
     child_id = request.args.get('child_id')
-    reports = supabase.table('observations').select("*").eq("student_id", child_id).order('date', desc=True).execute().data
-    return jsonify({'success': True, 'reports': reports})
+    if not child_id:
+        return jsonify({'success': False, 'message': 'child_id is required'}), 400
+    try:
+        fields = parse_fields(request.args.get('fields'), LIST_FIELDS)
+        reports, next_cursor = report_store.page(child_id, fields, request.args.get('before'),
+                                                 request.args.get('limit', type=int))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return conditional_json({'success': True, 'reports': reports, 'has_more': next_cursor is not None,
+                             'next_cursor': next_cursor})
+
+@app.route('/api/reports/<report_id>', methods=['GET'])
+def get_report(report_id):
+    try:
+        fields = parse_fields(request.args.get('fields'), ())
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    report = report_store.get(report_id, fields)
+    if report is None:
+        return jsonify({'success': False, 'message': 'Report not found'}), 404
+    return conditional_json({'success': True, 'report': report})
 
 @app.route('/api/send-email', methods=['POST'])
 def send_email():
@@ -333,55 +607,85 @@ def monthly_report():
     child_id = data['child_id']
     year = int(data['year'])
     month = int(data['month'])
-    start_date = f"{year}-{month:02d}-01"
-    if month == 12:
-        end_date = f"{year+1}-01-01"
-    else:
-        end_date = f"{year}-{month+1:02d}-01"
-    observations = supabase.table('observations').select("*") \
-        .eq("student_id", child_id) \
-        .gte("date", start_date) \
-        .lt("date", end_date) \
-        .execute().data
-    strength_counts = {}
-    for obs in observations:
-        if obs.get('strengths'):
-            strengths = json.loads(obs['strengths']) if isinstance(obs['strengths'], str) else obs['strengths']
-            for strength in strengths:
-                strength_counts[strength] = strength_counts.get(strength, 0) + 1
-    dev_counts = {}
-    for obs in observations:
-        if obs.get('areas_of_development'):
-            areas = json.loads(obs['areas_of_development']) if isinstance(obs['areas_of_development'], str) else obs['areas_of_development']
-            for area in areas:
-                dev_counts[area] = dev_counts.get(area, 0) + 1
+    # Precomputed per-(child, month) counters; rebuilt from observations if missing
+    aggregate = observation_store.monthly_aggregate(child_id, year, month)
+    strength_counts = aggregate.get('strength_counts') or {}
+    dev_counts = aggregate.get('development_counts') or {}
     summary = {
-        "total_observations": len(observations),
-        "key_strengths": list(strength_counts.keys())[:5],
-        "areas_for_development": list(dev_counts.keys())[:5],
+        "total_observations": aggregate.get('observation_count', 0),
+        "key_strengths": sorted(strength_counts, key=strength_counts.get, reverse=True)[:5],
+        "areas_for_development": sorted(dev_counts, key=dev_counts.get, reverse=True)[:5],
         "month_name": calendar.month_name[month],
         "year": year,
-        "student_name": observations[0]['student_name'] if observations else "",
-        "observer_name": observations[0]['observer_name'] if observations else "",
+        "student_name": aggregate.get('student_name') or "",
+        "observer_name": aggregate.get('observer_name') or "",
         "average_rating": 0  # Placeholder, implement as needed
     }
     return jsonify({'success': True, 'report': summary})
 
+def compute_admin_stats():
+    return count_admin_stats(supabase)
+
 @app.route('/api/admin/stats', methods=['GET'])
 def admin_stats():
-    users_count = len(supabase.table('users').select("id").execute().data or [])
-    children_count = len(supabase.table('children').select("id").execute().data or [])
-    reports_count = len(supabase.table('observations').select("id").execute().data or [])
-    observers_count = len(supabase.table('users').select("id").eq("role", "Observer").execute().data or [])
-    return jsonify({
-        "success": True,
-        "stats": {
-            "total_users": users_count,
-            "total_children": children_count,
-            "total_reports": reports_count,
-            "active_observers": observers_count
-        }
-    })
+    stats = admin_stats_cache.get("stats")
+    if stats is None:
+        stats = compute_admin_stats()
+        admin_stats_cache.set("stats", stats)
+    return jsonify({"success": True, "stats": stats})
+
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def admin_cache_stats():
+    return jsonify({"success": True, "stats": {"ocr": ocr_cache.stats(), "llm": llm_cache.stats()}})
+
+@app.route('/api/admin/http-stats', methods=['GET'])
+def admin_http_stats():
+    return jsonify({"success": True, "latency": http.latency_report()})
+
+@app.route('/api/admin/bulk-upload/children', methods=['POST'])
+def bulk_upload_children():
+    csv_file = request.files.get('csv_file')
+    if not csv_file:
+        return jsonify({"success": False, "message": "No CSV file uploaded"}), 400
+    from bulk_import import import_children
+    try:
+        result = import_children(supabase, csv_file.stream)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "count": result.succeeded, **result.as_dict()})
+
+@app.route('/api/admin/bulk-upload/parents', methods=['POST'])
+def bulk_upload_parents():
+    csv_file = request.files.get('csv_file')
+    if not csv_file:
+        return jsonify({"success": False, "message": "No CSV file uploaded"}), 400
+    from bulk_import import import_parents
+    try:
+        result = import_parents(supabase, csv_file.stream)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "count": result.succeeded, **result.as_dict()})
+
+@app.route('/api/admin/bulk-upload/relationships', methods=['POST'])
+def bulk_upload_relationships():
+    csv_file = request.files.get('csv_file')
+    if not csv_file:
+        return jsonify({"success": False, "message": "No CSV file uploaded"}), 400
+    import pandas as pd
+    from bulk_import import import_relationships
+    try:
+        result = import_relationships(supabase, pd.read_csv(csv_file))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    return jsonify({"success": True, "count": result.succeeded, **result.as_dict()})
+
+@app.route('/api/admin/observer-mappings', methods=['GET'])
+def admin_observer_mappings():
+    model = ObserverMappingReadModel.load(supabase)
+    page = request.args.get('page', 1, type=int)
+    page_size = max(1, min(request.args.get('page_size', 50, type=int), 500))
+    mappings, total, pages = model.page(request.args.get('q', ''), page, page_size)
+    return jsonify({"success": True, "mappings": mappings, "total": total, "page": page, "pages": pages})
 
 @app.route('/api/admin/users', methods=['GET'])
 def admin_users():
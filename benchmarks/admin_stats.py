@@ -0,0 +1,103 @@
+"""/api/admin/stats latency as table sizes grow: full selects + len() vs exact counts.
+
+Starts a local stand-in for Supabase's PostgREST API whose tables hold the
+requested number of rows, then times both ways of computing the dashboard
+counters through the real supabase client. The "len" mode transfers every id;
+the "count" mode runs the endpoint's own read_models.count_admin_stats, which
+sends HEAD requests with Prefer: count=exact concurrently.
+
+    python benchmarks/admin_stats.py --rows 1000 10000 100000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from read_models import count_admin_stats  # noqa: E402
+
+TABLES = ("users", "children", "observations")
+
+
+class PostgRESTStub(BaseHTTPRequestHandler):
+    """Answers /rest/v1/<table> selects with `rows` ids, or just a Content-Range count"""
+    rows = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, with_body):
+        table = urlsplit(self.path).path.rsplit('/', 1)[-1]
+        count = self.rows if table in TABLES else 0
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if 'count=exact' in self.headers.get('Prefer', ''):
+            self.send_header('Content-Range', f"0-{max(count - 1, 0)}/{count}")
+        if with_body:
+            body = json.dumps([{"id": f"{table}-{i}"} for i in range(count)]).encode()
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def do_GET(self):
+        self._respond(with_body=True)
+
+    def do_HEAD(self):
+        self._respond(with_body=False)
+
+
+def stats_with_len(client):
+    return {
+        "total_users": len(client.table('users').select("id").execute().data or []),
+        "total_children": len(client.table('children').select("id").execute().data or []),
+        "total_reports": len(client.table('observations').select("id").execute().data or []),
+        "active_observers": len(client.table('users').select("id").eq("role", "Observer").execute().data or [])
+    }
+
+
+def stats_with_count(client):
+    return count_admin_stats(client)
+
+
+def time_ms(fn, client, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(client)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PostgRESTStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = create_client(f"http://127.0.0.1:{server.server_port}", "benchmark-key")
+
+    print(f"{'rows':>8}  {'len() ms':>9}  {'count ms':>9}")
+    for rows in args.rows:
+        PostgRESTStub.rows = rows
+        assert stats_with_count(client) == stats_with_len(client)
+        print(f"{rows:>8}  {time_ms(stats_with_len, client, args.repeat):>9}  "
+              f"{time_ms(stats_with_count, client, args.repeat):>9}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Parent-child CSV import throughput: per-row updates vs import_relationships.
+
+Starts a local stand-in for Supabase's PostgREST API with a fixed per-request
+latency, generates a parent_email/child_name CSV of the requested size and
+imports it both ways through the real supabase client, reporting rows/second.
+
+    python benchmarks/bulk_relationships.py --rows 2000 --latency-ms 20
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pandas as pd
+from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_import import import_relationships  # noqa: E402
+
+
+class PostgRESTStub(BaseHTTPRequestHandler):
+    """Serves fixed children/parents lists and accepts any write after `latency` seconds"""
+    latency = 0.0
+    tables = {}
+    requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, payload):
+        time.sleep(self.latency)
+        type(self).requests += 1
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(self.tables.get(urlsplit(self.path).path.rsplit('/', 1)[-1], []))
+
+    def do_POST(self):
+        self._respond([])
+
+    def do_PATCH(self):
+        self._respond([])
+
+
+def per_row_import(client, df):
+    """The previous importer: one users.update() per CSV row"""
+    children = client.table('children').select("*").execute().data
+    parents = client.table('users').select("*").eq("role", "Parent").execute().data
+    child_name_to_id = {c['name'].lower(): c['id'] for c in children}
+    parent_email_to_id = {p['email'].lower(): p['id'] for p in parents}
+    for _, row in df.iterrows():
+        parent_id = parent_email_to_id.get(row['parent_email'].strip().lower())
+        child_id = child_name_to_id.get(row['child_name'].strip().lower())
+        if parent_id and child_id:
+            client.table('users').update({'child_id': child_id}).eq('id', parent_id).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    PostgRESTStub.latency = args.latency_ms / 1000
+    PostgRESTStub.tables = {
+        "children": [{"id": f"child-{i}", "name": f"Child {i}"} for i in range(args.rows)],
+        "users": [{"id": f"parent-{i}", "name": f"Parent {i}", "email": f"parent{i}@example.com",
+                   "password": "x", "role": "Parent"} for i in range(args.rows)]
+    }
+    df = pd.DataFrame({
+        "parent_email": [f"parent{i}@example.com" for i in range(args.rows)],
+        "child_name": [f"Child {i}" for i in range(args.rows)]
+    })
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PostgRESTStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = create_client(f"http://127.0.0.1:{server.server_port}", "benchmark-key")
+
+    print(f"{args.rows} rows, {args.latency_ms:.0f} ms per request")
+    for name, run in (("per-row", lambda: per_row_import(client, df)),
+                      ("bulk", lambda: import_relationships(client, df))):
+        PostgRESTStub.requests = 0
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f"{name:>8}: {elapsed:6.2f}s  {args.rows / elapsed:8.0f} rows/s  {PostgRESTStub.requests} requests")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Cold-start import cost of the app entry points.
+
+Collects each file's top-level import statements (the work done before its
+first line of app code runs) and executes them in a fresh interpreter under
+`python -X importtime`. The total and the most expensive top-level packages are
+printed. Each measurement is the median of --repeat runs. The results are saved
+as JSON so a change can be compared before and after:
+
+    python benchmarks/import_time.py main.py app.py --repeat 5
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def top_level_imports(path):
+    """Source of the import statements at module level (not inside functions) of a file"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    statements = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.get_source_segment(source, node) for node in statements)
+
+
+def measure(code):
+    """(total_ms, {top-level package: cumulative ms}) for one fresh-interpreter run of code"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                               capture_output=True, text=True, env=dict(os.environ, PYTHONWARNINGS="ignore"))
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    packages = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Depth 1 entries (one space of indent) are imported directly by the measured code
+        if match and len(match.group(3)) == 1:
+            package = match.group(4).split('.')[0]
+            packages[package] = packages.get(package, 0) + int(match.group(2)) / 1000
+    return sum(packages.values()), packages
+
+
+def profile(path, repeat):
+    code = top_level_imports(os.path.join(REPO_ROOT, path))
+    # Interpreter startup (site, encodings, ...) shows up at depth 1 too; drop whatever an empty run imports
+    startup = set(measure("pass")[1])
+    runs = []
+    for _ in range(repeat):
+        _, packages = measure(code)
+        packages = {name: ms for name, ms in packages.items() if name not in startup}
+        runs.append((sum(packages.values()), packages))
+    packages = {name: statistics.median(run[1].get(name, 0) for run in runs) for name in runs[0][1]}
+    return {
+        "file": path,
+        "total_ms": round(statistics.median(run[0] for run in runs), 1),
+        "packages_ms": {name: round(ms, 1) for name, ms in sorted(packages.items(), key=lambda p: -p[1])}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", default=["main.py", "app.py"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--output", help="JSON results path (default benchmarks/results/import-time-<time>.json)")
+    args = parser.parse_args()
+
+    started_at = datetime.now()
+    results = []
+    for path in args.files:
+        result = profile(path, args.repeat)
+        results.append(result)
+        print(f"{path}: {result['total_ms']} ms of top-level imports")
+        for name, ms in list(result["packages_ms"].items())[:args.top]:
+            print(f"  {name:<28} {ms:>8.1f} ms")
+
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results",
+                                         f"import-time-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"benchmark": "import_time", "started_at": started_at.isoformat(),
+                   "python": sys.version.split()[0], "repeat": args.repeat, "files": results}, f, indent=2)
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Latency and throughput of the observation ingestion pipeline against local service stand-ins.
+
+Starts benchmarks/mock_services.py, points app.py at it through its
+environment variables (SUPABASE_URL, OCR_API_URL, GROQ_API_URL,
+GEMINI_API_ENDPOINT, ASSEMBLYAI_BASE_URL) and runs each requested concurrency
+level in one of three modes:
+
+    extractor  ObservationExtractor OCR -> Groq -> Gemini -> observations insert, in process
+    image      POST /api/process-image and poll /api/jobs/<id> until the job finishes
+    audio      POST /api/process-audio and poll /api/jobs/<id> until the job finishes
+
+The image and audio modes serve app.py over HTTP on a local port. p50/p95/p99
+latency, throughput and error counts are printed for each level. Per-stage
+latencies are included in extractor mode. Results are saved as JSON so runs
+can be compared:
+
+    python benchmarks/ingestion_pipeline.py --mode extractor --concurrency 1 8 32 --requests 200 \\
+        --latency ocr=800 groq=400 gemini=1500 supabase=20 --jitter ocr=300 --error-rate groq=0.02
+"""
+import argparse
+import base64
+import io
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_services import MockServices, add_profile_arguments, configure_from_args  # noqa: E402
+
+SESSION_INFO = {"student_name": "Asha Verma", "observer_name": "Benchmark Observer",
+                "session_date": "2024-05-14", "session_start": "09:00", "session_end": "10:00"}
+FINISHED = ("succeeded", "failed")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples_ms):
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 1) if samples_ms else None,
+        "p95_ms": round(percentile(samples_ms, 95), 1) if samples_ms else None,
+        "p99_ms": round(percentile(samples_ms, 99), 1) if samples_ms else None,
+        "max_ms": round(max(samples_ms), 1) if samples_ms else None
+    }
+
+
+def observation_image(seed):
+    """A small JPEG whose bytes differ per seed, so the OCR cache never answers"""
+    rng = random.Random(seed)
+    image = Image.frombytes("L", (640, 480), bytes(rng.randrange(200, 256) for _ in range(640 * 480)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
+
+
+def configure_environment(mocks, workdir):
+    """Point app.py's configuration at the mocks; must run before app is imported"""
+    os.environ.update({
+        "SUPABASE_URL": mocks.url,
+        "SUPABASE_KEY": "benchmark-key",
+        "GOOGLE_API_KEY": "benchmark-key",
+        "GROQ_API_KEY": "benchmark-key",
+        "OCR_API_KEY": "benchmark-key",
+        "ASSEMBLYAI_API_KEY": "benchmark-key",
+        "OCR_API_URL": f"{mocks.url}/parse/image",
+        "GROQ_API_URL": f"{mocks.url}/openai/v1/chat/completions",
+        "GEMINI_API_ENDPOINT": mocks.url,
+        "ASSEMBLYAI_BASE_URL": f"{mocks.url}/v2",
+        "ASSEMBLYAI_WEBHOOK_URL": "",
+        "OCR_CACHE_PATH": "",
+        "LLM_CACHE_PATH": "",
+        "JOB_STORE_PATH": os.path.join(workdir, "jobs.sqlite3")
+    })
+
+
+class ExtractorScenario:
+    """One observation through ObservationExtractor's stages, timing each"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, i):
+        image_file = io.BytesIO(observation_image(i))
+        image_file.filename = "observation.jpg"
+        stages = {}
+        started = time.perf_counter()
+        text = self.app.extractor.extract_text_with_ocr(image_file)
+        stages["ocr"] = time.perf_counter()
+        structured = self.app.extractor.process_with_groq(text, use_cache=False)
+        stages["groq"] = time.perf_counter()
+        self.app.extractor.generate_report_from_text(structured.get("observations", ""), SESSION_INFO,
+                                                     use_cache=False)
+        stages["gemini"] = time.perf_counter()
+        self.app.observation_store.insert_observation({
+            "student_id": "benchmark-child",
+            "username": "benchmark-observer",
+            "student_name": structured.get("studentName", SESSION_INFO["student_name"]),
+            "observer_name": SESSION_INFO["observer_name"],
+            "date": structured.get("date", SESSION_INFO["session_date"]),
+            "observations": structured.get("observations", ""),
+            "strengths": structured.get("strengths", []),
+            "areas_of_development": structured.get("areasOfDevelopment", []),
+            "recommendations": structured.get("recommendations", []),
+            "full_data": structured
+        })
+        stages["insert"] = time.perf_counter()
+
+        previous, durations = started, {}
+        for stage, finished in stages.items():
+            durations[stage] = (finished - previous) * 1000
+            previous = finished
+        return durations
+
+
+class EndpointScenario:
+    """Submit a job to a running app.py and poll until it finishes"""
+
+    def __init__(self, base_url, kind, poll_interval):
+        self.base_url = base_url
+        self.kind = kind
+        self.poll_interval = poll_interval
+        self.local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def submit(self, i):
+        if self.kind == "image":
+            image = base64.b64encode(observation_image(i)).decode('ascii')
+            return self.session.post(f"{self.base_url}/api/process-image", json={
+                "image": f"data:image/jpeg;base64,{image}",
+                "child_id": "benchmark-child",
+                "observer_id": "benchmark-observer",
+                "session_info": SESSION_INFO
+            })
+        return self.session.post(f"{self.base_url}/api/process-audio", files={
+            "audio": (f"observation-{i}.mp3", os.urandom(256 * 1024), "audio/mpeg")
+        }, data={
+            "child_id": "benchmark-child",
+            "observer_id": "benchmark-observer",
+            "session_info": json.dumps(SESSION_INFO)
+        })
+
+    def __call__(self, i):
+        started = time.perf_counter()
+        response = self.submit(i)
+        response.raise_for_status()
+        job_id = response.json()["job_id"]
+        accepted = time.perf_counter()
+        while True:
+            job = self.session.get(f"{self.base_url}/api/jobs/{job_id}").json()["job"]
+            if job["status"] in FINISHED:
+                break
+            time.sleep(self.poll_interval)
+        if job["status"] == "failed":
+            raise RuntimeError(job.get("error") or "job failed")
+        return {"submit": (accepted - started) * 1000, "job": (time.perf_counter() - accepted) * 1000}
+
+
+def run_level(scenario, concurrency, total, first=0):
+    latencies, stages, errors = [], {}, {}
+    lock = threading.Lock()
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            durations = scenario(i)
+        except Exception as e:
+            with lock:
+                key = f"{type(e).__name__}: {str(e)[:120]}"
+                errors[key] = errors.get(key, 0) + 1
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            for stage, ms in durations.items():
+                stages.setdefault(stage, []).append(ms)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(first, first + total)))
+    wall = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "succeeded": len(latencies),
+        "failed": total - len(latencies),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(len(latencies) / wall, 2) if wall else None,
+        "latency": summarize(latencies),
+        "stages": {stage: summarize(samples) for stage, samples in stages.items()},
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("extractor", "image", "audio"), default="extractor")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=50, help="requests per concurrency level")
+    add_profile_arguments(parser)
+    parser.add_argument("--processing-ms", type=float, default=0, help="time until mock transcripts complete")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="seconds between job status polls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON results path (default benchmarks/results/<mode>-<time>.json)")
+    args = parser.parse_args()
+
+    mocks = MockServices(seed=args.seed).start()
+    mocks.configure("assemblyai", processing_ms=args.processing_ms)
+    configure_from_args(mocks, args)
+
+    workdir = tempfile.mkdtemp(prefix="ingestion-benchmark-")
+    configure_environment(mocks, workdir)
+    import app  # noqa: E402  (reads its configuration from the environment at import time)
+
+    server = None
+    if args.mode == "extractor":
+        scenario = ExtractorScenario(app)
+    else:
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', 0, app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        scenario = EndpointScenario(f"http://127.0.0.1:{server.server_port}", args.mode, args.poll_interval)
+
+    started_at = datetime.now()
+    levels = []
+    print(f"{'conc':>5}  {'ok':>5}  {'fail':>5}  {'req/s':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        # Fresh request numbers per level, so earlier levels never warm the OCR cache
+        level = run_level(scenario, concurrency, args.requests, first=len(levels) * args.requests)
+        levels.append(level)
+        latency = level["latency"]
+        print(f"{concurrency:>5}  {level['succeeded']:>5}  {level['failed']:>5}  "
+              f"{level['throughput_per_second'] or 0:>7}  {latency['p50_ms'] or 0:>8}  "
+              f"{latency['p95_ms'] or 0:>8}  {latency['p99_ms'] or 0:>8}")
+        for stage, summary in level["stages"].items():
+            print(f"{'':>5}  {stage:>12}: p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, "
+                  f"p99 {summary['p99_ms']} ms")
+        for error, count in level["errors"].items():
+            print(f"{'':>5}  {count} x {error}")
+
+    if server:
+        server.shutdown()
+    app.job_runner.shutdown(wait=True)
+
+    results = {
+        "benchmark": "ingestion_pipeline",
+        "mode": args.mode,
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "profiles": mocks.profiles,
+        "service_requests": mocks.stats(),
+        "levels": levels
+    }
+    mocks.stop()
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                         f"{args.mode}-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Throughput of app.py under gunicorn as the worker count grows.
+
+Starts benchmarks/mock_services.py in its own process and points app.py at it.
+For each --workers value it then starts gunicorn with gunicorn.conf.py and
+GUNICORN_WORKERS set to that value, and drives it for --duration seconds. The
+load comes from --clients processes with --threads threads each, cycling
+through --paths. Throughput and p50/p95/p99 latency are printed per worker
+count and saved as JSON:
+
+    python benchmarks/load_test.py --workers 1 2 4 --threads-per-worker 4 --duration 20 \\
+        --latency supabase=20 --select-rows 50
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from ingestion_pipeline import summarize
+from mock_services import add_profile_arguments, profile_arguments
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ("/api/reports?child_id=benchmark-child", "/api/admin/stats", "/")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before it came up")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def client_process(base_url, paths, threads, duration, results):
+    """Run `threads` request loops for `duration` seconds; put (latencies_ms, errors) on results"""
+    latencies, errors = [], 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def loop(offset):
+        nonlocal errors
+        session = requests.Session()
+        i = offset
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + paths[i % len(paths)], headers={'Accept-Encoding': 'gzip'},
+                                       timeout=30)
+                ok = response.status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+            i += 1
+
+    workers = [threading.Thread(target=loop, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put((latencies, errors))
+
+
+def run_level(base_url, args):
+    results = multiprocessing.Queue()
+    clients = [multiprocessing.Process(target=client_process,
+                                       args=(base_url, args.paths, args.threads, args.duration, results))
+               for _ in range(args.clients)]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    latencies, errors = [], 0
+    for _ in clients:
+        client_latencies, client_errors = results.get()
+        latencies += client_latencies
+        errors += client_errors
+    for client in clients:
+        client.join()
+    wall = time.perf_counter() - started
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(len(latencies) / wall, 1),
+        "latency": summarize(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads-per-worker", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--threads", type=int, default=8, help="request loops per load generator process")
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load per worker count")
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS))
+    parser.add_argument("--select-rows", type=int, default=50, help="rows the mock Supabase returns per select")
+    parser.add_argument("--output", help="JSON results path (default benchmarks/results/load-<time>.json)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    mock_port = free_port()
+    mock = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, "benchmarks", "mock_services.py"),
+                             "--port", str(mock_port), "--select-rows", str(args.select_rows),
+                             *profile_arguments(args)], stdout=subprocess.DEVNULL)
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    workdir = tempfile.mkdtemp(prefix="load-test-")
+
+    started_at = datetime.now()
+    levels = []
+    print(f"{'workers':>7}  {'threads':>7}  {'req/s':>8}  {'errors':>6}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    try:
+        wait_until_up(f"{mock_url}/rest/v1/health", mock)
+        for workers in args.workers:
+            port = free_port()
+            env = dict(os.environ,
+                       SUPABASE_URL=mock_url, SUPABASE_KEY="benchmark-key", GOOGLE_API_KEY="benchmark-key",
+                       GEMINI_API_ENDPOINT=mock_url, OCR_API_URL=f"{mock_url}/parse/image",
+                       GROQ_API_URL=f"{mock_url}/openai/v1/chat/completions",
+                       ASSEMBLYAI_BASE_URL=f"{mock_url}/v2", ASSEMBLYAI_WEBHOOK_URL="",
+                       JOB_STORE_PATH=os.path.join(workdir, "jobs.sqlite3"),
+                       GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_WORKERS=str(workers),
+                       GUNICORN_THREADS=str(args.threads_per_worker), GUNICORN_ACCESS_LOG="",
+                       GUNICORN_LOG_LEVEL="warning", PYTHONWARNINGS="ignore")
+            server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                                      cwd=REPO_ROOT, env=env)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_until_up(base_url + "/", server)
+                level = {"workers": workers, "threads_per_worker": args.threads_per_worker,
+                         **run_level(base_url, args)}
+            finally:
+                server.terminate()
+                server.wait(timeout=60)
+            levels.append(level)
+            latency = level["latency"]
+            print(f"{workers:>7}  {args.threads_per_worker:>7}  {level['throughput_per_second']:>8}  "
+                  f"{level['errors']:>6}  {latency['p50_ms'] or 0:>8}  {latency['p95_ms'] or 0:>8}  "
+                  f"{latency['p99_ms'] or 0:>8}")
+    finally:
+        mock.terminate()
+        mock.wait(timeout=10)
+
+    results = {
+        "benchmark": "load_test",
+        "started_at": started_at.isoformat(),
+        "paths": args.paths,
+        "clients": args.clients,
+        "client_threads": args.threads,
+        "duration_seconds": args.duration,
+        "mock_arguments": ["--select-rows", str(args.select_rows), *profile_arguments(args)],
+        "levels": levels
+    }
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results", f"load-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Local stand-ins for the external services used by the ingestion pipeline.
+
+One threaded HTTP server answers, by path:
+
+    /parse/image                      OCR.space
+    /openai/v1/chat/completions       Groq
+    /v1beta/models/<model>:<method>   Gemini (google-generativeai with transport="rest")
+    /v2/upload, /v2/transcript[/<id>] AssemblyAI (transcripts complete after processing_ms)
+    /rest/v1/<table>, /rest/v1/rpc/*  Supabase PostgREST (inserts echo rows back with ids)
+
+Each service has its own profile: a fixed latency plus uniform jitter and an
+error rate, at which requests are answered with error_status instead. Request
+and error counts are kept per service. Supabase selects return `select_rows`
+report-shaped rows.
+
+Run on its own (e.g. so a load test's clients don't share its process):
+
+    python benchmarks/mock_services.py --port 8090 --latency supabase=20 --select-rows 50
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+SERVICES = ("ocr", "groq", "gemini", "assemblyai", "supabase")
+
+OCR_TEXT = ("Student: Asha Verma. Class: KG-2. Date: 2024-05-14. Asha built a tower of twelve blocks, "
+            "counted them aloud and explained to a friend why the wide blocks belong at the bottom.")
+STRUCTURED_OBSERVATION = {
+    "studentName": "Asha Verma",
+    "studentId": "",
+    "className": "KG-2",
+    "date": "2024-05-14",
+    "observations": OCR_TEXT,
+    "strengths": ["Counting", "Spatial reasoning", "Explaining ideas"],
+    "areasOfDevelopment": ["Fine motor control"],
+    "recommendations": ["Try pattern blocks at home"]
+}
+REPORT_TEXT = "🧾 Daily Growth Report\n🧒 Child's Name: Asha Verma\n" + "Asha showed strong counting skills. " * 40
+
+
+def default_profile():
+    return {"latency_ms": 0.0, "jitter_ms": 0.0, "error_rate": 0.0, "error_status": 500, "processing_ms": 0.0}
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    services = None
+
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def _send(self, status, payload, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _handle(self):
+        path = urlsplit(self.path).path
+        body = self._read_body()
+        service = self.services.route(path)
+        if service is None:
+            return self._send(404, {"error": f"No mock for {path}"})
+        if self.services.inject(service):
+            return self._send(self.services.profiles[service]["error_status"], {"error": "injected failure"})
+        status, payload, headers = getattr(self.services, f"answer_{service}")(self.command, path, body, self.headers)
+        self._send(status, payload, headers)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_HEAD = _handle
+
+
+class MockServices:
+    def __init__(self, host='127.0.0.1', port=0, seed=None, select_rows=0):
+        self.select_rows = [{
+            "id": f"report-{i}",
+            "date": f"2024-05-{i % 28 + 1:02d}",
+            "student_name": STRUCTURED_OBSERVATION["studentName"],
+            "observer_name": "Benchmark Observer",
+            "observations": OCR_TEXT * 3
+        } for i in range(select_rows)]
+        self.profiles = {service: default_profile() for service in SERVICES}
+        self.counts = {service: {"requests": 0, "errors": 0} for service in SERVICES}
+        self._transcripts = {}
+        self._sheets = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        handler = type('BoundMockHandler', (MockHandler,), {'services': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, service, **settings):
+        unknown = set(settings) - set(self.profiles[service])
+        if unknown:
+            raise ValueError(f"Unknown settings for {service}: {', '.join(sorted(unknown))}")
+        self.profiles[service].update(settings)
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, path):
+        if path.startswith('/parse/image'):
+            return "ocr"
+        if path.startswith('/openai/'):
+            return "groq"
+        if path.startswith('/v1beta/') or path.startswith('/v1/models'):
+            return "gemini"
+        if path.startswith('/v2/'):
+            return "assemblyai"
+        if path.startswith('/rest/v1/'):
+            return "supabase"
+        return None
+
+    def inject(self, service):
+        """Sleep for the service's latency; True if this request should fail"""
+        profile = self.profiles[service]
+        with self._lock:
+            delay = profile["latency_ms"] + self._random.uniform(0, profile["jitter_ms"])
+            failed = self._random.random() < profile["error_rate"]
+            self.counts[service]["requests"] += 1
+            if failed:
+                self.counts[service]["errors"] += 1
+        if delay:
+            time.sleep(delay / 1000)
+        return failed
+
+    def answer_ocr(self, method, path, body, headers):
+        # A distinct sheet number per request keeps the app's OCR and LLM caches from answering
+        with self._lock:
+            self._sheets += 1
+            text = f"{OCR_TEXT} (sheet {self._sheets})"
+        return 200, {"ParsedResults": [{"ParsedText": text, "ErrorMessage": ""}],
+                     "IsErroredOnProcessing": False}, None
+
+    def answer_groq(self, method, path, body, headers):
+        messages = json.loads(body or b"{}").get("messages") or [{}]
+        structured = dict(STRUCTURED_OBSERVATION,
+                          observations=messages[-1].get("content", OCR_TEXT).split(": ", 1)[-1])
+        return 200, {"choices": [{"index": 0, "message": {"role": "assistant",
+                                                          "content": json.dumps(structured)}}]}, None
+
+    def answer_gemini(self, method, path, body, headers):
+        return 200, {"candidates": [{"content": {"role": "model", "parts": [{"text": REPORT_TEXT}]},
+                                     "finishReason": "STOP", "index": 0}]}, None
+
+    def answer_assemblyai(self, method, path, body, headers):
+        if path == '/v2/upload':
+            return 200, {"upload_url": f"{self.url}/v2/uploaded/{uuid.uuid4()}"}, None
+        if path == '/v2/transcript' and method == 'POST':
+            transcript_id = str(uuid.uuid4())
+            with self._lock:
+                self._transcripts[transcript_id] = time.monotonic()
+            return 200, {"id": transcript_id, "status": "queued"}, None
+        transcript_id = path.rsplit('/', 1)[-1]
+        with self._lock:
+            created = self._transcripts.get(transcript_id)
+        if created is None:
+            return 404, {"error": "Transcript not found"}, None
+        if (time.monotonic() - created) * 1000 < self.profiles["assemblyai"]["processing_ms"]:
+            return 200, {"id": transcript_id, "status": "processing"}, None
+        return 200, {"id": transcript_id, "status": "completed", "text": OCR_TEXT}, None
+
+    def answer_supabase(self, method, path, body, headers):
+        if path.startswith('/rest/v1/rpc/'):
+            return 200, None, None
+        if method == 'HEAD' or 'count=exact' in headers.get('Prefer', ''):
+            return 200, [] if method != 'HEAD' else None, {"Content-Range": "*/0"}
+        if method == 'POST':
+            rows = json.loads(body or b"[]")
+            rows = rows if isinstance(rows, list) else [rows]
+            return 201, [{"id": str(uuid.uuid4()), **row} for row in rows], None
+        if method == 'GET':
+            return 200, self.select_rows, None
+        return 200, [], None
+
+    def stats(self):
+        with self._lock:
+            return {service: dict(counts) for service, counts in self.counts.items()}
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--latency", nargs="*", metavar="SERVICE=MS", help="fixed latency per service")
+    parser.add_argument("--jitter", nargs="*", metavar="SERVICE=MS", help="extra uniform random latency")
+    parser.add_argument("--error-rate", nargs="*", metavar="SERVICE=RATE", help="fraction of requests to fail")
+
+
+def profile_arguments(args):
+    """The --latency/--jitter/--error-rate options of args as an argv list"""
+    argv = []
+    for option in ("latency", "jitter", "error_rate"):
+        if getattr(args, option):
+            argv += [f"--{option.replace('_', '-')}", *getattr(args, option)]
+    return argv
+
+
+def configure_from_args(mocks, args):
+    for option, setting in (("latency", "latency_ms"), ("jitter", "jitter_ms"), ("error_rate", "error_rate")):
+        for pair in getattr(args, option) or []:
+            service, _, value = pair.partition('=')
+            if service not in SERVICES or not value:
+                raise SystemExit(f"--{option.replace('_', '-')} expects service=value with service in "
+                                 f"{', '.join(SERVICES)}; got {pair!r}")
+            mocks.configure(service, **{setting: float(value)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--select-rows", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    mocks = MockServices(args.host, args.port, seed=args.seed, select_rows=args.select_rows)
+    configure_from_args(mocks, args)
+    print(f"Mock services listening on {mocks.url}", flush=True)
+    try:
+        mocks.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
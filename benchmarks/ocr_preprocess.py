@@ -0,0 +1,114 @@
+"""OCR payload size, latency and accuracy with and without image preprocessing.
+
+For every image in a directory of sample observation sheets, reports the
+base64 payload size before and after ImagePreprocessor. With --ocr-api-key it
+also sends both variants to OCR.space and compares the extracted text: when a
+matching <name>.txt ground-truth file exists next to the image, similarity is
+measured against it, otherwise against the text from the original image.
+
+    python benchmarks/ocr_preprocess.py samples/ --ocr-api-key KEY [--enhance-handwriting]
+"""
+import argparse
+import base64
+import difflib
+import json
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_preprocessing import ImagePreprocessor  # noqa: E402
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+
+def ocr(image_bytes, file_type, api_key, url):
+    payload = {
+        'apikey': api_key,
+        'language': 'eng',
+        'isOverlayRequired': False,
+        'OCREngine': 2,
+        'detectOrientation': True,
+        'scale': True,
+        'base64Image': f"data:image/{file_type};base64,{base64.b64encode(image_bytes).decode('utf-8')}"
+    }
+    started = time.perf_counter()
+    response = requests.post(url, data=payload, headers={'apikey': api_key}, timeout=120)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    results = response.json().get('ParsedResults') or [{}]
+    return results[0].get('ParsedText', ''), elapsed
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, " ".join(a.split()), " ".join(b.split())).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("samples", help="directory of sample observation sheet images")
+    parser.add_argument("--ocr-api-key", help="OCR.space key; when omitted only payload sizes are measured")
+    parser.add_argument("--ocr-url", default="https://api.ocr.space/parse/image")
+    parser.add_argument("--max-dimension", type=int, default=2000)
+    parser.add_argument("--target-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--enhance-handwriting", action="store_true")
+    parser.add_argument("--output", help="write per-image results as JSON")
+    args = parser.parse_args()
+
+    preprocessor = ImagePreprocessor(max_dimension=args.max_dimension, target_bytes=args.target_bytes,
+                                     enhance_handwriting=args.enhance_handwriting)
+    results = []
+
+    for name in sorted(os.listdir(args.samples)):
+        stem, extension = os.path.splitext(name)
+        if extension.lower() not in IMAGE_EXTENSIONS:
+            continue
+        with open(os.path.join(args.samples, name), 'rb') as image_file:
+            original = image_file.read()
+
+        started = time.perf_counter()
+        processed, _ = preprocessor.process(original)
+        preprocess_seconds = time.perf_counter() - started
+        processed = processed or original
+
+        result = {
+            "image": name,
+            "original_payload_bytes": len(base64.b64encode(original)),
+            "processed_payload_bytes": len(base64.b64encode(processed)),
+            "preprocess_seconds": round(preprocess_seconds, 3)
+        }
+
+        if args.ocr_api_key:
+            original_type = 'jpg' if extension.lower() in ('.jpg', '.jpeg') else extension.lower()[1:]
+            original_text, result["original_ocr_seconds"] = ocr(original, original_type, args.ocr_api_key,
+                                                                 args.ocr_url)
+            processed_text, result["processed_ocr_seconds"] = ocr(processed, 'jpg', args.ocr_api_key, args.ocr_url)
+
+            truth_path = os.path.join(args.samples, f"{stem}.txt")
+            if os.path.exists(truth_path):
+                with open(truth_path, encoding='utf-8') as truth_file:
+                    truth = truth_file.read()
+                result["original_accuracy"] = round(similarity(original_text, truth), 3)
+                result["processed_accuracy"] = round(similarity(processed_text, truth), 3)
+            else:
+                result["processed_vs_original_similarity"] = round(similarity(processed_text, original_text), 3)
+
+        results.append(result)
+        print(json.dumps(result))
+
+    if results:
+        original_total = sum(r["original_payload_bytes"] for r in results)
+        processed_total = sum(r["processed_payload_bytes"] for r in results)
+        print(f"{len(results)} images: payload {original_total / 1e6:.1f} MB -> {processed_total / 1e6:.1f} MB "
+              f"({1 - processed_total / original_total:.0%} smaller)")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
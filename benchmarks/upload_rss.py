@@ -0,0 +1,105 @@
+"""Peak RSS of concurrent audio uploads: buffered (read whole file) vs streamed.
+
+Starts a local sink server that stands in for AssemblyAI's /v2/upload, writes a
+temporary audio file of the requested size, and uploads it from several threads
+at once. Each mode runs in its own subprocess so peak RSS is measured cleanly.
+
+    python benchmarks/upload_rss.py --size-mb 200 --concurrency 4
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcription import AssemblyAITranscriber  # noqa: E402
+
+
+class UploadSink(BaseHTTPRequestHandler):
+    """Accepts fixed-length or chunked uploads and discards the body"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                self.rfile.read(size + 2)
+        else:
+            remaining = int(self.headers.get('Content-Length') or 0)
+            while remaining:
+                remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+        body = json.dumps({"upload_url": "http://localhost/uploaded"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, path, concurrency):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), UploadSink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    transcriber = AssemblyAITranscriber("benchmark", base_url=f"http://127.0.0.1:{server.server_port}/v2")
+    baseline = peak_rss_mb()
+
+    def upload(_):
+        with open(path, 'rb') as audio_file:
+            data = audio_file.read() if mode == "buffered" else audio_file
+            return transcriber.upload(data)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(upload, range(concurrency)))
+
+    server.shutdown()
+    print(json.dumps({"mode": mode, "baseline_rss_mb": round(baseline, 1), "peak_rss_mb": round(peak_rss_mb(), 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--mode", choices=["buffered", "streamed"])
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file, args.concurrency)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".wav") as audio_file:
+        chunk = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            audio_file.write(chunk)
+        audio_file.flush()
+
+        print(f"{args.concurrency} concurrent uploads of {args.size_mb} MB")
+        for mode in ("buffered", "streamed"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--file", audio_file.name,
+                 "--concurrency", str(args.concurrency)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output)
+            print(f"{mode:>9}: peak RSS {result['peak_rss_mb']:.1f} MB "
+                  f"(baseline {result['baseline_rss_mb']:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Bulk CSV imports for the admin dashboard (Streamlit) and the admin API (Flask).
+
+CSV files are streamed in chunks. Each chunk is validated and normalized with
+vectorized pandas operations, deduplicated against one prefetched set of
+existing keys, and written by an AdaptiveBatcher whose batch size grows while
+writes are fast and shrinks on slow writes or errors. Rows that still fail are
+reported with their CSV row number instead of failing the whole import.
+"""
+import logging
+import time
+import uuid
+
+import pandas as pd
+
+from read_models import fetch_all
+
+logger = logging.getLogger(__name__)
+
+CSV_CHUNK_SIZE = 5000
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+CHILD_COLUMNS = ['name']
+PARENT_COLUMNS = ['name', 'email', 'password']
+# Columns echoed back for failed parent rows; never the password
+PARENT_REPORT_COLUMNS = ['name', 'email']
+OBSERVER_MAPPING_COLUMNS = ['observer_id', 'student_id']
+RELATIONSHIP_COLUMNS = ['parent_email', 'child_name']
+
+
+class ImportResult:
+    def __init__(self, total_rows=0):
+        self.total_rows = total_rows
+        self.succeeded = 0
+        self.failures = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.total_rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "total_rows": self.total_rows,
+            "succeeded": self.succeeded,
+            "failed": len(self.failures),
+            "failures": self.failures,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1)
+        }
+
+
+class AdaptiveBatcher:
+    """Writes records in batches sized by observed latency and errors.
+
+    The batch size doubles while a batch takes less than half of
+    target_seconds and halves when it takes longer than target_seconds or
+    fails. A failed batch is retried at the smaller size; at min_size its rows
+    are written one by one so only the bad rows are reported.
+    """
+
+    def __init__(self, initial_size=100, min_size=10, max_size=2000, target_seconds=1.0):
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+
+    def write(self, client, table, records, row_numbers, on_conflict=None):
+        """Insert (or upsert, with on_conflict) records; returns (succeeded, failures)"""
+        succeeded = 0
+        failures = []
+        start = 0
+        while start < len(records):
+            size = self.size
+            chunk = records[start:start + size]
+            started = time.perf_counter()
+            try:
+                self._execute(client, table, chunk, on_conflict)
+            except Exception as e:
+                if size > self.min_size:
+                    self.size = max(self.min_size, size // 2)
+                    logger.warning(f"Write of {len(chunk)} rows into {table} failed, retrying with "
+                                   f"batches of {self.size}: {str(e)}")
+                    continue
+                for record, row in zip(chunk, row_numbers[start:start + size]):
+                    try:
+                        self._execute(client, table, record, on_conflict)
+                        succeeded += 1
+                    except Exception as row_error:
+                        failures.append({"row": row, "error": str(row_error)})
+                start += size
+                continue
+
+            elapsed = time.perf_counter() - started
+            succeeded += len(chunk)
+            start += size
+            if elapsed > self.target_seconds:
+                self.size = max(self.min_size, size // 2)
+            elif elapsed < self.target_seconds / 2:
+                self.size = min(self.max_size, size * 2)
+        return succeeded, failures
+
+    @staticmethod
+    def _execute(client, table, payload, on_conflict):
+        if on_conflict:
+            client.table(table).upsert(payload, on_conflict=on_conflict).execute()
+        else:
+            client.table(table).insert(payload).execute()
+
+
+def normalize(series):
+    """Strip and lowercase a column, treating missing values as empty strings"""
+    return series.fillna('').astype(str).str.strip().str.lower()
+
+
+def require_columns(columns, required):
+    if not all(col in columns for col in required):
+        raise ValueError(f"CSV must contain {', '.join(repr(col) for col in required)} columns")
+
+
+def collect_errors(chunk, checks):
+    """Combine (mask, message) checks into one error string per row ('' when valid)"""
+    errors = pd.Series('', index=chunk.index)
+    for mask, message in checks:
+        errors = errors.mask(mask, errors + message + ' ')
+    return errors.str.strip()
+
+
+def failure_records(chunk, errors, columns):
+    """Failure dicts (CSV row, identifying columns, error) for rows with an error"""
+    bad = chunk.loc[errors != '', columns].fillna('')
+    return bad.assign(row=bad.index + 1, error=errors[bad.index])[['row'] + columns + ['error']].to_dict('records')
+
+
+def to_records(frame):
+    """DataFrame rows as JSON-safe dicts, with missing values as None"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def ingest_csv(client, csv_file, table, required, prepare, existing_keys, chunksize=CSV_CHUNK_SIZE,
+               batcher=None, report_columns=None):
+    """Stream a CSV into table.
+
+    prepare(chunk) validates and normalizes one chunk and returns
+    (records_frame, errors): records_frame holds the columns to insert plus a
+    '_key' column used for deduplication, errors is a Series of per-row error
+    strings aligned with the chunk. Rows whose key is in existing_keys, or was
+    already seen earlier in the file, are reported as duplicates. With
+    existing_keys=None nothing is deduplicated and prepare returns no '_key'.
+    Failures echo report_columns (default: the required columns) of the CSV row.
+    """
+    started = time.perf_counter()
+    result = ImportResult()
+    batcher = batcher or AdaptiveBatcher()
+    deduplicate = existing_keys is not None
+    existing_keys = set(existing_keys or ())
+    seen = set()
+
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize, dtype=str):
+        require_columns(chunk.columns, required)
+        result.total_rows += len(chunk)
+
+        frame, errors = prepare(chunk)
+        if deduplicate:
+            valid = errors == ''
+            errors = errors.mask(valid & frame['_key'].isin(existing_keys), "Duplicate of an existing record")
+            valid = errors == ''
+            errors = errors.mask(valid & (frame['_key'].isin(seen) | frame['_key'].where(valid).duplicated()),
+                                 "Duplicate of an earlier row in the file")
+        result.failures.extend(failure_records(chunk, errors, report_columns or required))
+
+        frame = frame[errors == '']
+        if deduplicate:
+            seen.update(frame['_key'])
+            frame = frame.drop(columns='_key')
+        succeeded, write_failures = batcher.write(client, table, to_records(frame), (frame.index + 1).tolist())
+        result.succeeded += succeeded
+        result.failures.extend(write_failures)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def import_children(client, csv_file, chunksize=CSV_CHUNK_SIZE):
+    """Add children from a CSV with 'name' and optional 'birth_date' and 'grade' columns.
+
+    Children have no unique key (two children can share a name, birth date and grade), so every valid row
+    is inserted.
+    """
+    def prepare(chunk):
+        names = chunk['name'].fillna('').str.strip()
+        birth_dates = pd.to_datetime(chunk['birth_date'], errors='coerce') if 'birth_date' in chunk else None
+        errors = collect_errors(chunk, [
+            (names == '', "Missing name."),
+            (birth_dates.isna() & chunk['birth_date'].notna() if birth_dates is not None
+             else pd.Series(False, index=chunk.index), "Invalid birth_date.")
+        ])
+        frame = pd.DataFrame({
+            "name": names,
+            "birth_date": birth_dates.dt.strftime('%Y-%m-%d') if birth_dates is not None else None,
+            "grade": chunk['grade'].str.strip() if 'grade' in chunk else None
+        }, index=chunk.index)
+        return frame, errors
+
+    return ingest_csv(client, csv_file, 'children', CHILD_COLUMNS, prepare, None, chunksize)
+
+
+def import_parents(client, csv_file, chunksize=CSV_CHUNK_SIZE):
+    """Add Parent users from a CSV with 'name', 'email' and 'password' columns"""
+    existing = fetch_all(lambda: client.table('users').select("id, email").order('id'))
+
+    def prepare(chunk):
+        names = chunk['name'].fillna('').str.strip()
+        emails = normalize(chunk['email'])
+        errors = collect_errors(chunk, [
+            (names == '', "Missing name."),
+            (emails == '', "Missing email."),
+            ((emails != '') & ~emails.str.match(EMAIL_PATTERN), "Invalid email."),
+            (chunk['password'].isna(), "Missing password.")
+        ])
+        frame = pd.DataFrame({
+            "id": [str(uuid.uuid4()) for _ in range(len(chunk))],
+            "name": names,
+            "email": emails,
+            "password": chunk['password'],  # Note: In production, hash passwords
+            "role": "Parent",
+            "_key": emails
+        }, index=chunk.index)
+        return frame, errors
+
+    return ingest_csv(client, csv_file, 'users', PARENT_COLUMNS, prepare,
+                      {u['email'].strip().lower() for u in existing if u.get('email')}, chunksize,
+                      report_columns=PARENT_REPORT_COLUMNS)
+
+
+def import_observer_mappings(client, csv_file, chunksize=CSV_CHUNK_SIZE):
+    """Add observer-child mappings from a CSV with 'observer_id' and 'student_id' columns"""
+    observer_ids = {o['id'] for o in fetch_all(
+        lambda: client.table('users').select("id").eq("role", "Observer").order('id'))}
+    child_ids = {c['id'] for c in fetch_all(lambda: client.table('children').select("id").order('id'))}
+    existing = fetch_all(lambda: client.table('observer_child_mappings').select("observer_id, child_id").order('id'))
+
+    def prepare(chunk):
+        observers = chunk['observer_id'].fillna('').str.strip()
+        children = chunk['student_id'].fillna('').str.strip()
+        errors = collect_errors(chunk, [
+            (~observers.isin(observer_ids), "Invalid observer ID."),
+            (~children.isin(child_ids), "Invalid student ID.")
+        ])
+        frame = pd.DataFrame({
+            "observer_id": observers,
+            "child_id": children,
+            "_key": observers + '|' + children
+        }, index=chunk.index)
+        return frame, errors
+
+    return ingest_csv(client, csv_file, 'observer_child_mappings', OBSERVER_MAPPING_COLUMNS, prepare,
+                      {f"{m['observer_id']}|{m['child_id']}" for m in existing}, chunksize)
+
+
+def resolve_relationships(df, parents, children):
+    """Match parent_email/child_name rows to parent and child records.
+
+    Returns (resolved, failures): resolved is a DataFrame with row, parent_email,
+    child_name, parent_id and child_id columns; failures lists unmatched rows
+    with the reason.
+    """
+    rows = pd.DataFrame({
+        "row": df.index + 1,
+        "parent_email": normalize(df['parent_email']),
+        "child_name": normalize(df['child_name'])
+    })
+    parent_lookup = pd.DataFrame({
+        "parent_email": normalize(pd.Series([p.get('email') for p in parents], dtype=object)),
+        "parent_id": pd.Series([p['id'] for p in parents], dtype=object)
+    }).drop_duplicates('parent_email', keep='last')
+    child_lookup = pd.DataFrame({
+        "child_name": normalize(pd.Series([c.get('name') for c in children], dtype=object)),
+        "child_id": pd.Series([c['id'] for c in children], dtype=object)
+    }).drop_duplicates('child_name', keep='last')
+
+    merged = rows.merge(parent_lookup, on='parent_email', how='left') \
+        .merge(child_lookup, on='child_name', how='left')
+
+    parent_missing = merged['parent_id'].isna()
+    child_missing = merged['child_id'].isna()
+    unmatched = merged[parent_missing | child_missing].copy()
+    unmatched['error'] = (parent_missing[unmatched.index].map({True: "Parent not found. ", False: ""})
+                          + child_missing[unmatched.index].map({True: "Child not found.", False: ""})).str.strip()
+    failures = unmatched[['row', 'parent_email', 'child_name', 'error']].to_dict('records')
+
+    resolved = merged[~(parent_missing | child_missing)][['row', 'parent_email', 'child_name', 'parent_id',
+                                                          'child_id']]
+    return resolved, failures
+
+
+def assign_children(client, resolved, chunk_size=200):
+    """Set users.child_id for resolved (row, parent_id, child_id) rows; returns (succeeded, failures).
+
+    Only child_id is written, with one update per child covering up to
+    chunk_size parents. If an update fails, its parents are retried one at a
+    time so only the failing rows are reported.
+    """
+    succeeded = 0
+    failures = []
+    for child_id, group in resolved.groupby('child_id', sort=False):
+        for start in range(0, len(group), chunk_size):
+            chunk = group.iloc[start:start + chunk_size]
+            try:
+                client.table('users').update({"child_id": child_id}) \
+                    .in_("id", chunk['parent_id'].tolist()).execute()
+                succeeded += len(chunk)
+                continue
+            except Exception as e:
+                logger.warning(f"Assigning child {child_id} to {len(chunk)} parents failed, "
+                               f"retrying one by one: {str(e)}")
+            for row in chunk.to_dict('records'):
+                try:
+                    client.table('users').update({"child_id": child_id}).eq("id", row['parent_id']).execute()
+                    succeeded += 1
+                except Exception as row_error:
+                    failures.append({"row": row['row'], "parent_email": row['parent_email'],
+                                     "child_name": row['child_name'], "error": str(row_error)})
+    return succeeded, failures
+
+
+def import_relationships(client, df, chunk_size=200):
+    """Assign children to parents from a parent_email/child_name DataFrame"""
+    require_columns(df.columns, RELATIONSHIP_COLUMNS)
+    started = time.perf_counter()
+    result = ImportResult(len(df))
+
+    children = fetch_all(lambda: client.table('children').select("id, name").order('id'))
+    parents = fetch_all(lambda: client.table('users').select("id, email").eq("role", "Parent").order('id'))
+    resolved, result.failures = resolve_relationships(df, parents, children)
+
+    # A parent has a single child_id, so the last row for a parent wins and earlier ones are reported
+    superseded = resolved.duplicated('parent_id', keep='last')
+    last_rows = resolved.drop_duplicates('parent_id', keep='last').set_index('parent_id')['row']
+    result.failures += [
+        {"row": row["row"], "parent_email": row["parent_email"], "child_name": row["child_name"],
+         "error": f"Superseded by row {last_rows[row['parent_id']]} for the same parent"}
+        for row in resolved[superseded].to_dict('records')
+    ]
+    succeeded, write_failures = assign_children(client, resolved[~superseded], chunk_size)
+
+    result.succeeded = succeeded
+    result.failures = sorted(result.failures + write_failures, key=lambda failure: failure['row'])
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,175 @@
+"""Response compression and fingerprinted, precompressed static assets for the Flask API (app.py).
+
+ResponseCompressor runs after each request. It gzip- or brotli-encodes
+compressible responses above a size threshold, picking whichever encoding the
+client's Accept-Encoding prefers. StaticAssets loads the frontend files once
+at startup. It compresses them at the highest levels and serves them under
+fingerprinted names (script.<hash>.js), which can be cached for good, while
+index.html itself is always revalidated against its ETag. brotli is optional.
+Without it only gzip is offered.
+"""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+BROTLI = "br"
+GZIP = "gzip"
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def offered_encodings():
+    return (BROTLI, GZIP) if brotli else (GZIP,)
+
+
+def negotiate(accept_encoding, offered=None):
+    """The offered encoding the client accepts with the highest q-value, or None for identity"""
+    offered = offered or offered_encodings()
+    weights = {}
+    for part in (accept_encoding or "").split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, level=6):
+    """Encode bytes with gzip (level 1-9) or brotli (quality 0-11)"""
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=level)
+    # mtime=0 keeps the output (and so its ETag) identical across restarts
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+class ResponseCompressor:
+    def __init__(self, min_size=1024, level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.levels = {GZIP: level, BROTLI: brotli_quality}
+
+    def __call__(self, response, accept_encoding):
+        """Compress a finished response in place when worthwhile; returns it"""
+        if not compressible(response.mimetype):
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+        if response.calculate_content_length() < self.min_size:
+            return response
+        encoding = negotiate(accept_encoding)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(response.get_data(), encoding, self.levels[encoding]))
+        response.headers['Content-Encoding'] = encoding
+        # Same content, different bytes: a weak ETag still revalidates (If-None-Match compares weakly)
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+class StaticAssets:
+    """Frontend files read, fingerprinted and precompressed once, served from memory"""
+
+    def __init__(self, root, names, min_size=1024):
+        self.root = root
+        self.min_size = min_size
+        self.assets = {}
+        self.fingerprinted_names = {}
+        # Pages are loaded last so their references to the other assets can be fingerprinted
+        for name in sorted(names, key=lambda n: n.endswith('.html')):
+            try:
+                self._load(name)
+            except OSError as e:
+                logger.warning(f"Static asset {name} not loaded: {str(e)}")
+
+    def _load(self, name):
+        with open(os.path.join(self.root, name), 'rb') as f:
+            data = f.read()
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if name.endswith('.html'):
+            data = self._rewrite_references(data)
+
+        fingerprint = hashlib.sha256(data).hexdigest()[:12]
+        variants = {None: data}
+        if compressible(mimetype) and len(data) >= self.min_size:
+            variants[GZIP] = compress(data, GZIP, 9)
+            if brotli:
+                variants[BROTLI] = compress(data, BROTLI, 11)
+
+        stem, ext = os.path.splitext(name)
+        self.assets[name] = {"mimetype": mimetype, "fingerprint": fingerprint, "variants": variants}
+        self.fingerprinted_names[f"{stem}.{fingerprint}{ext}"] = name
+        logger.info(f"Static asset {name}: " + ", ".join(
+            f"{encoding or 'identity'} {len(body)} bytes" for encoding, body in variants.items()))
+
+    def _rewrite_references(self, data):
+        html = data.decode('utf-8')
+        for name in self.assets:
+            html = re.sub(rf'((?:src|href)=["\']){re.escape(name)}(["\'])',
+                          lambda m: f"{m.group(1)}{self.url(name)}{m.group(2)}", html)
+        return html.encode('utf-8')
+
+    def url(self, name):
+        """Fingerprinted file name for an asset, e.g. script.3f2a9c1d0b7e.js"""
+        stem, ext = os.path.splitext(name)
+        return f"{stem}.{self.assets[name]['fingerprint']}{ext}"
+
+    def resolve(self, path):
+        """(asset name, immutable) for a requested path, or (None, False) if it isn't a known asset"""
+        if path in self.fingerprinted_names:
+            return self.fingerprinted_names[path], True
+        if path in self.assets:
+            return path, False
+        return None, False
+
+    def response(self, name, immutable, request):
+        """The best variant for the request, or a 304 if the client's copy is current"""
+        asset = self.assets[name]
+        encoding = negotiate(request.headers.get('Accept-Encoding'), [e for e in asset["variants"] if e])
+        etag = asset["fingerprint"] + (f"-{encoding}" if encoding else "")
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(asset["variants"][encoding], mimetype=asset["mimetype"])
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE if immutable else REVALIDATE
+        if len(asset["variants"]) > 1:
+            response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,113 @@
+"""Cached Supabase reads for the Streamlit dashboards.
+
+Streamlit re-runs the whole script on every interaction, and the parent and
+observer tabs each load the same user, child and mapping rows. SessionCache is
+a read-through cache kept in a per-session mapping (st.session_state), with a
+TTL so changes made by other sessions show up. DataAccess wraps the repeated
+reads. Code that writes one of the cached tables calls invalidate(table, key).
+"""
+import time
+
+CACHE_STATE_KEY = '_read_cache'
+
+
+class SessionCache:
+    """Read-through cache of (table, key) -> rows stored in a session state mapping"""
+
+    def __init__(self, state, ttl=60):
+        self.ttl = ttl
+        if CACHE_STATE_KEY not in state:
+            state[CACHE_STATE_KEY] = {"entries": {}, "hits": 0, "misses": 0}
+        self._state = state[CACHE_STATE_KEY]
+
+    def get_or_load(self, table, key, loader):
+        entry = self._state["entries"].get((table, key))
+        if entry is not None and entry[1] > time.time():
+            self._state["hits"] += 1
+            return entry[0]
+        self._state["misses"] += 1
+        value = loader()
+        self._state["entries"][(table, key)] = (value, time.time() + self.ttl)
+        return value
+
+    def invalidate(self, table, key=None):
+        """Drop the entry for key, plus every multi-row query on the table.
+
+        With key=None every entry for the table is dropped.
+        """
+        for cached_table, cached_key in list(self._state["entries"]):
+            if cached_table != table:
+                continue
+            if key is None or cached_key == key or isinstance(cached_key, tuple):
+                del self._state["entries"][(cached_table, cached_key)]
+
+    def stats(self):
+        lookups = self._state["hits"] + self._state["misses"]
+        return {
+            "hits": self._state["hits"],
+            "misses": self._state["misses"],
+            "hit_ratio": self._state["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._state["entries"])
+        }
+
+
+class DataAccess:
+    """Reads shared by the parent and observer dashboards, served through a SessionCache.
+
+    Single-row lookups are keyed by ID; multi-row queries use tuple keys so
+    any write to their table invalidates them.
+    """
+
+    def __init__(self, client, cache):
+        self.supabase = client
+        self.cache = cache
+
+    def invalidate(self, table, key=None):
+        self.cache.invalidate(table, key)
+
+    def user(self, user_id):
+        rows = self.cache.get_or_load('users', user_id, lambda: self.supabase.table('users').select("*")
+                                      .eq("id", user_id).execute().data)
+        return rows[0] if rows else None
+
+    def child(self, child_id):
+        rows = self.cache.get_or_load('children', child_id, lambda: self.supabase.table('children').select("*")
+                                      .eq("id", child_id).execute().data)
+        return rows[0] if rows else None
+
+    def children(self, child_ids):
+        if not child_ids:
+            return []
+        ids = tuple(sorted(child_ids))
+        return self.cache.get_or_load('children', ('in', ids), lambda: self.supabase.table('children')
+                                      .select("*").in_("id", list(ids)).execute().data or [])
+
+    def observer_child_ids(self, observer_id):
+        mappings = self.cache.get_or_load(
+            'observer_child_mappings', ('observer', observer_id),
+            lambda: self.supabase.table('observer_child_mappings').select("child_id")
+            .eq("observer_id", observer_id).execute().data or [])
+        return [m['child_id'] for m in mappings]
+
+    def observer_id_for_child(self, child_id):
+        mappings = self.cache.get_or_load(
+            'observer_child_mappings', ('child', child_id),
+            lambda: self.supabase.table('observer_child_mappings').select("observer_id")
+            .eq("child_id", child_id).execute().data or [])
+        return mappings[0]['observer_id'] if mappings else None
+
+    def parents_of(self, child_ids):
+        if not child_ids:
+            return []
+        ids = tuple(sorted(child_ids))
+        return self.cache.get_or_load('users', ('parents_of', ids), lambda: self.supabase.table('users')
+                                      .select("*").eq("role", "Parent").in_("child_id", list(ids))
+                                      .execute().data or [])
+
+    def goals_for_child(self, child_id):
+        return self.cache.get_or_load('goals', ('child', child_id), lambda: self.supabase.table('goals')
+                                      .select("*").eq("child_id", child_id).execute().data or [])
+
+    def goals_for_observer(self, observer_id):
+        return self.cache.get_or_load('goals', ('observer', observer_id), lambda: self.supabase.table('goals')
+                                      .select("*").eq("observer_id", observer_id).execute().data or [])
@@ -0,0 +1,70 @@
+"""gunicorn settings for serving app.py (see wsgi.py).
+
+Every setting can be overridden from the environment. Workers use the gthread
+class, so each one handles GUNICORN_THREADS requests at once. Keep
+HTTP_POOL_MAXSIZE at least GUNICORN_THREADS + JOB_WORKERS so request and job
+threads don't queue for outbound connections.
+
+The app is not preloaded. app.py creates its Supabase, Gemini and HTTP
+clients, job thread pool and SQLite handles at import time, and none of
+them survive a fork. Each worker therefore imports the app itself after
+forking and gets its own set.
+
+AssemblyAI webhooks (ASSEMBLYAI_WEBHOOK_URL) resume jobs through an
+in-process registry. A webhook must reach the worker that submitted the
+transcript. In that mode the server therefore always runs a single worker,
+which is never recycled, and scales with threads.
+
+Jobs still running when a worker is recycled or killed are failed by the job
+heartbeat check of the remaining or replacement workers (see jobs.JobRunner).
+"""
+import multiprocessing
+import os
+
+WEBHOOK_MODE = bool(os.environ.get("ASSEMBLYAI_WEBHOOK_URL"))
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = 1 if WEBHOOK_MODE else int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+backlog = int(os.environ.get("GUNICORN_BACKLOG", 2048))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# OCR and Gemini calls can take a while; the timeout only applies to a stuck worker's heartbeat
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Recycle workers now and then so slow leaks can't accumulate (not in webhook mode: it would drop pending webhooks)
+max_requests = 0 if WEBHOOK_MODE else int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+preload_app = False
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    """Fail jobs left unfinished by the previous server once, before any worker starts"""
+    from dotenv import load_dotenv
+    from jobs import JobStore
+
+    load_dotenv()
+    JobStore(os.environ.get("JOB_STORE_PATH", ".cache/jobs.sqlite3")).fail_unfinished()
+    os.environ["JOB_RECOVERY_ON_IMPORT"] = "false"
+    # Command-line flags override this file, so enforce webhook mode's single, long-lived worker here too
+    if WEBHOOK_MODE and (server.cfg.workers > 1 or server.cfg.max_requests):
+        server.log.warning("ASSEMBLYAI_WEBHOOK_URL is set; running one worker without max_requests recycling")
+        server.cfg.set("workers", 1)
+        server.cfg.set("max_requests", 0)
+        server.num_workers = 1
+
+
+def worker_exit(server, worker):
+    """Let running background jobs finish (within graceful_timeout) before the worker exits.
+
+    Jobs cut off by the timeout are failed by the job heartbeat check.
+    """
+    import sys
+
+    app_module = sys.modules.get("app")
+    if app_module is not None:
+        app_module.job_runner.shutdown(wait=True)
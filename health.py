@@ -0,0 +1,64 @@
+"""Background health checks for external dependencies.
+
+A HealthCheck runs a probe callable on a daemon thread, immediately and then
+every `interval` seconds, and keeps the latest outcome. Pages can show a
+warning when a dependency is down without a blocking round trip at startup.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HealthCheck:
+    def __init__(self, name, probe, interval=60.0):
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.healthy = None  # None until the first probe finishes
+        self.last_error = None
+        self.last_checked = None
+        self.latency_ms = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-health", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        """Run the probe once and record the outcome; returns whether it succeeded"""
+        started = time.perf_counter()
+        try:
+            self.probe()
+        except Exception as e:
+            if self.healthy is not False:
+                logger.error(f"{self.name} health check failed: {str(e)}")
+            self.healthy, self.last_error = False, str(e)
+        else:
+            if self.healthy is False:
+                logger.info(f"{self.name} is reachable again")
+            self.healthy, self.last_error = True, None
+        self.latency_ms = (time.perf_counter() - started) * 1000
+        self.last_checked = time.time()
+        return self.healthy
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+    def status(self):
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None
+        }
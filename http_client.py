@@ -0,0 +1,134 @@
+"""Pooled HTTP client for outbound API calls (OCR.space, Groq, AssemblyAI).
+
+One HTTPClient per process keeps keep-alive connection pools per host, applies
+a default timeout, retries 429/5xx responses with backoff, and records a latency
+histogram per host. Its get/post methods take the same arguments as
+requests.get/requests.post. Idempotent methods, and POSTs the caller marks
+idempotent=True, are retried on 429/5xx responses and read errors. Other POSTs
+are retried only on 429 and 503, which mean the request was not processed,
+and never after a timeout. A replayed transcript or generation request would
+otherwise be created, and billed, twice.
+"""
+import bisect
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Responses that guarantee the server did not act on the request, so any POST may be replayed
+UNPROCESSED_STATUSES = (429, 503)
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms):
+        self.counts[bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket containing the given percentile"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return float(self.buckets[index]) if index < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class HTTPClient:
+    def __init__(self, pool_connections=10, pool_maxsize=20, timeout=(5, 120), retries=3, backoff_factor=0.5):
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.session = self._build_session(pool_connections, pool_maxsize, retry)
+        self.idempotent_post_session = self._build_session(
+            pool_connections, pool_maxsize, retry.new(allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"}))
+        # read=0/other=0: a POST that may have reached the server (timeout, dropped connection) is never resent
+        self.post_session = self._build_session(pool_connections, pool_maxsize, retry.new(
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            status_forcelist=UNPROCESSED_STATUSES,
+            read=0,
+            other=0
+        ))
+        # Streamed (generator) bodies cannot be replayed, so they never retry
+        self.streaming_session = self._build_session(pool_connections, pool_maxsize, Retry(total=0, raise_on_status=False))
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_connections, pool_maxsize, retry):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method, url, idempotent=False, **kwargs):
+        """idempotent=True lets a POST be retried like a GET; only pass it for endpoints without side effects"""
+        kwargs.setdefault("timeout", self.timeout)
+        data = kwargs.get("data")
+        streaming = data is not None and not isinstance(data, (bytes, str, dict, list, tuple))
+        if streaming:
+            session = self.streaming_session
+        elif method.upper() == "POST":
+            session = self.idempotent_post_session if idempotent else self.post_session
+        else:
+            session = self.session
+
+        started = time.perf_counter()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            self._observe(urlsplit(url).netloc, (time.perf_counter() - started) * 1000)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, idempotent=False, **kwargs):
+        return self.request("POST", url, idempotent=idempotent, **kwargs)
+
+    def _observe(self, host, elapsed_ms):
+        with self._lock:
+            histogram = self._histograms.get(host)
+            if histogram is None:
+                histogram = self._histograms[host] = LatencyHistogram()
+            histogram.observe(elapsed_ms)
+
+    def latency_report(self):
+        """Per-host request counts and latency percentiles"""
+        with self._lock:
+            return {host: histogram.summary() for host, histogram in self._histograms.items()}
@@ -0,0 +1,95 @@
+"""Prepare observation sheet photos for OCR.space.
+
+Phone photos are often 4-12 MB. Before upload they are rotated according to
+their EXIF orientation, resized to a maximum dimension, converted to grayscale
+and JPEG-recompressed until they fit a byte budget. An optional OpenCV step
+deskews the page and applies adaptive thresholding, which helps with
+handwriting.
+"""
+import io
+import logging
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITIES = (85, 75, 65, 55, 45)
+
+
+class ImagePreprocessor:
+    def __init__(self, max_dimension=2000, target_bytes=1024 * 1024, grayscale=True, enhance_handwriting=False,
+                 enabled=True):
+        self.max_dimension = max_dimension
+        self.target_bytes = target_bytes
+        self.grayscale = grayscale
+        self.enhance_handwriting = enhance_handwriting
+        self.enabled = enabled
+
+    @property
+    def cache_tag(self):
+        """Identifies the settings that shape the uploaded image, for OCR cache keys"""
+        if not self.enabled:
+            return "original"
+        return (f"{self.max_dimension}-{self.target_bytes}-{'gray' if self.grayscale else 'color'}"
+                f"{'-enhanced' if self.enhance_handwriting else ''}")
+
+    def process(self, image_bytes):
+        """Return (jpeg_bytes, 'jpg'), or (None, None) if the image can't be processed"""
+        if not self.enabled:
+            return None, None
+        try:
+            image = Image.open(io.BytesIO(image_bytes))
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("L" if self.grayscale or self.enhance_handwriting else "RGB")
+            image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+
+            if self.enhance_handwriting:
+                image = deskew_and_threshold(image)
+
+            return self._compress(image), 'jpg'
+        except Exception as e:
+            logger.warning(f"Image preprocessing failed, sending original image: {str(e)}")
+            return None, None
+
+    def _compress(self, image):
+        """JPEG-encode at decreasing quality, then shrink, until under target_bytes"""
+        while True:
+            for quality in JPEG_QUALITIES:
+                buffer = io.BytesIO()
+                image.save(buffer, format="JPEG", quality=quality, optimize=True)
+                if buffer.tell() <= self.target_bytes:
+                    return buffer.getvalue()
+            if max(image.size) <= 800:
+                return buffer.getvalue()
+            image = image.resize((int(image.width * 0.8), int(image.height * 0.8)), Image.LANCZOS)
+
+
+def deskew_and_threshold(image):
+    """Straighten a grayscale page image and binarize it with adaptive thresholding (needs OpenCV)"""
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        logger.warning("opencv-python is not installed; skipping deskew/threshold")
+        return image
+
+    gray = np.array(image)
+
+    # Estimate skew from the minimum-area rectangle around the ink
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    coords = np.column_stack(np.where(ink > 0))
+    if len(coords):
+        angle = cv2.minAreaRect(coords[:, ::-1].astype(np.float32))[-1]
+        # OpenCV versions report the angle in [-90, 0) or (0, 90]; normalize to (-45, 45]
+        if angle > 45:
+            angle -= 90
+        elif angle <= -45:
+            angle += 90
+        if 0.5 <= abs(angle) <= 15:
+            height, width = gray.shape
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            gray = cv2.warpAffine(gray, matrix, (width, height), flags=cv2.INTER_CUBIC,
+                                  borderMode=cv2.BORDER_REPLICATE)
+
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+    return Image.fromarray(binary)
@@ -0,0 +1,219 @@
+"""Background job subsystem for the Flask API (app.py).
+
+Slow ingestion work (OCR, Groq, Gemini, AssemblyAI) runs on a local worker
+pool instead of the request thread. Job state lives in a SQLite JobStore so
+any worker thread, and the GET /api/jobs/<id> endpoint, can see it.
+
+Each JobRunner owns the jobs it submits and refreshes their heartbeat while
+its process is alive. If a process exits or is killed with jobs unfinished,
+for example when gunicorn recycles or times out a worker, those jobs stop
+heartbeating. The next heartbeat pass of any runner sharing the store then
+marks them failed, so they never stay running forever.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Returned by a job function whose remaining work will be scheduled later with
+# JobContext.resume (e.g. when a webhook arrives); the job stays running.
+DEFERRED = object()
+
+
+class JobStore:
+    """Persist job status, current stage, result and error in SQLite"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )
+            """)
+            # Stores created before owners and heartbeats existed
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, kind, owner=None):
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created_at, updated_at, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, now, now, owner, now)
+            )
+        return job_id
+
+    def update(self, job_id, **fields):
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        fields['updated_at'] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def fail_unfinished(self, error="Interrupted by server restart"):
+        """Mark jobs left queued or running by a previous process as failed"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+                (FAILED, error, time.time(), QUEUED, RUNNING)
+            )
+
+    def heartbeat(self, owner):
+        """Refresh the heartbeat of the owner's unfinished jobs"""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN (?, ?)",
+                (time.time(), owner, QUEUED, RUNNING)
+            )
+
+    def fail_stale(self, older_than_seconds, error="The server stopped before the job finished"):
+        """Fail unfinished jobs whose owner hasn't sent a heartbeat within the given age; returns how many"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status IN (?, ?) AND COALESCE(heartbeat_at, updated_at) < ?",
+                (FAILED, error, now, QUEUED, RUNNING, now - older_than_seconds)
+            ).rowcount
+
+    def purge(self, older_than_seconds):
+        """Delete finished jobs older than the given age"""
+        cutoff = time.time() - older_than_seconds
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, cutoff)
+            )
+
+
+class JobContext:
+    """Handle passed to a running job function"""
+
+    def __init__(self, runner, job_id):
+        self.runner = runner
+        self.id = job_id
+
+    def set_stage(self, stage):
+        """Record the stage the job is currently in"""
+        self.runner.store.update(self.id, stage=stage)
+
+    def resume(self, fn, *args, **kwargs):
+        """Continue a deferred job by running fn(context, ...) on the worker pool"""
+        self.runner.executor.submit(self.runner._run, self.id, fn, args, kwargs)
+
+
+class JobRunner:
+    """Run jobs on a bounded thread pool and record their progress in a JobStore.
+
+    A job function is called as fn(job, *args, **kwargs) with a JobContext and
+    must return a JSON serializable result, or DEFERRED if it arranged for
+    job.resume to be called later. Finished jobs older than retention_seconds
+    are purged on the first submit and then every purge_every submits. Every
+    heartbeat_interval seconds the runner refreshes its own jobs' heartbeat
+    and fails any job, from any process, without a heartbeat for stale_after
+    seconds.
+    """
+
+    def __init__(self, store, max_workers=4, retention_seconds=7 * 86400, purge_every=100,
+                 heartbeat_interval=15, stale_after=90):
+        self.store = store
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.retention_seconds = retention_seconds
+        self.purge_every = purge_every
+        self._submitted = 0
+        self._submit_lock = threading.Lock()
+        # Unique per runner, so a reused PID can't adopt a dead process's jobs
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._stop = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat(self.owner)
+                failed = self.store.fail_stale(self.stale_after)
+                if failed:
+                    logger.warning(f"Failed {failed} job(s) whose worker stopped sending heartbeats")
+            except sqlite3.Error as e:
+                logger.warning(f"Job heartbeat failed: {str(e)}")
+
+    def _maybe_purge(self):
+        with self._submit_lock:
+            due = self._submitted % self.purge_every == 0
+            self._submitted += 1
+        if due and self.retention_seconds:
+            try:
+                self.store.purge(self.retention_seconds)
+            except sqlite3.Error as e:
+                logger.warning(f"Purging old jobs failed: {str(e)}")
+
+    def submit(self, kind, fn, *args, **kwargs):
+        self._maybe_purge()
+        job_id = self.store.create(kind, owner=self.owner)
+        self.executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        self.store.update(job_id, status=RUNNING)
+        try:
+            result = fn(JobContext(self, job_id), *args, **kwargs)
+            if result is not DEFERRED:
+                self.store.update(job_id, status=SUCCEEDED, stage=None, result=result)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self.store.update(job_id, status=FAILED, error=str(e))
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+        self._stop.set()
@@ -1,13 +1,10 @@
 import streamlit as st
-import requests
 import base64
 import json
 from supabase import create_client
 from datetime import datetime, timedelta
 import re
 import time
-import google.generativeai as genai
-import docx
 import io
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -16,11 +13,21 @@ import os
 import pathlib
 import uuid
 import logging
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from activity_log import ActivityLogger
+from cache import build_cache, llm_cache_key, sha256_hexdigest
+from data_access import DataAccess, SessionCache
+from health import HealthCheck
+from http_client import HTTPClient
+from image_preprocessing import ImagePreprocessor
+from messaging import MessageStore, encode_cursor
+from observation_store import ObservationStore, REPORT_LIST_COLUMNS, decode_list
+from pipeline import StageGraph
+from read_models import ObserverMappingReadModel
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from transcription import AssemblyAITranscriber, TranscriptionError, DEFAULT_BASE_URL as DEFAULT_ASSEMBLYAI_BASE_URL
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -44,18 +51,8 @@ def init_supabase():
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("Supabase URL or KEY not found in secrets")
 
-        client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-        # Test connection
-        try:
-            test = client.table('users').select("count", count="exact").execute()
-            logger.info(f"Supabase connected successfully. Found {test.count} users.")
-        except Exception as test_error:
-            logger.error(f"Supabase connection test failed: {str(test_error)}")
-            st.error("Failed to connect to database. Please check your connection settings.")
-            raise
-
-        return client
+        # Connectivity is checked in the background (get_supabase_health) so the first page isn't held up
+        return create_client(SUPABASE_URL, SUPABASE_KEY)
 
     except Exception as e:
         logger.error(f"Supabase initialization failed: {str(e)}")
@@ -66,6 +63,19 @@ def init_supabase():
 supabase = init_supabase()
 
 
+@st.cache_resource
+def get_supabase_health():
+    """Background Supabase connectivity check, shared by all sessions"""
+    def probe():
+        supabase.table('users').select("id").limit(1).execute()
+
+    return HealthCheck("Supabase", probe, interval=float(st.secrets.get("SUPABASE_HEALTH_INTERVAL_SECONDS", 60))).start()
+
+
+# Observation/alignment writes that keep monthly_aggregates current
+observation_store = ObservationStore(supabase)
+
+
 def upload_file_to_storage(file_data, file_name, file_type):
     """Upload a file to Supabase Storage and return the URL"""
     try:
@@ -91,22 +101,174 @@ def upload_file_to_storage(file_data, file_name, file_type):
         return None
 
 
-# Configure Google AI API
-genai.configure(api_key=st.secrets.get("GOOGLE_API_KEY"))
+def run_image_pipeline(extractor, uploaded_file, user_info, observation_row):
+    """OCR -> Groq -> report and save, with the Storage upload running alongside; returns a PipelineResult
+
+    observation_row(structured_data, file_url) builds the row to insert. Stages: upload, ocr, structure,
+    report and save; save waits for both structure and upload, report only for structure.
+    """
+    # Read the upload once on this thread; the stages get the bytes, or their own buffer, never the UploadedFile
+    uploaded_file.seek(0)
+    image_bytes = uploaded_file.getvalue()
+    content_type = f"image/{uploaded_file.type.split('/')[1]}"
+    ocr_file = io.BytesIO(image_bytes)
+    ocr_file.name, ocr_file.type = uploaded_file.name, uploaded_file.type
+    # Stages call st.error, which needs this script run's context in the worker threads
+    ctx = get_script_run_ctx()
+
+    def observations(structured_data):
+        return structured_data.get("observations", "")
+
+    graph = StageGraph(max_workers=3, initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx))
+    graph.add("upload", lambda: upload_file_to_storage(image_bytes, uploaded_file.name, content_type))
+    graph.add("ocr", lambda: extractor.extract_text_with_ocr(ocr_file))
+    graph.add("structure", extractor.process_with_groq, after=["ocr"])
+    graph.add("report", lambda structured_data: extractor.generate_report_from_text(
+        observations(structured_data), user_info) if observations(structured_data) else None, after=["structure"])
+    graph.add("save", lambda structured_data, file_url: observation_store.insert_observation(
+        observation_row(structured_data, file_url)) if observations(structured_data) else None,
+              after=["structure", "upload"])
+    return graph.run()
+
+
+@st.cache_resource
+def get_genai():
+    """google.generativeai, imported and configured the first time a report is generated"""
+    import google.generativeai as genai
+    genai.configure(api_key=st.secrets.get("GOOGLE_API_KEY"))
+    return genai
+
 
 # Set up AssemblyAI API key
 assemblyai_key = st.secrets.get("ASSEMBLYAI_API_KEY", "")
 
 
+@st.cache_resource
+def get_ocr_cache():
+    """OCR results keyed by image hash, shared across sessions"""
+    return build_cache(
+        max_entries=int(st.secrets.get("OCR_CACHE_MAX_ENTRIES", 256)),
+        ttl=int(st.secrets.get("OCR_CACHE_TTL_SECONDS", 86400)),
+        disk_path=st.secrets.get("OCR_CACHE_PATH"),
+        disk_max_entries=int(st.secrets.get("OCR_CACHE_DISK_MAX_ENTRIES", 10000))
+    )
+
+
+@st.cache_resource
+def get_http_client():
+    """Pooled keep-alive HTTP client for OCR.space, Groq and AssemblyAI, shared across sessions"""
+    return HTTPClient(
+        pool_maxsize=int(st.secrets.get("HTTP_POOL_MAXSIZE", 20)),
+        timeout=(5, float(st.secrets.get("HTTP_TIMEOUT_SECONDS", 120))),
+        retries=int(st.secrets.get("HTTP_MAX_RETRIES", 3))
+    )
+
+
+@st.cache_resource
+def get_llm_cache():
+    """Groq/Gemini responses keyed by model, prompt hash and parameters; persisted in SQLite"""
+    return build_cache(
+        max_entries=int(st.secrets.get("LLM_CACHE_MAX_ENTRIES", 512)),
+        ttl=int(st.secrets.get("LLM_CACHE_TTL_SECONDS", 7 * 86400)),
+        disk_path=st.secrets.get("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3") or None,
+        disk_max_entries=int(st.secrets.get("LLM_CACHE_DISK_MAX_ENTRIES", 10000))
+    )
+
+
+@st.cache_resource
+def get_activity_logger():
+    """Background writer for observer_activity_logs, shared across sessions"""
+    return ActivityLogger(
+        supabase,
+        batch_size=int(st.secrets.get("ACTIVITY_LOG_BATCH_SIZE", 50)),
+        flush_interval=float(st.secrets.get("ACTIVITY_LOG_FLUSH_SECONDS", 5))
+    )
+
+
+def activity_event(action, duration_minutes=0):
+    """Row for observer_activity_logs; timestamped now since the insert happens later"""
+    return {
+        "observer_id": st.session_state.auth['user_id'],
+        "child_id": "N/A",
+        "action": action,
+        "duration_minutes": duration_minutes,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def get_data_access():
+    """Supabase reads cached for the current Streamlit session"""
+    cache = SessionCache(st.session_state, ttl=int(st.secrets.get("SESSION_CACHE_TTL_SECONDS", 60)))
+    return DataAccess(supabase, cache)
+
+
+def get_message_store():
+    return MessageStore(supabase, page_size=int(st.secrets.get("MESSAGE_PAGE_SIZE", 50)))
+
+
+def show_conversation(user_id, other_id, other_name):
+    """Render a conversation, fetching only what is newer than the messages already loaded"""
+    store = get_message_store()
+    state_key = f"conversation_{user_id}_{other_id}"
+    conversation = st.session_state.get(state_key)
+
+    if conversation and conversation["messages"]:
+        newer, has_more = store.since(user_id, other_id, encode_cursor(conversation["messages"][-1]))
+        if has_more:
+            # More than a page arrived since the last rerun; start again from the newest page
+            conversation = None
+        else:
+            conversation["messages"].extend(newer)
+    if not conversation or not conversation["messages"]:
+        messages, has_older = store.latest(user_id, other_id)
+        conversation = st.session_state[state_key] = {"messages": messages, "has_older": has_older}
+
+    if conversation["has_older"] and st.button("Load older messages", key=f"older_{state_key}"):
+        older, conversation["has_older"] = store.before(user_id, other_id,
+                                                        encode_cursor(conversation["messages"][0]))
+        conversation["messages"][:0] = older
+
+    # Display message history
+    message_container = st.container(height=400)
+    with message_container:
+        for msg in conversation["messages"]:
+            is_from_me = msg['sender_id'] == user_id
+
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                st.write("You:" if is_from_me else f"{other_name}:")
+            with col2:
+                st.write(msg['content'])
+
+
+def show_read_cache_stats():
+    stats = get_data_access().cache.stats()
+    st.caption(f"Session read cache: {stats['hits']} hits / {stats['misses']} misses "
+               f"({stats['hit_ratio']:.0%} hit ratio, {stats['entries']} entries)")
+
+
 class ObservationExtractor:
     def __init__(self):
         self.ocr_api_key = st.secrets.get("OCR_API_KEY")
         self.groq_api_key = st.secrets.get("GROQ_API_KEY")
         self.gemini_api_key = st.secrets.get("GOOGLE_API_KEY")
+        self.ocr_cache = get_ocr_cache()
+        self.llm_cache = get_llm_cache()
+        self.http = get_http_client()
+        self.preprocessor = ImagePreprocessor(
+            max_dimension=int(st.secrets.get("OCR_MAX_DIMENSION", 2000)),
+            target_bytes=int(st.secrets.get("OCR_TARGET_BYTES", 1024 * 1024)),
+            enhance_handwriting=str(st.secrets.get("OCR_ENHANCE_HANDWRITING", "false")).lower() == "true",
+            enabled=str(st.secrets.get("OCR_PREPROCESS", "true")).lower() == "true"
+        )
+        # Maximum number of concurrent Groq requests when scoring goal alignments
+        self.alignment_workers = int(st.secrets.get("GOAL_ALIGNMENT_WORKERS", 4))
+        # "per_goal" sends one request per goal, "batch" scores all goals in one request
+        self.alignment_mode = st.secrets.get("GOAL_ALIGNMENT_MODE", "per_goal")
 
-    def image_to_base64(self, image_file):
-        """Convert image file to base64 string"""
-        return base64.b64encode(image_file.read()).decode('utf-8')
+    def image_to_base64(self, image_bytes):
+        """Convert image bytes to base64 string"""
+        return base64.b64encode(image_bytes).decode('utf-8')
 
     def extract_text_with_ocr(self, image_file):
         """Extract text from image using OCR.space API"""
@@ -116,8 +278,21 @@ class ObservationExtractor:
             if file_type == 'jpeg':
                 file_type = 'jpg'
 
+            # Return the cached text if this exact image was already processed
+            image_bytes = image_file.read()
+            # Different preprocessing settings send OCR a different image, so they get their own entries
+            cache_key = f"ocr:{self.preprocessor.cache_tag}:{sha256_hexdigest(image_bytes)}"
+            cached_text = self.ocr_cache.get(cache_key)
+            if cached_text is not None:
+                return cached_text
+
+            # Rotate, downscale and recompress the photo to cut upload size
+            processed_bytes, processed_type = self.preprocessor.process(image_bytes)
+            if processed_bytes:
+                image_bytes, file_type = processed_bytes, processed_type
+
             # Convert image to base64
-            base64_image = self.image_to_base64(image_file)
+            base64_image = self.image_to_base64(image_bytes)
             base64_image_with_prefix = f"data:image/{file_type};base64,{base64_image}"
 
             # Prepare request payload
@@ -134,10 +309,11 @@ class ObservationExtractor:
             }
 
             # Send request to OCR API
-            response = requests.post(
+            response = self.http.post(
                 'https://api.ocr.space/parse/image',
                 data=payload,
-                headers={'apikey': self.ocr_api_key}
+                headers={'apikey': self.ocr_api_key},
+                idempotent=True  # parsing an image has no side effects, so it is safe to retry
             )
 
             response.raise_for_status()
@@ -157,13 +333,14 @@ class ObservationExtractor:
             if not extracted_text or not extracted_text.strip():
                 raise Exception("No text was detected in the image")
 
+            self.ocr_cache.set(cache_key, extracted_text)
             return extracted_text
 
         except Exception as e:
             st.error(f"OCR Error: {str(e)}")
             raise
 
-    def process_with_groq(self, extracted_text):
+    def process_with_groq(self, extracted_text, use_cache=True):
         """Process extracted text with Groq AI"""
         try:
             # Original detailed prompt
@@ -193,28 +370,39 @@ For observations, provide full detailed descriptions like:
 
 Be creative in extracting information based on context."""
 
+            request_body = {
+                "model": "llama-3.3-70b-versatile",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Extract and structure the following text from an observation sheet: {extracted_text}"
+                    }
+                ],
+                "temperature": 0.2,
+                "response_format": {"type": "json_object"}
+            }
+
+            # Reuse the structured result of an identical earlier request
+            cache_key = llm_cache_key(request_body["model"], request_body["messages"],
+                                      temperature=request_body["temperature"],
+                                      response_format=request_body["response_format"])
+            if use_cache:
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
             # Send request to Groq API
-            response = requests.post(
+            response = self.http.post(
                 'https://api.groq.com/openai/v1/chat/completions',
                 headers={
                     'Authorization': f'Bearer {self.groq_api_key}',
                     'Content-Type': 'application/json'
                 },
-                json={
-                    "model": "llama-3.3-70b-versatile",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Extract and structure the following text from an observation sheet: {extracted_text}"
-                        }
-                    ],
-                    "temperature": 0.2,
-                    "response_format": {"type": "json_object"}
-                }
+                json=request_body
             )
 
             response.raise_for_status()
@@ -222,87 +410,236 @@ Be creative in extracting information based on context."""
 
             # Extract the JSON content
             ai_response = data['choices'][0]['message']['content']
-            return json.loads(ai_response)
+            structured_data = json.loads(ai_response)
+            self.llm_cache.set(cache_key, structured_data)
+            return structured_data
 
         except Exception as e:
             st.error(f"Groq API Error: {str(e)}")
             raise
 
-    def transcribe_with_assemblyai(self, audio_file):
-        """Transcribe audio using AssemblyAI API"""
-        if not assemblyai_key:
-            return "Error: AssemblyAI API key is not configured. Please add it to your secrets."
+    def analyze_goal_alignment(self, goal, observations_text):
+        """Score how well an observation aligns with a single goal using Groq AI.
 
-        # Set up the API headers
-        headers = {
-            "authorization": assemblyai_key,
-            "content-type": "application/json"
-        }
+        Raises on failure; safe to call from worker threads (no Streamlit calls).
+        """
+        alignment_prompt = f"""
+        Analyze how well this observation report aligns with the following learning goal:
 
-        # Upload the audio file
-        try:
-            st.write("Uploading audio file...")
-            upload_response = requests.post(
-                "https://api.assemblyai.com/v2/upload",
-                headers={"authorization": assemblyai_key},
-                data=audio_file.getvalue()
-            )
+        GOAL: {goal['goal_text']}
 
-            if upload_response.status_code != 200:
-                return f"Error uploading audio: {upload_response.text}"
+        OBSERVATION REPORT:
+        {observations_text}
 
-            upload_url = upload_response.json()["upload_url"]
+        Provide your analysis in JSON format with:
+        - alignment_score (0-10 scale)
+        - analysis_text (detailed explanation of alignment)
+        - suggested_next_steps
+        """
 
-            # Request transcription
-            st.write("Processing transcription...")
-            transcript_request = {
-                "audio_url": upload_url,
-                "language_code": "en"
+        response = self.http.post(
+            'https://api.groq.com/openai/v1/chat/completions',
+            headers={
+                'Authorization': f'Bearer {self.groq_api_key}',
+                'Content-Type': 'application/json'
+            },
+            json={
+                "model": "llama-3.3-70b-versatile",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an educational assessment AI that analyzes how well observation reports align with learning goals."
+                    },
+                    {
+                        "role": "user",
+                        "content": alignment_prompt
+                    }
+                ],
+                "temperature": 0.2,
+                "response_format": {"type": "json_object"}
             }
+        )
 
-            transcript_response = requests.post(
-                "https://api.assemblyai.com/v2/transcript",
-                json=transcript_request,
-                headers=headers
-            )
+        response.raise_for_status()
+        data = response.json()
+        return json.loads(data['choices'][0]['message']['content'])
+
+    def analyze_goal_alignments_batch(self, goals, observations_text):
+        """Score an observation against all goals in a single Groq request.
 
-            if transcript_response.status_code != 200:
-                return f"Error requesting transcription: {transcript_response.text}"
+        Returns a dict of goal ID -> analysis for every well-formed entry in the
+        model's answer. Goals missing from the result were not scored.
+        Raises if the response is not a usable JSON array.
+        """
+        goals_text = "\n".join(f"- goal_id: {goal['id']}\n  GOAL: {goal['goal_text']}" for goal in goals)
+        alignment_prompt = f"""
+        Analyze how well this observation report aligns with each of the following learning goals:
 
-            transcript_id = transcript_response.json()["id"]
+        {goals_text}
 
-            # Poll for completion
-            status = "processing"
-            progress_bar = st.progress(0)
-            while status != "completed" and status != "error":
-                polling_response = requests.get(
-                    f"https://api.assemblyai.com/v2/transcript/{transcript_id}",
-                    headers=headers
-                )
+        OBSERVATION REPORT:
+        {observations_text}
 
-                if polling_response.status_code != 200:
-                    return f"Error checking transcription status: {polling_response.text}"
+        Provide your analysis in JSON format as an object with a single key "alignments",
+        an array containing one entry per goal with:
+        - goal_id (copied exactly from the goal list)
+        - alignment_score (0-10 scale)
+        - analysis_text (detailed explanation of alignment)
+        - suggested_next_steps
+        """
 
-                polling_data = polling_response.json()
-                status = polling_data["status"]
+        response = self.http.post(
+            'https://api.groq.com/openai/v1/chat/completions',
+            headers={
+                'Authorization': f'Bearer {self.groq_api_key}',
+                'Content-Type': 'application/json'
+            },
+            json={
+                "model": "llama-3.3-70b-versatile",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an educational assessment AI that analyzes how well observation reports align with learning goals."
+                    },
+                    {
+                        "role": "user",
+                        "content": alignment_prompt
+                    }
+                ],
+                "temperature": 0.2,
+                "response_format": {"type": "json_object"}
+            }
+        )
 
-                if status == "completed":
-                    progress_bar.progress(100)
-                    return polling_data["text"]
-                elif status == "error":
-                    return f"Transcription error: {polling_data.get('error', 'Unknown error')}"
+        response.raise_for_status()
+        data = response.json()
+        result = json.loads(data['choices'][0]['message']['content'])
 
-                # Update progress
-                progress = polling_data.get("percent_done", 0)
-                if progress:
-                    progress_bar.progress(progress / 100.0)
-                time.sleep(2)
+        entries = result.get('alignments') if isinstance(result, dict) else result
+        if not isinstance(entries, list):
+            raise ValueError("Batch alignment response did not contain an 'alignments' array")
 
-            return "Error: Transcription timed out or failed."
+        goal_ids = {str(goal['id']): goal['id'] for goal in goals}
+        analyses = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or str(entry.get('goal_id')) not in goal_ids:
+                continue
+            try:
+                score = float(entry.get('alignment_score'))
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= score <= 10:
+                continue
+            entry['alignment_score'] = int(score) if score.is_integer() else score
+            analyses[goal_ids[str(entry['goal_id'])]] = entry
+
+        return analyses
+
+    def align_goals(self, goals, observations_text, report_id, max_workers=None, mode=None):
+        """Score an observation against several goals.
+
+        mode is "per_goal" (one concurrent Groq request per goal) or "batch"
+        (one request for all goals, falling back to per-goal requests for any
+        goal the batch answer did not cover). Defaults to the
+        GOAL_ALIGNMENT_MODE secret.
+
+        Returns (alignment_rows, failures) where alignment_rows are ready for a
+        single bulk insert into goal_alignments and failures is a list of
+        (goal, error message) for goals that could not be scored.
+        """
+        mode = mode or self.alignment_mode
+        started = time.perf_counter()
+        alignment_rows = []
+        failures = []
+
+        if mode == "batch" and goals:
+            try:
+                analyses = self.analyze_goal_alignments_batch(goals, observations_text)
+            except Exception as e:
+                logger.warning(f"Batch goal alignment failed, falling back to per-goal requests: {str(e)}")
+                analyses = {}
+
+            for goal in goals:
+                analysis = analyses.get(goal['id'])
+                if analysis:
+                    alignment_rows.append({
+                        "goal_id": goal['id'],
+                        "report_id": report_id,
+                        "alignment_score": analysis.get('alignment_score', 0),
+                        "analysis_text": analysis.get('analysis_text', 'No analysis')
+                    })
+            goals = [goal for goal in goals if goal['id'] not in analyses]
+            if goals:
+                logger.info(f"Batch goal alignment missed {len(goals)} goal(s); scoring them individually")
+
+        if goals:
+            rows, failures = self._align_goals_concurrently(goals, observations_text, report_id, max_workers)
+            alignment_rows.extend(rows)
+
+        logger.info(f"Goal alignment ({mode}) scored {len(alignment_rows)} goal(s) "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return alignment_rows, failures
+
+    def _align_goals_concurrently(self, goals, observations_text, report_id, max_workers=None):
+        """Score goals with one Groq request each, bounded by max_workers"""
+        max_workers = max(1, min(max_workers or self.alignment_workers, len(goals) or 1))
+        alignment_rows = []
+        failures = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.analyze_goal_alignment, goal, observations_text): goal
+                for goal in goals
+            }
+            for future in as_completed(futures):
+                goal = futures[future]
+                try:
+                    analysis = future.result()
+                    alignment_rows.append({
+                        "goal_id": goal['id'],
+                        "report_id": report_id,
+                        "alignment_score": analysis.get('alignment_score', 0),
+                        "analysis_text": analysis.get('analysis_text', 'No analysis')
+                    })
+                except Exception as e:
+                    logger.error(f"Goal alignment failed for goal {goal['id']}: {str(e)}")
+                    failures.append((goal, str(e)))
+
+        return alignment_rows, failures
+
+    def transcribe_with_assemblyai(self, audio_file):
+        """Transcribe audio using AssemblyAI API"""
+        if not assemblyai_key:
+            return "Error: AssemblyAI API key is not configured. Please add it to your secrets."
+
+        transcriber = AssemblyAITranscriber(
+            assemblyai_key,
+            base_url=st.secrets.get("ASSEMBLYAI_BASE_URL", DEFAULT_ASSEMBLYAI_BASE_URL),
+            deadline=int(st.secrets.get("TRANSCRIPTION_DEADLINE_SECONDS", 900)),
+            http=self.http
+        )
+
+        # Upload the audio file
+        try:
+            st.write("Uploading audio file...")
+            audio_file.seek(0)
+            upload_url = transcriber.upload(audio_file)
+
+            # Request transcription
+            st.write("Processing transcription...")
+            transcript_id = transcriber.request_transcript(upload_url)
+
+            # Wait for completion, backing off between status checks
+            progress_bar = st.progress(0)
+            text = transcriber.wait(transcript_id, on_progress=lambda percent: progress_bar.progress(percent / 100.0))
+            progress_bar.progress(100)
+            return text
+        except TranscriptionError as e:
+            return str(e)
         except Exception as e:
             return f"Error during transcription: {str(e)}"
 
-    def generate_report_from_text(self, text_content, user_info):
+    def generate_report_from_text(self, text_content, user_info, use_cache=True):
         """Generate a structured report from text using Google Gemini"""
         prompt = f"""
         Based on this text from a student observation, create a detailed observer report following the new Daily Growth Report format.
@@ -352,9 +689,16 @@ Be creative in extracting information based on context."""
         Use the exact section titles, emojis and format as above. For items that cannot be determined from the text, make reasonable inferences based on the available information.
         """
 
+        model_name = 'gemini-2.0-flash'
+        cache_key = llm_cache_key(model_name, prompt)
+        if use_cache:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             # Configure the model - using Gemini Pro for most comprehensive responses
-            model = genai.GenerativeModel('gemini-2.0-flash')
+            model = get_genai().GenerativeModel(model_name)
 
             # Generate content with Gemini
             response = model.generate_content([
@@ -364,12 +708,14 @@ Be creative in extracting information based on context."""
             # Extract the content from the response
             report_content = response.text
 
+            self.llm_cache.set(cache_key, report_content)
             return report_content
         except Exception as e:
             return f"Error generating report: {str(e)}"
 
     def create_word_document(self, report_content):
         """Create a Word document from the report content with proper formatting"""
+        import docx
         doc = docx.Document()
 
         # Add title
@@ -471,130 +817,78 @@ class MonthlyReportGenerator:
     def __init__(self, supabase_client):
         self.supabase = supabase_client
 
-    def get_month_data(self, child_id, year, month):
-        """Fetch all observations for a specific child in a given month"""
-        # Convert month/year to date range
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-
+    def get_month_summary(self, child_id, year, month):
+        """Counts and goal progress for a month, read from the precomputed monthly aggregate"""
         try:
-            # Query observations table for the specified date range
-            response = self.supabase.table('observations').select("*") \
-                .eq("student_id", child_id) \
-                .gte("date", start_date) \
-                .lt("date", end_date) \
-                .execute()
-
-            return response.data
+            aggregate = ObservationStore(self.supabase).monthly_aggregate(child_id, year, month)
         except Exception as e:
             st.error(f"Error fetching monthly data: {str(e)}")
-            return []
-
-    def get_goal_progress(self, child_id, year, month):
-        """Get goal progress data for the specified month"""
-        # Convert month/year to date range
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-
-        try:
-            # Get goals for this child
-            goals_response = self.supabase.table('goals').select("*") \
-                .eq("child_id", child_id) \
-                .execute()
-
-            goals = goals_response.data
-
-            # Get alignments for these goals within the time period
-            goal_progress = []
+            return None
 
+        # Goal texts for the goals that have scores this month
+        goal_scores = aggregate.get('goal_scores') or {}
+        goal_progress = []
+        if goal_scores:
+            goals = self.supabase.table('goals').select("id, goal_text") \
+                .in_("id", list(goal_scores.keys())) \
+                .execute().data or []
             for goal in goals:
-                # Get alignments for this goal
-                alignments_response = self.supabase.table('goal_alignments').select("*") \
-                    .eq("goal_id", goal['id']) \
-                    .execute()
-
-                alignments = alignments_response.data
-
-                # Filter alignments by report date
-                relevant_alignments = []
-                for alignment in alignments:
-                    report_response = self.supabase.table('observations').select("date") \
-                        .eq("id", alignment['report_id']) \
-                        .execute()
-
-                    if report_response.data:
-                        report_date = report_response.data[0]['date']
-                        if start_date <= report_date < end_date:
-                            relevant_alignments.append(alignment)
-
-                # Calculate progress metrics
-                if relevant_alignments:
-                    avg_score = sum(a['alignment_score'] for a in relevant_alignments) / len(relevant_alignments)
-                    progress_trend = [a['alignment_score'] for a in relevant_alignments]
-
+                scores = goal_scores.get(str(goal['id']))
+                if scores and scores['count']:
                     goal_progress.append({
                         'goal_text': goal['goal_text'],
-                        'avg_score': avg_score,
-                        'progress_trend': progress_trend,
-                        'num_observations': len(relevant_alignments)
+                        'avg_score': scores['sum'] / scores['count'],
+                        'progress_trend': scores['scores'],
+                        'num_observations': scores['count']
                     })
 
-            return goal_progress
-        except Exception as e:
-            st.error(f"Error fetching goal progress: {str(e)}")
-            return []
-
-    def get_strength_areas(self, observations):
-        """Extract and count strength areas from observations"""
-        strength_counts = {}
-
-        for obs in observations:
-            if obs.get('strengths'):
-                try:
-                    strengths = json.loads(obs['strengths']) if isinstance(obs['strengths'], str) else obs['strengths']
-                    for strength in strengths:
-                        strength_counts[strength] = strength_counts.get(strength, 0) + 1
-                except:
-                    pass
-
-        # Sort by frequency
-        return dict(sorted(strength_counts.items(), key=lambda x: x[1], reverse=True))
-
-    def get_development_areas(self, observations):
-        """Extract and count development areas from observations"""
-        development_counts = {}
-
-        for obs in observations:
-            if obs.get('areas_of_development'):
-                try:
-                    areas = json.loads(obs['areas_of_development']) if isinstance(obs['areas_of_development'], str) else \
-                        obs['areas_of_development']
-                    for area in areas:
-                        development_counts[area] = development_counts.get(area, 0) + 1
-                except:
-                    pass
+        return {
+            "num_observations": aggregate.get('observation_count', 0),
+            "date_counts": aggregate.get('observations_by_date') or {},
+            # Sort by frequency
+            "strength_counts": dict(sorted((aggregate.get('strength_counts') or {}).items(),
+                                           key=lambda x: x[1], reverse=True)),
+            "development_counts": dict(sorted((aggregate.get('development_counts') or {}).items(),
+                                              key=lambda x: x[1], reverse=True)),
+            "goal_progress": goal_progress
+        }
 
-        # Sort by frequency
-        return dict(sorted(development_counts.items(), key=lambda x: x[1], reverse=True))
+    def get_goal_alignments(self, goals):
+        """Load alignments for a list of goals in two queries, keyed by goal ID.
 
-    def generate_observation_frequency_chart(self, observations):
+        Each alignment is annotated with the 'report_date' of its observation
+        (None if the observation no longer exists).
+        """
+        alignments_by_goal = {goal['id']: [] for goal in goals}
+        if not alignments_by_goal:
+            return alignments_by_goal
+
+        # All alignments for these goals in one round trip
+        alignments = self.supabase.table('goal_alignments').select("*") \
+            .in_("goal_id", list(alignments_by_goal.keys())) \
+            .execute().data or []
+
+        # All report dates for those alignments in a second round trip
+        report_ids = list({a['report_id'] for a in alignments if a.get('report_id')})
+        report_dates = {}
+        if report_ids:
+            reports = self.supabase.table('observations').select("id, date") \
+                .in_("id", report_ids) \
+                .execute().data or []
+            report_dates = {r['id']: r.get('date') for r in reports}
+
+        for alignment in alignments:
+            alignment['report_date'] = report_dates.get(alignment.get('report_id'))
+            alignments_by_goal.setdefault(alignment['goal_id'], []).append(alignment)
+
+        return alignments_by_goal
+
+    def generate_observation_frequency_chart(self, date_counts):
         """Generate a chart showing the frequency of observations by date"""
-        # Extract dates and count observations per date
-        date_counts = {}
-
-        for obs in observations:
-            date = obs.get('date', '')
-            if date:
-                date_counts[date] = date_counts.get(date, 0) + 1
-
         if not date_counts:
             return None
+        import pandas as pd
+        import plotly.express as px
 
         # Create dataframe for plotting
         df = pd.DataFrame([
@@ -621,6 +915,8 @@ class MonthlyReportGenerator:
         """Generate a chart showing the frequency of different strengths"""
         if not strength_counts:
             return None
+        import pandas as pd
+        import plotly.express as px
 
         # Take top 10 strengths
         top_strengths = dict(list(strength_counts.items())[:10])
@@ -647,6 +943,8 @@ class MonthlyReportGenerator:
         """Generate a chart showing the frequency of different development areas"""
         if not development_counts:
             return None
+        import pandas as pd
+        import plotly.express as px
 
         # Take top 10 development areas
         top_areas = dict(list(development_counts.items())[:10])
@@ -673,6 +971,8 @@ class MonthlyReportGenerator:
         """Generate a chart showing progress on goals"""
         if not goal_progress:
             return None
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
 
         # Create figure with subplots
         fig = make_subplots(rows=len(goal_progress), cols=1,
@@ -710,12 +1010,11 @@ class MonthlyReportGenerator:
 
         return fig
 
-    def generate_monthly_summary(self, observations, goal_progress):
+    def generate_monthly_summary(self, num_observations, goal_progress):
         """Generate a text summary of the monthly progress"""
-        if not observations:
+        if not num_observations:
             return "No observations recorded this month."
 
-        num_observations = len(observations)
         num_goals_with_progress = len(goal_progress)
 
         # Calculate overall progress
@@ -785,6 +1084,7 @@ def admin_dashboard():
                         with col2:
                             if st.button("Delete", key=f"delete_{user['id']}"):
                                 supabase.table('users').delete().eq('id', user['id']).execute()
+                                get_data_access().invalidate('users', user['id'])
                                 st.rerun()
             else:
                 st.info("No users found")
@@ -793,6 +1093,9 @@ def admin_dashboard():
 
     with tabs[1]:  # Parent-Child Mappings
         st.subheader("Parent-Child Relationships")
+        # pandas (also used by bulk_import) is imported when the admin dashboard renders, not at startup
+        import pandas as pd
+        from bulk_import import import_children, import_parents, import_relationships
 
         # Add new section for bulk child upload
         with st.expander("Bulk Add Children (CSV)"):
@@ -802,32 +1105,25 @@ def admin_dashboard():
 
             if child_upload:
                 try:
-                    df = pd.read_csv(child_upload)
+                    df = pd.read_csv(child_upload, nrows=5)
 
                     if 'name' not in df.columns:
                         st.error("CSV must contain a 'name' column")
                     else:
                         st.write("Preview of children to be added:")
-                        st.dataframe(df.head())
+                        st.dataframe(df)
 
                         if st.button("Add Children"):
-                            children_data = []
-                            for _, row in df.iterrows():
-                                child_data = {
-                                    "name": row['name'],
-                                    "birth_date": row.get('birth_date', None),
-                                    "grade": row.get('grade', None)
-                                }
-                                children_data.append(child_data)
-
-                            # Insert in batches to avoid timeout
-                            batch_size = 50
-                            for i in range(0, len(children_data), batch_size):
-                                batch = children_data[i:i + batch_size]
-                                supabase.table('children').insert(batch).execute()
-
-                            st.success(f"Successfully added {len(children_data)} children!")
-                            st.rerun()
+                            child_upload.seek(0)
+                            result = import_children(supabase, child_upload)
+                            st.success(f"Successfully added {result.succeeded} children "
+                                       f"({result.rows_per_second:.0f} rows/s)!")
+
+                            if result.failures:
+                                st.warning(f"{len(result.failures)} rows could not be added:")
+                                st.dataframe(pd.DataFrame(result.failures))
+                            else:
+                                st.rerun()
                 except Exception as e:
                     st.error(f"Error processing children CSV: {str(e)}")
 
@@ -838,34 +1134,25 @@ def admin_dashboard():
 
             if parent_upload:
                 try:
-                    df = pd.read_csv(parent_upload)
+                    df = pd.read_csv(parent_upload, nrows=5)
 
                     if not all(col in df.columns for col in ['name', 'email', 'password']):
                         st.error("CSV must contain 'name', 'email', and 'password' columns")
                     else:
                         st.write("Preview of parents to be added:")
-                        st.dataframe(df.head())
+                        st.dataframe(df)
 
                         if st.button("Add Parents"):
-                            parents_data = []
-                            for _, row in df.iterrows():
-                                parent_data = {
-                                    "id": str(uuid.uuid4()),
-                                    "name": row['name'],
-                                    "email": row['email'].strip().lower(),
-                                    "password": row['password'],  # Note: In production, hash passwords
-                                    "role": "Parent"
-                                }
-                                parents_data.append(parent_data)
-
-                            # Insert in batches
-                            batch_size = 50
-                            for i in range(0, len(parents_data), batch_size):
-                                batch = parents_data[i:i + batch_size]
-                                supabase.table('users').insert(batch).execute()
-
-                            st.success(f"Successfully added {len(parents_data)} parents!")
-                            st.rerun()
+                            parent_upload.seek(0)
+                            result = import_parents(supabase, parent_upload)
+                            st.success(f"Successfully added {result.succeeded} parents "
+                                       f"({result.rows_per_second:.0f} rows/s)!")
+
+                            if result.failures:
+                                st.warning(f"{len(result.failures)} rows could not be added:")
+                                st.dataframe(pd.DataFrame(result.failures))
+                            else:
+                                st.rerun()
                 except Exception as e:
                     st.error(f"Error processing parents CSV: {str(e)}")
 
@@ -885,50 +1172,22 @@ def admin_dashboard():
                         st.dataframe(df.head())
 
                         if st.button("Add Parent-Child Relationships"):
-                            # Get all children and parents first
-                            children = supabase.table('children').select("*").execute().data
-                            parents = supabase.table('users').select("*").eq("role", "Parent").execute().data
-
-                            child_name_to_id = {c['name'].lower(): c['id'] for c in children}
-                            parent_email_to_id = {p['email'].lower(): p['id'] for p in parents}
-
-                            success_count = 0
-                            failed_rows = []
-
-                            for idx, row in df.iterrows():
-                                parent_email = row['parent_email'].strip().lower()
-                                child_name = row['child_name'].strip().lower()
+                            result = import_relationships(supabase, df)
+                            st.success(f"Successfully mapped {result.succeeded} relationships "
+                                       f"({result.rows_per_second:.0f} rows/s)!")
 
-                                parent_id = parent_email_to_id.get(parent_email)
-                                child_id = child_name_to_id.get(child_name)
-
-                                if parent_id and child_id:
-                                    # Update parent record with child_id
-                                    supabase.table('users').update({'child_id': child_id}).eq('id', parent_id).execute()
-                                    success_count += 1
-                                else:
-                                    failed_rows.append({
-                                        "row": idx + 1,
-                                        "parent_email": parent_email,
-                                        "child_name": child_name,
-                                        "error": ""
-                                    })
-                                    if not parent_id:
-                                        failed_rows[-1]["error"] += "Parent not found. "
-                                    if not child_id:
-                                        failed_rows[-1]["error"] += "Child not found."
-
-                            st.success(f"Successfully mapped {success_count} relationships!")
-
-                            if failed_rows:
-                                st.warning(f"Failed to process {len(failed_rows)} rows:")
-                                st.dataframe(pd.DataFrame(failed_rows))
-                            st.rerun()
+                            if result.failures:
+                                st.warning(f"Failed to process {len(result.failures)} rows:")
+                                st.dataframe(pd.DataFrame(result.failures))
+                            else:
+                                st.rerun()
                 except Exception as e:
                     st.error(f"Error processing relationships CSV: {str(e)}")
 
     with tabs[2]:  # Observer-Child Mappings
         st.subheader("Observer-Child Mappings")
+        import pandas as pd
+        from bulk_import import import_observer_mappings
 
         # Add new section for CSV bulk upload
         with st.expander("Bulk Upload Observer-Student Mappings (CSV)"):
@@ -937,8 +1196,8 @@ def admin_dashboard():
 
             if uploaded_file is not None:
                 try:
-                    # Read the CSV file
-                    df = pd.read_csv(uploaded_file)
+                    # Read the first rows for validation and preview; the import streams the file
+                    df = pd.read_csv(uploaded_file, nrows=5)
 
                     # Validate columns
                     if not all(col in df.columns for col in ['observer_id', 'student_id']):
@@ -946,73 +1205,47 @@ def admin_dashboard():
                     else:
                         # Display preview
                         st.write("Preview of uploaded data:")
-                        st.dataframe(df.head())
+                        st.dataframe(df)
 
                         if st.button("Process CSV and Create Mappings"):
-                            # Get all valid observers and students from database
-                            observers = supabase.table('users').select("id").eq("role", "Observer").execute().data
-                            valid_observer_ids = {o['id'] for o in observers}
-
-                            children = supabase.table('children').select("id").execute().data
-                            valid_child_ids = {c['id'] for c in children}
-
-                            # Validate each row
-                            valid_rows = []
-                            invalid_rows = []
-
-                            for idx, row in df.iterrows():
-                                observer_id = row['observer_id']
-                                child_id = row['student_id']
-
-                                if observer_id in valid_observer_ids and child_id in valid_child_ids:
-                                    valid_rows.append({
-                                        "observer_id": observer_id,
-                                        "child_id": child_id
-                                    })
-                                else:
-                                    invalid_rows.append({
-                                        "row": idx + 1,
-                                        "observer_id": observer_id,
-                                        "child_id": child_id,
-                                        "error": ""
-                                    })
-                                    if observer_id not in valid_observer_ids:
-                                        invalid_rows[-1]["error"] += "Invalid observer ID. "
-                                    if child_id not in valid_child_ids:
-                                        invalid_rows[-1]["error"] += "Invalid student ID."
-
-                            # Insert valid mappings
-                            if valid_rows:
-                                result = supabase.table('observer_child_mappings').insert(valid_rows).execute()
-                                st.success(f"Successfully added {len(valid_rows)} mappings!")
+                            uploaded_file.seek(0)
+                            result = import_observer_mappings(supabase, uploaded_file)
+                            if result.succeeded:
+                                st.success(f"Successfully added {result.succeeded} mappings "
+                                           f"({result.rows_per_second:.0f} rows/s)!")
 
                             # Show invalid rows if any
-                            if invalid_rows:
-                                st.warning(f"{len(invalid_rows)} rows could not be processed:")
-                                invalid_df = pd.DataFrame(invalid_rows)
-                                st.dataframe(invalid_df)
+                            if result.failures:
+                                st.warning(f"{len(result.failures)} rows could not be processed:")
+                                st.dataframe(pd.DataFrame(result.failures))
                 except Exception as e:
                     st.error(f"Error processing CSV: {str(e)}")
 
         try:
-            mappings = supabase.table('observer_child_mappings').select("*").execute().data
-            if mappings:
-                for mapping in mappings:
-                    # Get observer and child names
-                    observer = supabase.table('users').select("*").eq('id', mapping['observer_id']).execute().data
-                    child = supabase.table('children').select("*").eq('id', mapping['child_id']).execute().data
+            # Mappings, observers and children in three queries, joined in memory
+            mapping_model = ObserverMappingReadModel.load(supabase)
+            if mapping_model.rows:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    mapping_query = st.text_input("Search by observer or child", key="mapping_search")
+                with col2:
+                    page_size = st.selectbox("Per page", [25, 50, 100], key="mapping_page_size")
 
-                    observer_name = observer[0].get('name', 'N/A') if observer else mapping['observer_id']
-                    child_name = child[0].get('name', 'N/A') if child else mapping['child_id']
+                page_count = mapping_model.page_count(mapping_query, page_size)
+                page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="mapping_page")
+                page_rows, total, _ = mapping_model.page(mapping_query, page, page_size)
+                st.caption(f"{total} mappings, page {page} of {page_count}")
 
+                for mapping in page_rows:
                     col1, col2, col3 = st.columns([4, 3, 1])
                     with col1:
-                        st.write(f"Observer: {observer_name}")
+                        st.write(f"Observer: {mapping['observer_name']}")
                     with col2:
-                        st.write(f"Child: {child_name}")
+                        st.write(f"Child: {mapping['child_name']}")
                     with col3:
                         if st.button("Delete", key=f"delete_{mapping['id']}"):
                             supabase.table('observer_child_mappings').delete().eq('id', mapping['id']).execute()
+                            get_data_access().invalidate('observer_child_mappings')
                             st.success("Mapping deleted successfully!")
                             st.rerun()
             else:
@@ -1020,13 +1253,9 @@ def admin_dashboard():
 
             with st.expander("Add New Observer-Child Mapping"):
                 with st.form("add_observer_child"):
-                    # Get all observers
-                    observers = supabase.table('users').select("*").eq('role', 'Observer').execute().data
-                    observer_options = {o['id']: f"{o.get('name', 'N/A')} ({o['email']})" for o in observers}
-
-                    # Get all children
-                    children = supabase.table('children').select("*").execute().data
-                    child_options = {c['id']: c.get('name', 'N/A') for c in children}
+                    observer_options = {o['id']: f"{o.get('name', 'N/A')} ({o['email']})"
+                                        for o in mapping_model.observers}
+                    child_options = {c['id']: c.get('name', 'N/A') for c in mapping_model.children}
 
                     observer_id = st.selectbox("Select Observer", options=list(observer_options.keys()),
                                                format_func=lambda x: observer_options[x])
@@ -1039,6 +1268,7 @@ def admin_dashboard():
                                 "observer_id": observer_id,
                                 "child_id": child_id
                             }).execute()
+                            get_data_access().invalidate('observer_child_mappings')
                             st.success("Mapping created successfully!")
                             st.rerun()
         except Exception as e:
@@ -1104,6 +1334,13 @@ def admin_dashboard():
                 # Initialize the extractor
                 extractor = ObservationExtractor()
 
+                for cache_name, cache in (("OCR", extractor.ocr_cache), ("LLM", extractor.llm_cache)):
+                    cache_stats = cache.stats()
+                    st.caption(f"{cache_name} cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                               f"({cache_stats['hit_ratio']:.0%} hit ratio)")
+                with st.expander("Outbound API latency"):
+                    st.json(extractor.http.latency_report())
+
                 # Choose processing mode
                 st.subheader("Select Processing Mode")
                 col1, col2 = st.columns(2)
@@ -1150,50 +1387,40 @@ def admin_dashboard():
                     if uploaded_file and st.button("Process Observation", key="admin_process_ocr"):
                         with st.spinner("Processing..."):
                             try:
-                                extracted_text = extractor.extract_text_with_ocr(uploaded_file)
-                                structured_data = extractor.process_with_groq(extracted_text)
-                                observations_text = structured_data.get("observations", "")
-
-                                # Upload file to storage
-                                file_url = None
-                                if uploaded_file:
-                                    # Reset file pointer to beginning
-                                    uploaded_file.seek(0)
-                                    # Upload to storage
-                                    file_url = upload_file_to_storage(
-                                        uploaded_file.getvalue(),
-                                        uploaded_file.name,
-                                        f"image/{uploaded_file.type.split('/')[1]}"
-                                    )
-
-                                if observations_text:
-                                    # Generate report with new format
-                                    report = extractor.generate_report_from_text(observations_text, user_info)
-                                    st.session_state.admin_report_generated = report
-
-                                    # Insert observation
-                                    observation_response = supabase.table('observations').insert({
+                                def observation_row(structured_data, file_url):
+                                    return {
                                         "student_id": selected_child_id,
                                         "username": selected_observer_id,  # Using the selected observer's ID
                                         "student_name": structured_data.get("studentName", student_name),
                                         "observer_name": observer_name,
                                         "class_name": structured_data.get("className", ""),
                                         "date": structured_data.get("date", session_date),
-                                        "observations": observations_text,
-                                        "strengths": json.dumps(structured_data.get("strengths", [])),
-                                        "areas_of_development": json.dumps(
-                                            structured_data.get("areasOfDevelopment", [])),
-                                        "recommendations": json.dumps(structured_data.get("recommendations", [])),
+                                        "observations": structured_data.get("observations", ""),
+                                        "strengths": structured_data.get("strengths", []),
+                                        "areas_of_development": structured_data.get("areasOfDevelopment", []),
+                                        "recommendations": structured_data.get("recommendations", []),
                                         "timestamp": datetime.now().isoformat(),
                                         "filename": uploaded_file.name,
-                                        "full_data": json.dumps(structured_data),
+                                        "full_data": structured_data,
                                         "theme_of_day": structured_data.get("themeOfDay", ""),
                                         "curiosity_seed": structured_data.get("curiositySeed", ""),
                                         "processed_by_admin": True,  # Flag to indicate admin processed this
                                         "file_url": file_url  # Add the file URL
-                                    }).execute()
+                                    }
+
+                                # Upload, OCR -> Groq -> report and the insert run as a stage graph
+                                result = run_image_pipeline(extractor, uploaded_file, user_info, observation_row)
+                                result.raise_for("structure")
+                                structured_data = result.get("structure")
+
+                                if structured_data.get("observations", ""):
+                                    # Keep the report even if saving failed
+                                    st.session_state.admin_report_generated = result.get("report")
+                                    result.raise_for("report")
+                                    result.raise_for("save")
 
                                     st.success("Data processed and saved successfully!")
+                                    st.caption(f"Timings: {result.summary()}")
                                 else:
                                     st.error("No observations found in the extracted data")
                             except Exception as e:
@@ -1247,7 +1474,7 @@ def admin_dashboard():
                                     {transcript}
                                     """
 
-                                    model = genai.GenerativeModel('gemini-2.0-flash-002')
+                                    model = get_genai().GenerativeModel('gemini-2.0-flash-002')
                                     response = model.generate_content([
                                         {"role": "user", "parts": [{"text": theme_prompt}]}
                                     ])
@@ -1260,7 +1487,7 @@ def admin_dashboard():
                                     curiosity_seed = ""
 
                                 # Save to database
-                                supabase.table('observations').insert({
+                                observation_store.insert_observation({
                                     "student_id": selected_child_id,
                                     "username": selected_observer_id,  # Using the selected observer's ID
                                     "student_name": student_name,
@@ -1268,17 +1495,17 @@ def admin_dashboard():
                                     "class_name": "",
                                     "date": session_date,
                                     "observations": transcript,
-                                    "strengths": json.dumps([]),
-                                    "areas_of_development": json.dumps([]),
-                                    "recommendations": json.dumps([]),
+                                    "strengths": [],
+                                    "areas_of_development": [],
+                                    "recommendations": [],
                                     "timestamp": datetime.now().isoformat(),
                                     "filename": uploaded_file.name,
-                                    "full_data": json.dumps({"transcript": transcript, "report": report}),
+                                    "full_data": {"transcript": transcript, "report": report},
                                     "theme_of_day": theme_of_day,
                                     "curiosity_seed": curiosity_seed,
                                     "processed_by_admin": True,  # Flag to indicate admin processed this
                                     "file_url": file_url  # Add the file URL
-                                }).execute()
+                                })
 
                                 st.success("Audio processed and report generated successfully!")
 
@@ -1320,18 +1547,19 @@ def admin_dashboard():
 def parent_dashboard(user_id):
     st.title(f"Parent Portal")
 
+    data = get_data_access()
+
     # Create tabs for different sections
     parent_tabs = st.tabs(["Reports", "Messages", "Goals"])
 
     with parent_tabs[0]:  # Reports tab
         try:
             # Get the parent's information
-            parent_data = supabase.table('users').select("*").eq("id", user_id).execute().data
-            if not parent_data:
+            parent = data.user(user_id)
+            if not parent:
                 st.warning("User not found")
                 return
 
-            parent = parent_data[0]
             child_id = parent.get('child_id')
 
             if not child_id:
@@ -1339,22 +1567,19 @@ def parent_dashboard(user_id):
                 return
 
             # Get child information
-            child_data = supabase.table('children').select("*").eq("id", child_id).execute().data
-            if not child_data:
+            child = data.child(child_id)
+            if not child:
                 st.warning("Child information not found")
                 return
 
-            child = child_data[0]
-
             # Get observer information
-            mapping = supabase.table('observer_child_mappings').select("*").eq("child_id", child_id).execute().data
-            observer_id = mapping[0]['observer_id'] if mapping else None
+            observer_id = data.observer_id_for_child(child_id)
             observer_name = "Not assigned"
 
             if observer_id:
-                observer_data = supabase.table('users').select("name").eq("id", observer_id).execute().data
-                if observer_data:
-                    observer_name = observer_data[0].get('name', observer_id)
+                observer = data.user(observer_id)
+                if observer:
+                    observer_name = observer.get('name', observer_id)
 
             # Display dashboard
             st.subheader(f"Your Child: {child.get('name', 'N/A')}")
@@ -1365,8 +1590,11 @@ def parent_dashboard(user_id):
             cols[2].metric("Assigned Observer", observer_name)
 
             st.subheader("Recent Reports")
-            reports = supabase.table('observations').select("*").eq("student_id", child_id).order('date',
-                                                                                                  desc=True).execute().data
+            reports = supabase.table('observations') \
+                .select(REPORT_LIST_COLUMNS) \
+                .eq("student_id", child_id) \
+                .order('date', desc=True) \
+                .execute().data
 
             if reports:
                 for report in reports:
@@ -1378,36 +1606,14 @@ def parent_dashboard(user_id):
                             st.write("**Observations:**")
                             st.write(report['observations'])
 
-                        if report.get('strengths'):
-                            try:
-                                strengths = json.loads(report['strengths']) if isinstance(report['strengths'], str) else \
-                                    report['strengths']
-                                st.write("**Strengths:**")
-                                for strength in strengths:
-                                    st.write(f"- {strength}")
-                            except:
-                                pass
-
-                        if report.get('areas_of_development'):
-                            try:
-                                areas = json.loads(report['areas_of_development']) if isinstance(
-                                    report['areas_of_development'], str) else report['areas_of_development']
-                                st.write("**Areas for Development:**")
-                                for area in areas:
-                                    st.write(f"- {area}")
-                            except:
-                                pass
-
-                        if report.get('recommendations'):
-                            try:
-                                recs = json.loads(report['recommendations']) if isinstance(report['recommendations'],
-                                                                                           str) else report[
-                                    'recommendations']
-                                st.write("**Recommendations:**")
-                                for rec in recs:
-                                    st.write(f"- {rec}")
-                            except:
-                                pass
+                        for column, heading in (('strengths', "Strengths"),
+                                                ('areas_of_development', "Areas for Development"),
+                                                ('recommendations', "Recommendations")):
+                            items = decode_list(report.get(column))
+                            if items:
+                                st.write(f"**{heading}:**")
+                                for item in items:
+                                    st.write(f"- {item}")
             else:
                 st.info("No reports available yet")
 
@@ -1421,12 +1627,11 @@ def parent_dashboard(user_id):
         st.subheader("Messages")
 
         # Get child and observer info
-        parent_data = supabase.table('users').select("*").eq("id", user_id).execute().data
-        if not parent_data:
+        parent = data.user(user_id)
+        if not parent:
             st.warning("User not found")
             return
 
-        parent = parent_data[0]
         child_id = parent.get('child_id')
 
         if not child_id:
@@ -1434,56 +1639,30 @@ def parent_dashboard(user_id):
             return
 
         # Get observer information
-        mapping = supabase.table('observer_child_mappings').select("*").eq("child_id", child_id).execute().data
-        observer_id = mapping[0]['observer_id'] if mapping else None
+        observer_id = data.observer_id_for_child(child_id)
 
         if not observer_id:
             st.warning("No observer assigned to your child yet.")
             return
 
         # Get observer details
-        observer_data = supabase.table('users').select("*").eq("id", observer_id).execute().data
-        if not observer_data:
+        observer = data.user(observer_id)
+        if not observer:
             st.warning("Observer information not found")
             return
 
-        observer = observer_data[0]
-
         # Display messaging interface
         st.write(f"**Messaging with:** {observer.get('name', 'Observer')}")
 
-        # Get existing messages
-        messages = supabase.table('messages').select("*") \
-            .or_(f"sender_id.eq.{user_id},receiver_id.eq.{user_id}") \
-            .or_(f"sender_id.eq.{observer_id},receiver_id.eq.{observer_id}") \
-            .order('timestamp', desc=False) \
-            .execute().data
-
-        # Display message history
-        message_container = st.container(height=400)
-        with message_container:
-            for msg in messages:
-                is_from_me = msg['sender_id'] == user_id
-
-                col1, col2 = st.columns([1, 4])
-                with col1:
-                    st.write("You:" if is_from_me else f"{observer.get('name', 'Observer')}:")
-                with col2:
-                    st.text_area("", value=msg['content'], height=70, key=f"msg_{msg['id']}", disabled=True)
+        # Newest page of the conversation, then only new messages on later reruns
+        show_conversation(user_id, observer_id, observer.get('name', 'Observer'))
 
         # Send new message
         with st.form("send_message_form"):
             new_message = st.text_area("Type your message:", height=100)
             if st.form_submit_button("Send Message"):
                 if new_message.strip():
-                    # Insert message into database
-                    supabase.table('messages').insert({
-                        "sender_id": user_id,
-                        "receiver_id": observer_id,
-                        "content": new_message,
-                        "timestamp": datetime.now().isoformat(),
-                        "read": False
-                    }).execute()
+                    get_message_store().send(user_id, observer_id, new_message, datetime.now().isoformat())
                     st.success("Message sent!")
                     st.rerun()
                 else:
@@ -1493,18 +1672,29 @@ def parent_dashboard(user_id):
         st.markdown("---")
         st.subheader("Goal Tracking")
 
-        parent_data = supabase.table('users').select("*").eq("id", user_id).execute().data
-        if not parent_data:
+        parent = data.user(user_id)
+        if not parent:
             st.warning("User not found")
             return
 
-        parent = parent_data[0]
         child_id = parent.get('child_id')
 
         if child_id:
-            goals = supabase.table('goals').select("*").eq("child_id", child_id).execute().data
+            goals = data.goals_for_child(child_id)
 
             if goals:
+                # Load all alignments (with report dates) and this parent's feedback up front
+                alignments_by_goal = MonthlyReportGenerator(supabase).get_goal_alignments(goals)
+                alignment_ids = [a['id'] for goal_alignments in alignments_by_goal.values() for a in goal_alignments]
+                feedback_by_alignment = {}
+                if alignment_ids:
+                    feedback_rows = supabase.table('parent_feedback').select("*") \
+                        .in_("alignment_id", alignment_ids) \
+                        .eq("parent_id", user_id) \
+                        .execute().data or []
+                    for fb in feedback_rows:
+                        feedback_by_alignment.setdefault(fb['alignment_id'], fb)
+
                 for goal in goals:
                     with st.expander(f"Goal from {goal.get('created_at', 'unknown date')}"):
                         st.write(goal['goal_text'])
@@ -1512,23 +1702,17 @@ def parent_dashboard(user_id):
                         st.write(f"Target Date: {goal.get('target_date', 'No target date')}")
 
                         # Show alignments with reports
-                        alignments = supabase.table('goal_alignments').select("*").eq("goal_id",
-                                                                                      goal['id']).execute().data
+                        alignments = alignments_by_goal.get(goal['id'], [])
                         if alignments:
                             st.write("**Report Alignments:**")
                             for alignment in alignments:
-                                report = supabase.table('observations').select("date").eq("id", alignment[
-                                    'report_id']).execute().data
-                                report_date = report[0]['date'] if report else "Unknown date"
+                                report_date = alignment['report_date'] or "Unknown date"
                                 st.write(f"- {report_date}: Score {alignment.get('alignment_score', 0)}/10")
 
                                 # Feedback form if no feedback exists for this alignment
-                                existing_feedback = supabase.table('parent_feedback').select("*").eq("alignment_id",
-                                                                                                     alignment[
-                                                                                                         'id']).eq(
-                                    "parent_id", user_id).execute().data
+                                fb = feedback_by_alignment.get(alignment['id'])
 
-                                if not existing_feedback:
+                                if not fb:
                                     with st.form(f"feedback_form_{alignment['id']}"):
                                         rating = st.slider("Rate this alignment", 1, 5, 3,
                                                            key=f"rating_{alignment['id']}")
@@ -1545,7 +1729,6 @@ def parent_dashboard(user_id):
                                             st.success("Feedback submitted!")
                                             st.rerun()
                                 else:
-                                    fb = existing_feedback[0]
                                     st.write(f"**Your Feedback:** {'⭐' * fb.get('rating', 0)}")
                                     st.write(fb.get('feedback_text', 'No feedback text'))
             else:
@@ -1560,13 +1743,11 @@ def monthly_report_section(child_id, parent_id):
     report_generator = MonthlyReportGenerator(supabase)
 
     # Get child's info
-    child_data = supabase.table('children').select("*").eq("id", child_id).execute().data
-    if not child_data:
+    child = get_data_access().child(child_id)
+    if not child:
         st.warning("Child information not found")
         return
 
-    child = child_data[0]
-
     # Date selection
     col1, col2 = st.columns(2)
     with col1:
@@ -1588,28 +1769,28 @@ def monthly_report_section(child_id, parent_id):
         .eq("year", year) \
         .execute().data
 
-    # Get all observations for this child in the selected month
-    observations = report_generator.get_month_data(child_id, year, month)
+    # Precomputed counts and goal progress for this child in the selected month
+    month_summary = report_generator.get_month_summary(child_id, year, month)
 
-    if not observations:
+    if not month_summary or not month_summary["num_observations"]:
         st.info(f"No observations found for {calendar.month_name[month]} {year}")
         return
 
-    # Get goal progress for this month
-    goal_progress = report_generator.get_goal_progress(child_id, year, month)
+    num_observations = month_summary["num_observations"]
+    goal_progress = month_summary["goal_progress"]
 
     # Display monthly summary
-    summary = report_generator.generate_monthly_summary(observations, goal_progress)
+    summary = report_generator.generate_monthly_summary(num_observations, goal_progress)
     st.markdown(summary)
 
     # Display observation frequency chart
-    obs_freq_chart = report_generator.generate_observation_frequency_chart(observations)
+    obs_freq_chart = report_generator.generate_observation_frequency_chart(month_summary["date_counts"])
     if obs_freq_chart:
         st.plotly_chart(obs_freq_chart, use_container_width=True)
 
-    # Extract strengths and development areas
-    strength_counts = report_generator.get_strength_areas(observations)
-    development_counts = report_generator.get_development_areas(observations)
+    # Strengths and development areas
+    strength_counts = month_summary["strength_counts"]
+    development_counts = month_summary["development_counts"]
 
     # Display strengths and development areas
     col1, col2 = st.columns(2)
@@ -1642,7 +1823,7 @@ def monthly_report_section(child_id, parent_id):
         "strength_counts": strength_counts,
         "development_counts": development_counts,
         "goal_progress": goal_progress,
-        "num_observations": len(observations)
+        "num_observations": num_observations
     }
 
     # Save report if it doesn't exist
@@ -1684,10 +1865,11 @@ def monthly_report_section(child_id, parent_id):
 
     # Add download option for report
     if st.button("Generate Downloadable Report"):
+        import pandas as pd
         # Create DataFrame with main metrics
         report_data = {
             "Metric": ["Total Observations", "Goals Tracked", "Average Goal Score"],
-            "Value": [len(observations), len(goal_progress),
+            "Value": [num_observations, len(goal_progress),
                       sum(g['avg_score'] for g in goal_progress) / len(goal_progress) if goal_progress else 0]
         }
 
@@ -1742,16 +1924,15 @@ def observer_monthly_report_section(observer_id):
     report_generator = MonthlyReportGenerator(supabase)
 
     # Get all children assigned to this observer
-    mappings = supabase.table('observer_child_mappings').select("child_id").eq("observer_id",
-                                                                               observer_id).execute().data
-    child_ids = [m['child_id'] for m in mappings]
+    data = get_data_access()
+    child_ids = data.observer_child_ids(observer_id)
 
     if not child_ids:
         st.warning("No children assigned to you yet")
         return
 
     # Get child details
-    children = supabase.table('children').select("*").in_("id", child_ids).execute().data
+    children = data.children(child_ids)
     child_options = {c['id']: c.get('name', f"Child {c['id'][:4]}") for c in children}
 
     # Select child
@@ -1776,28 +1957,28 @@ def observer_monthly_report_section(observer_id):
                              format_func=lambda x: calendar.month_name[x],
                              index=current_date.month - 1)  # Default to current month
 
-    # Get all observations for this child in the selected month
-    observations = report_generator.get_month_data(selected_child_id, year, month)
+    # Precomputed counts and goal progress for this child in the selected month
+    month_summary = report_generator.get_month_summary(selected_child_id, year, month)
 
-    if not observations:
+    if not month_summary or not month_summary["num_observations"]:
         st.info(f"No observations found for {calendar.month_name[month]} {year}")
         return
 
-    # Get goal progress for this month
-    goal_progress = report_generator.get_goal_progress(selected_child_id, year, month)
+    num_observations = month_summary["num_observations"]
+    goal_progress = month_summary["goal_progress"]
 
     # Display monthly summary
-    summary = report_generator.generate_monthly_summary(observations, goal_progress)
+    summary = report_generator.generate_monthly_summary(num_observations, goal_progress)
     st.markdown(summary)
 
     # Display observation frequency chart
-    obs_freq_chart = report_generator.generate_observation_frequency_chart(observations)
+    obs_freq_chart = report_generator.generate_observation_frequency_chart(month_summary["date_counts"])
     if obs_freq_chart:
         st.plotly_chart(obs_freq_chart, use_container_width=True)
 
-    # Extract strengths and development areas
-    strength_counts = report_generator.get_strength_areas(observations)
-    development_counts = report_generator.get_development_areas(observations)
+    # Strengths and development areas
+    strength_counts = month_summary["strength_counts"]
+    development_counts = month_summary["development_counts"]
 
     # Display strengths and development areas
     col1, col2 = st.columns(2)
@@ -1841,7 +2022,7 @@ def observer_monthly_report_section(observer_id):
                 <h2>Monthly Progress Report</h2>
                 <p><strong>Child:</strong> {child_options[selected_child_id]}</p>
                 <p><strong>Period:</strong> {calendar.month_name[month]} {year}</p>
-                <p><strong>Observations:</strong> {len(observations)}</p>
+                <p><strong>Observations:</strong> {num_observations}</p>
                 <p><strong>Goals Tracked:</strong> {len(goal_progress)}</p>
 
                 <p>Please log in to the Learning Observer platform to view the full report with charts and details.</p>
@@ -1862,10 +2043,11 @@ def observer_monthly_report_section(observer_id):
 
     # Add download option for report
     if st.button("Download Report"):
+        import pandas as pd
         # Create DataFrame with main metrics
         report_data = {
             "Metric": ["Total Observations", "Goals Tracked", "Average Goal Score"],
-            "Value": [len(observations), len(goal_progress),
+            "Value": [num_observations, len(goal_progress),
                       sum(g['avg_score'] for g in goal_progress) / len(goal_progress) if goal_progress else 0]
         }
 
@@ -1955,6 +2137,10 @@ def main():
         "password": st.secrets.get("ADMIN_PASS", "hello")
     }
 
+    health = get_supabase_health()
+    if health.healthy is False:
+        st.warning("The database is currently unreachable, so some pages may fail to load. Please try again shortly.")
+
     # Login/Registration Page
     if not st.session_state.auth['logged_in']:
         st.title("Learning Observer Login")
@@ -2072,12 +2258,10 @@ def main():
     def logout_button():
         if st.button("Logout"):
             if st.session_state.auth['role'] == "Observer":
-                supabase.table('observer_activity_logs').insert({
-                    "observer_id": st.session_state.auth['user_id'],
-                    "child_id": "N/A",
-                    "action": "logout",
-                    "duration_minutes": 0
-                }).execute()
+                login_at = st.session_state.pop('activity_login_at', None)
+                duration = round((time.time() - login_at) / 60) if login_at else 0
+                get_activity_logger().log(activity_event("logout", duration))
+            st.session_state.pop('activity_session_id', None)
             st.session_state.auth = {'logged_in': False, 'role': None, 'user_id': None}
             st.rerun()
 
@@ -2103,21 +2287,21 @@ def main():
     # Parent Dashboard
     if st.session_state.auth['role'] == 'Parent':
         parent_dashboard(st.session_state.auth['user_id'])
+        show_read_cache_stats()
         logout_button()
         return
 
     # Observer Dashboard
     st.title(f"Observer Dashboard - {st.session_state.auth['name']}")
 
-    # Log login activity
-    supabase.table('observer_activity_logs').insert({
-        "observer_id": st.session_state.auth['user_id'],
-        "child_id": "N/A",
-        "action": "login",
-        "duration_minutes": 0
-    }).execute()
+    # Log login activity once per session; Streamlit re-runs this script on every interaction
+    if 'activity_session_id' not in st.session_state:
+        st.session_state.activity_session_id = str(uuid.uuid4())
+    if get_activity_logger().log_once(st.session_state.activity_session_id, activity_event("login")):
+        st.session_state.activity_login_at = time.time()
 
     logout_button()
+    data = get_data_access()
     observer_tabs = st.tabs(["Observation Processing", "Goal Management", "Messages", "Monthly Reports"])
 
     with observer_tabs[0]:
@@ -2152,10 +2336,7 @@ def main():
                 st.session_state.report_generated = None
 
         # Get children assigned to this observer
-        mappings = supabase.table('observer_child_mappings').select("child_id").eq("observer_id", st.session_state.auth[
-            'user_id']).execute().data
-        child_ids = [m['child_id'] for m in mappings]
-        children = supabase.table('children').select("*").in_("id", child_ids).execute().data
+        children = data.children(data.observer_child_ids(st.session_state.auth['user_id']))
         child_options = {c['id']: c.get('name', f"Child {c['id'][:4]}") for c in children}
 
         selected_child_id = st.selectbox(
@@ -2173,27 +2354,39 @@ def main():
             if uploaded_file and st.button("Process Observation"):
                 with st.spinner("Processing..."):
                     try:
-                        # Process the image with OCR
-                        extracted_text = extractor.extract_text_with_ocr(uploaded_file)
-                        structured_data = extractor.process_with_groq(extracted_text)
-                        observations_text = structured_data.get("observations", "")
+                        def observation_row(structured_data, file_url):
+                            return {
+                                "student_id": selected_child_id,
+                                "username": st.session_state.auth['user_id'],
+                                "student_name": structured_data.get("studentName", ""),
+                                "observer_name": st.session_state.user_info['observer_name'],
+                                "class_name": structured_data.get("className", ""),
+                                "date": structured_data.get("date", ""),
+                                "observations": structured_data.get("observations", ""),
+                                "strengths": structured_data.get("strengths", []),
+                                "areas_of_development": structured_data.get("areasOfDevelopment", []),
+                                "recommendations": structured_data.get("recommendations", []),
+                                "timestamp": datetime.now().isoformat(),
+                                "filename": uploaded_file.name,
+                                "full_data": structured_data,
+                                "theme_of_day": structured_data.get("themeOfDay", ""),
+                                "curiosity_seed": structured_data.get("curiositySeed", ""),
+                                "file_url": file_url  # Add the file URL
+                            }
 
-                        # Upload file to storage
-                        file_url = None
-                        if uploaded_file:
-                            # Reset file pointer to beginning
-                            uploaded_file.seek(0)
-                            # Upload to storage
-                            file_url = upload_file_to_storage(
-                                uploaded_file.getvalue(),
-                                uploaded_file.name,
-                                f"image/{uploaded_file.type.split('/')[1]}"
-                            )
+                        # The Storage upload runs alongside OCR -> Groq -> report; the insert waits for both
+                        result = run_image_pipeline(extractor, uploaded_file, st.session_state.user_info,
+                                                    observation_row)
+                        result.raise_for("structure")
+                        structured_data = result.get("structure")
+                        observations_text = structured_data.get("observations", "")
 
                         if observations_text:
-                            # Generate report with new format
-                            report = extractor.generate_report_from_text(observations_text, st.session_state.user_info)
-                            st.session_state.report_generated = report
+                            # Keep the report even if saving failed
+                            st.session_state.report_generated = result.get("report")
+                            result.raise_for("report")
+                            result.raise_for("save")
+                            observation_response = result.get("save")
 
                             # Get child ID from mappings if available
                             child_id = structured_data.get("studentId", "")
@@ -2204,30 +2397,11 @@ def main():
                                 if child_data:
                                     child_id = child_data[0]['id']
 
-                            # Insert observation and capture the returned ID
-                            observation_response = supabase.table('observations').insert({
-                                "student_id": selected_child_id,
-                                "username": st.session_state.auth['user_id'],
-                                "student_name": structured_data.get("studentName", ""),
-                                "observer_name": st.session_state.user_info['observer_name'],
-                                "class_name": structured_data.get("className", ""),
-                                "date": structured_data.get("date", ""),
-                                "observations": observations_text,
-                                "strengths": json.dumps(structured_data.get("strengths", [])),
-                                "areas_of_development": json.dumps(structured_data.get("areasOfDevelopment", [])),
-                                "recommendations": json.dumps(structured_data.get("recommendations", [])),
-                                "timestamp": datetime.now().isoformat(),
-                                "filename": uploaded_file.name,
-                                "full_data": json.dumps(structured_data),
-                                "theme_of_day": structured_data.get("themeOfDay", ""),
-                                "curiosity_seed": structured_data.get("curiositySeed", ""),
-                                "file_url": file_url  # Add the file URL
-                            }).execute()
-
                             # Get the observation ID for goal alignment
                             observation_id = observation_response.data[0]['id'] if observation_response.data else None
 
                             st.success("Data processed and saved successfully!")
+                            st.caption(f"Timings: {result.summary()}")
 
                             # Analyze alignment with goals if we have a child ID and observation ID
                             if child_id and observation_id:
@@ -2235,62 +2409,18 @@ def main():
                                                                                                         "active").execute().data
 
                                 if goals:
-                                    for goal in goals:
-                                        # Use Groq API to analyze alignment
-                                        alignment_prompt = f"""
-                                        Analyze how well this observation report aligns with the following learning goal:
-
-                                        GOAL: {goal['goal_text']}
-
-                                        OBSERVATION REPORT:
-                                        {observations_text}
-
-                                        Provide your analysis in JSON format with:
-                                        - alignment_score (0-10 scale)
-                                        - analysis_text (detailed explanation of alignment)
-                                        - suggested_next_steps
-                                        """
+                                    # Score all active goals concurrently, then save in one insert
+                                    alignment_rows, failures = extractor.align_goals(goals, observations_text,
+                                                                                     observation_id)
 
+                                    if alignment_rows:
                                         try:
-                                            # Using Groq API for analysis
-                                            response = requests.post(
-                                                'https://api.groq.com/openai/v1/chat/completions',
-                                                headers={
-                                                    'Authorization': f'Bearer {extractor.groq_api_key}',
-                                                    'Content-Type': 'application/json'
-                                                },
-                                                json={
-                                                    "model": "llama-3.3-70b-versatile",
-                                                    "messages": [
-                                                        {
-                                                            "role": "system",
-                                                            "content": "You are an educational assessment AI that analyzes how well observation reports align with learning goals."
-                                                        },
-                                                        {
-                                                            "role": "user",
-                                                            "content": alignment_prompt
-                                                        }
-                                                    ],
-                                                    "temperature": 0.2,
-                                                    "response_format": {"type": "json_object"}
-                                                }
-                                            )
-
-                                            response.raise_for_status()
-                                            data = response.json()
-                                            analysis = json.loads(data['choices'][0]['message']['content'])
-
-                                            # Save alignment analysis
-                                            alignment_data = {
-                                                "goal_id": goal['id'],
-                                                "report_id": observation_id,  # Use the actual observation ID
-                                                "alignment_score": analysis.get('alignment_score', 0),
-                                                "analysis_text": analysis.get('analysis_text', 'No analysis')
-                                            }
-                                            supabase.table('goal_alignments').insert(alignment_data).execute()
-
+                                            observation_store.insert_alignments(alignment_rows)
                                         except Exception as e:
-                                            st.error(f"Goal alignment analysis failed: {str(e)}")
+                                            st.error(f"Saving goal alignments failed: {str(e)}")
+
+                                    for goal, error in failures:
+                                        st.error(f"Goal alignment analysis failed for '{goal['goal_text'][:50]}': {error}")
                         else:
                             st.error("No observations found in the extracted data")
                     except Exception as e:
@@ -2340,7 +2470,7 @@ def main():
                             {transcript}
                             """
 
-                            model = genai.GenerativeModel('gemini-2.0-flash-002')
+                            model = get_genai().GenerativeModel('gemini-2.0-flash-002')
                             response = model.generate_content([
                                 {"role": "user", "parts": [{"text": theme_prompt}]}
                             ])
@@ -2352,7 +2482,7 @@ def main():
                             theme_of_day = ""
                             curiosity_seed = ""
 
-                        supabase.table('observations').insert({
+                        observation_store.insert_observation({
                             "student_id": selected_child_id,
                             "username": st.session_state.auth['user_id'],
                             "student_name": st.session_state.user_info['student_name'],
@@ -2360,16 +2490,16 @@ def main():
                             "class_name": "",
                             "date": st.session_state.user_info['session_date'],
                             "observations": transcript,
-                            "strengths": json.dumps([]),
-                            "areas_of_development": json.dumps([]),
-                            "recommendations": json.dumps([]),
+                            "strengths": [],
+                            "areas_of_development": [],
+                            "recommendations": [],
                             "timestamp": datetime.now().isoformat(),
                             "filename": uploaded_file.name,
-                            "full_data": json.dumps({"transcript": transcript, "report": report}),
+                            "full_data": {"transcript": transcript, "report": report},
                             "theme_of_day": theme_of_day,
                             "curiosity_seed": curiosity_seed,
                             "file_url": file_url  # Add the file URL
-                        }).execute()
+                        })
 
         # Transcript Editor
         if st.session_state.audio_transcription:
@@ -2382,7 +2512,9 @@ def main():
                     st.session_state.audio_transcription = edited
                 if st.button("Regenerate Report with Edited Transcript"):
                     with st.spinner("Regenerating report..."):
-                        report = extractor.generate_report_from_text(edited, st.session_state.user_info)
+                        # An explicit regenerate asks for a fresh response; the new one replaces the cached entry
+                        report = extractor.generate_report_from_text(edited, st.session_state.user_info,
+                                                                     use_cache=False)
                         st.session_state.report_generated = report
 
         # Report Display and Download
@@ -2413,13 +2545,11 @@ def main():
         st.subheader("Goal Management")
 
         # Get all children assigned to this observer
-        mappings = supabase.table('observer_child_mappings').select("child_id").eq("observer_id", st.session_state.auth[
-            'user_id']).execute().data
-        child_ids = [m['child_id'] for m in mappings]
+        child_ids = data.observer_child_ids(st.session_state.auth['user_id'])
 
         if child_ids:
             # Get child details
-            children = supabase.table('children').select("*").in_("id", child_ids).execute().data
+            children = data.children(child_ids)
             child_options = {c['id']: c.get('name', f"Child {c['id'][:4]}") for c in children}
 
             # Form to add new goal
@@ -2439,16 +2569,18 @@ def main():
                                 "target_date": target_date.isoformat()
                             }
                             supabase.table('goals').insert(goal_data).execute()
+                            data.invalidate('goals')
                             st.success("Goal saved successfully!")
                         else:
                             st.error("Please enter a goal description")
 
             # Display current goals
             st.subheader("Current Goals")
-            goals = supabase.table('goals').select("*").eq("observer_id",
-                                                           st.session_state.auth['user_id']).execute().data
+            goals = data.goals_for_observer(st.session_state.auth['user_id'])
 
             if goals:
+                alignments_by_goal = MonthlyReportGenerator(supabase).get_goal_alignments(goals)
+
                 for goal in goals:
                     child_name = child_options.get(goal['child_id'], "Unknown Child")
                     with st.expander(f"Goal for {child_name} (Due: {goal.get('target_date', 'No date')})"):
@@ -2456,14 +2588,11 @@ def main():
                         st.write(f"Status: {goal.get('status', 'active')}")
 
                         # Display alignment scores if available
-                        alignments = supabase.table('goal_alignments').select("*").eq("goal_id",
-                                                                                      goal['id']).execute().data
+                        alignments = alignments_by_goal.get(goal['id'], [])
                         if alignments:
                             st.write("**Alignment with Reports:**")
                             for alignment in alignments:
-                                report = supabase.table('observations').select("date").eq("id", alignment[
-                                    'report_id']).execute().data
-                                report_date = report[0]['date'] if report else "Unknown date"
+                                report_date = alignment['report_date'] or "Unknown date"
                                 st.write(f"- {report_date}: Score {alignment.get('alignment_score', 0)}/10")
                                 if alignment.get('analysis_text'):
                                     with st.expander("Analysis Details"):
@@ -2474,10 +2603,12 @@ def main():
                         with col1:
                             if st.button("Mark Achieved", key=f"complete_{goal['id']}"):
                                 supabase.table('goals').update({"status": "achieved"}).eq("id", goal['id']).execute()
+                                data.invalidate('goals', goal['id'])
                                 st.rerun()
                         with col2:
                             if st.button("Delete", key=f"delete_{goal['id']}"):
                                 supabase.table('goals').delete().eq("id", goal['id']).execute()
+                                data.invalidate('goals', goal['id'])
                                 st.rerun()
             else:
                 st.info("No goals set yet")
@@ -2488,16 +2619,13 @@ def main():
         st.subheader("Messages with Parents")
 
         # Get all children assigned to this observer
-        mappings = supabase.table('observer_child_mappings').select("child_id").eq("observer_id",
-                                                                                   st.session_state.auth[
-                                                                                       'user_id']).execute().data
-        child_ids = [m['child_id'] for m in mappings]
+        child_ids = data.observer_child_ids(st.session_state.auth['user_id'])
 
         if not child_ids:
             st.warning("No children assigned to you yet")
         else:
             # Get all parents of these children
-            parents = supabase.table('users').select("*").eq("role", "Parent").in_("child_id", child_ids).execute().data
+            parents = data.parents_of(child_ids)
 
             if not parents:
                 st.info("No parents found for your assigned children")
@@ -2512,44 +2640,22 @@ def main():
                 selected_parent_data = next((p for p in parents if p['id'] == selected_parent), None)
                 if selected_parent_data:
                     child_id = selected_parent_data.get('child_id')
-                    child_data = supabase.table('children').select("*").eq("id", child_id).execute().data
-                    child_name = child_data[0].get('name', 'Child') if child_data else 'Child'
+                    child = data.child(child_id)
+                    child_name = child.get('name', 'Child') if child else 'Child'
 
                     st.write(f"**Messaging with parent of:** {child_name}")
 
-                    # Get existing messages
-                    messages = supabase.table('messages').select("*") \
-                        .or_(
-                        f"sender_id.eq.{st.session_state.auth['user_id']},receiver_id.eq.{st.session_state.auth['user_id']}") \
-                        .or_(f"sender_id.eq.{selected_parent},receiver_id.eq.{selected_parent}") \
-                        .order('timestamp', desc=False) \
-                        .execute().data
-
-                    # Display message history
-                    message_container = st.container(height=400)
-                    with message_container:
-                        for msg in messages:
-                            is_from_me = msg['sender_id'] == st.session_state.auth['user_id']
-
-                            col1, col2 = st.columns([1, 4])
-                            with col1:
-                                st.write("You:" if is_from_me else f"{selected_parent_data.get('name', 'Parent')}:")
-                            with col2:
-                                st.text_area("", value=msg['content'], height=70, key=f"msg_{msg['id']}", disabled=True)
+                    # Newest page of the conversation, then only new messages on later reruns
+                    show_conversation(st.session_state.auth['user_id'], selected_parent,
+                                      selected_parent_data.get('name', 'Parent'))
 
                     # Send new message
                     with st.form("send_message_form_observer"):
                         new_message = st.text_area("Type your message:", height=100)
                         if st.form_submit_button("Send Message"):
                             if new_message.strip():
-                                # Insert message into database
-                                supabase.table('messages').insert({
-                                    "sender_id": st.session_state.auth['user_id'],
-                                    "receiver_id": selected_parent,
-                                    "content": new_message,
-                                    "timestamp": datetime.now().isoformat(),
-                                    "read": False
-                                }).execute()
+                                get_message_store().send(st.session_state.auth['user_id'], selected_parent,
+                                                         new_message, datetime.now().isoformat())
                                 st.success("Message sent!")
                                 st.rerun()
                             else:
@@ -2562,11 +2668,11 @@ def main():
         st.subheader("Parent Feedback on Monthly Reports")
 
         # Get all children assigned to this observer
-        mappings = supabase.table('observer_child_mappings').select("child_id").eq("observer_id", st.session_state.auth[
-            'user_id']).execute().data
-        child_ids = [m['child_id'] for m in mappings]
+        child_ids = data.observer_child_ids(st.session_state.auth['user_id'])
 
         if child_ids:
+            child_names = {c['id']: c.get('name') for c in data.children(child_ids)}
+
             # Get all monthly reports with feedback for these children
             reports = supabase.table('monthly_reports').select("*") \
                 .in_("child_id", child_ids) \
@@ -2577,8 +2683,7 @@ def main():
 
             if reports:
                 for report in reports:
-                    child = supabase.table('children').select("name").eq("id", report['child_id']).execute().data
-                    child_name = child[0]['name'] if child else "Unknown Child"
+                    child_name = child_names.get(report['child_id']) or "Unknown Child"
 
                     with st.expander(
                             f"Feedback for {child_name} - {calendar.month_name[report['month']]} {report['year']}"):
@@ -2590,6 +2695,8 @@ def main():
         else:
             st.warning("No children assigned to you yet")
 
+    show_read_cache_stats()
+
 
 if __name__ == "__main__":
     main()
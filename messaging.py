@@ -0,0 +1,84 @@
+"""Paginated reads of parent-observer conversations from the messages table.
+
+Pages are keyset-paginated on (timestamp, id), so fetching a page costs the
+same however long the conversation is. A conversation is read newest page
+first. Older pages come from the `before` cursor of the oldest loaded message.
+A client that already has messages polls with the `since` cursor of the newest
+one and gets only what arrived after it.
+"""
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(message):
+    """Opaque, URL-safe cursor for a message's (timestamp, id) position"""
+    raw = json.dumps([message['timestamp'], message['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (timestamp, id) from encode_cursor output; raises ValueError if malformed"""
+    try:
+        timestamp, message_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid message cursor")
+    return timestamp, message_id
+
+
+def _quote(value):
+    # PostgREST filter values containing reserved characters (":", ".", ",") must be double-quoted
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class MessageStore:
+    def __init__(self, client, page_size=DEFAULT_PAGE_SIZE):
+        self.supabase = client
+        self.page_size = page_size
+
+    def _page(self, user_a, user_b, limit, position=None, descending=True):
+        """One page of the conversation, optionally strictly before/after a (timestamp, id) position"""
+        limit = limit or self.page_size
+        keyset = ""
+        if position:
+            timestamp, message_id = position
+            op = "lt" if descending else "gt"
+            keyset = (f",or(timestamp.{op}.{_quote(timestamp)},"
+                      f"and(timestamp.eq.{_quote(timestamp)},id.{op}.{_quote(message_id)}))")
+
+        rows = self.supabase.table('messages').select("*") \
+            .or_(f"and(sender_id.eq.{user_a},receiver_id.eq.{user_b}{keyset}),"
+                 f"and(sender_id.eq.{user_b},receiver_id.eq.{user_a}{keyset})") \
+            .order('timestamp', desc=descending) \
+            .order('id', desc=descending) \
+            .limit(limit + 1) \
+            .execute().data or []
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if descending:
+            rows.reverse()
+        return rows, has_more
+
+    def latest(self, user_a, user_b, limit=None):
+        """Newest page, oldest first; returns (messages, has_older)"""
+        return self._page(user_a, user_b, limit)
+
+    def before(self, user_a, user_b, cursor, limit=None):
+        """The page just older than cursor, oldest first; returns (messages, has_older)"""
+        return self._page(user_a, user_b, limit, decode_cursor(cursor), descending=True)
+
+    def since(self, user_a, user_b, cursor, limit=None):
+        """Messages newer than cursor, oldest first; returns (messages, has_newer)"""
+        return self._page(user_a, user_b, limit, decode_cursor(cursor), descending=False)
+
+    def send(self, sender_id, receiver_id, content, timestamp):
+        rows = self.supabase.table('messages').insert({
+            "sender_id": sender_id,
+            "receiver_id": receiver_id,
+            "content": content,
+            "timestamp": timestamp,
+            "read": False
+        }).execute().data
+        return rows[0] if rows else None
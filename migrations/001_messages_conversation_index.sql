@@ -0,0 +1,4 @@
+-- Keyset pagination of a conversation (messaging.MessageStore) filters on the
+-- sender/receiver pair and walks (timestamp, id) in either direction.
+create index if not exists messages_conversation_keyset_idx
+    on messages (sender_id, receiver_id, timestamp desc, id desc);
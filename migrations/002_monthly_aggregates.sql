@@ -0,0 +1,72 @@
+-- Per-(child, month) aggregates read by the monthly report views (observation_store.ObservationStore).
+-- period is the 'YYYY-MM' prefix of observations.date.
+create table if not exists monthly_aggregates (
+    child_id text not null,
+    period text not null,
+    observation_count integer not null default 0,
+    observations_by_date jsonb not null default '{}'::jsonb,
+    strength_counts jsonb not null default '{}'::jsonb,
+    development_counts jsonb not null default '{}'::jsonb,
+    -- goal_id -> {"sum": total score, "count": alignments, "scores": [score, ...]}
+    goal_scores jsonb not null default '{}'::jsonb,
+    student_name text,
+    observer_name text,
+    updated_at timestamptz not null default now(),
+    primary key (child_id, period)
+);
+
+-- Add 1 to counts[key] for every non-empty key (repeated keys count repeatedly)
+create or replace function jsonb_increment(counts jsonb, keys text[])
+returns jsonb language sql immutable as $$
+    select coalesce(counts, '{}'::jsonb) || coalesce(
+        jsonb_object_agg(key, coalesce((counts ->> key)::integer, 0) + n), '{}'::jsonb)
+    from (
+        select key, count(*) as n from unnest(keys) as key
+        where key is not null and key <> ''
+        group by key
+    ) as increments
+$$;
+
+-- Increments only touch an existing row: a missing row is built from scratch
+-- (including the new observation) the first time the month is read.
+create or replace function record_observation_aggregate(
+    p_child_id text,
+    p_period text,
+    p_date text,
+    p_strengths text[],
+    p_development text[],
+    p_student_name text default null,
+    p_observer_name text default null
+) returns void language sql as $$
+    update monthly_aggregates set
+        observation_count = observation_count + 1,
+        observations_by_date = jsonb_increment(observations_by_date, array[p_date]),
+        strength_counts = jsonb_increment(strength_counts, p_strengths),
+        development_counts = jsonb_increment(development_counts, p_development),
+        student_name = coalesce(student_name, p_student_name),
+        observer_name = coalesce(observer_name, p_observer_name),
+        updated_at = now()
+    where child_id = p_child_id and period = p_period
+$$;
+
+create or replace function record_goal_alignment_aggregate(
+    p_child_id text,
+    p_period text,
+    p_goal_ids text[],
+    p_scores numeric[]
+) returns void language plpgsql as $$
+declare
+    i integer;
+begin
+    for i in 1 .. coalesce(array_length(p_goal_ids, 1), 0) loop
+        update monthly_aggregates set
+            goal_scores = goal_scores || jsonb_build_object(p_goal_ids[i], jsonb_build_object(
+                'sum', coalesce((goal_scores -> p_goal_ids[i] ->> 'sum')::numeric, 0) + p_scores[i],
+                'count', coalesce((goal_scores -> p_goal_ids[i] ->> 'count')::integer, 0) + 1,
+                'scores', coalesce(goal_scores -> p_goal_ids[i] -> 'scores', '[]'::jsonb) || to_jsonb(p_scores[i])
+            )),
+            updated_at = now()
+        where child_id = p_child_id and period = p_period;
+    end loop;
+end;
+$$;
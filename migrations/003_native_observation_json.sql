@@ -0,0 +1,60 @@
+-- Native JSONB for observations.strengths / areas_of_development / recommendations / full_data,
+-- plus observation_tags for server-side counting. After applying this file, run
+-- migrations/convert_observation_json.py to convert existing rows and backfill the tags.
+
+-- Text columns become jsonb string scalars here (one table rewrite); the conversion
+-- script then replaces each string with the JSON value it contains, batch by batch.
+-- Columns that are already jsonb are left alone.
+do $$
+declare
+    col text;
+begin
+    foreach col in array array['strengths', 'areas_of_development', 'recommendations', 'full_data'] loop
+        if exists (
+            select 1 from information_schema.columns
+            where table_schema = 'public' and table_name = 'observations'
+              and column_name = col and data_type in ('text', 'character varying', 'json')
+        ) then
+            execute format('alter table observations alter column %I type jsonb using to_jsonb(%I)', col, col);
+        end if;
+    end loop;
+end;
+$$;
+
+-- Rewrite the JSON columns of a batch of rows ([{id, strengths, ...}, ...]); returns rows updated.
+-- jsonb_populate_recordset gives each element the observations row type, so ids compare natively.
+create or replace function convert_observation_json_batch(p_rows jsonb)
+returns integer language sql as $$
+    with updated as (
+        update observations o set
+            strengths = coalesce(r.strengths, o.strengths),
+            areas_of_development = coalesce(r.areas_of_development, o.areas_of_development),
+            recommendations = coalesce(r.recommendations, o.recommendations),
+            full_data = coalesce(r.full_data, o.full_data)
+        from jsonb_populate_recordset(null::observations, p_rows) as r
+        where o.id = r.id
+        returning 1
+    )
+    select count(*)::integer from updated
+$$;
+
+create table if not exists observation_tags (
+    observation_id text not null,
+    child_id text not null,
+    date text,
+    kind text not null check (kind in ('strength', 'development')),
+    tag text not null
+);
+
+create index if not exists observation_tags_child_date_idx on observation_tags (child_id, date);
+create index if not exists observation_tags_observation_idx on observation_tags (observation_id);
+
+-- Tag frequencies for a child's observations dated in [p_start, p_end)
+create or replace function observation_tag_counts(p_child_id text, p_start text, p_end text)
+returns table (kind text, tag text, count bigint) language sql stable as $$
+    select kind, tag, count(*)
+    from observation_tags
+    where child_id = p_child_id and date >= p_start and date < p_end
+    group by kind, tag
+    order by count(*) desc
+$$;
@@ -0,0 +1,152 @@
+-- Keep monthly_aggregates (002) consistent with observations and goal_alignments.
+-- Triggers apply increments in the transaction that writes the row. Updates and
+-- deletes drop the affected aggregate rows. Every change bumps a per-(child, month)
+-- version, and ObservationStore.rebuild stores a rebuilt row through
+-- store_monthly_aggregate only if the version hasn't moved since the rebuild
+-- started reading. A row that a concurrent insert changed mid-rebuild is therefore
+-- never counted twice or lost.
+create table if not exists monthly_aggregate_versions (
+    child_id text not null,
+    period text not null,
+    version bigint not null default 0,
+    primary key (child_id, period)
+);
+
+-- 'YYYY-MM' for an ISO date string, null otherwise
+create or replace function observation_period(p_date text)
+returns text language sql immutable as $$
+    select case when p_date ~ '^\d{4}-\d{2}' then left(p_date, 7) end
+$$;
+
+-- Elements of a JSON array as text; also accepts a JSON string holding an array (rows not yet
+-- converted by convert_observation_json.py). Anything else gives an empty array.
+create or replace function jsonb_text_array(value jsonb)
+returns text[] language plpgsql immutable as $$
+begin
+    if jsonb_typeof(value) = 'string' then
+        value := (value #>> '{}')::jsonb;
+    end if;
+    if jsonb_typeof(value) = 'array' then
+        return array(select jsonb_array_elements_text(value));
+    end if;
+    return '{}';
+exception when others then
+    return '{}';
+end;
+$$;
+
+-- Bump a month's version; with p_drop also delete its aggregate so the next read rebuilds it.
+-- The version row stays locked until the caller's transaction ends, which orders it against
+-- store_monthly_aggregate.
+create or replace function touch_monthly_aggregate(p_child_id text, p_period text, p_drop boolean)
+returns void language plpgsql as $$
+begin
+    if p_child_id is null or p_period is null then
+        return;
+    end if;
+    insert into monthly_aggregate_versions (child_id, period, version) values (p_child_id, p_period, 1)
+    on conflict (child_id, period) do update set version = monthly_aggregate_versions.version + 1;
+    if p_drop then
+        delete from monthly_aggregates where child_id = p_child_id and period = p_period;
+    end if;
+end;
+$$;
+
+-- Store a rebuilt aggregate unless its month changed after version p_version was read; returns whether stored
+create or replace function store_monthly_aggregate(p_aggregate jsonb, p_version bigint)
+returns boolean language plpgsql as $$
+declare
+    v_child_id text := p_aggregate ->> 'child_id';
+    v_period text := p_aggregate ->> 'period';
+    current_version bigint;
+begin
+    insert into monthly_aggregate_versions (child_id, period) values (v_child_id, v_period)
+    on conflict (child_id, period) do nothing;
+    select version into current_version from monthly_aggregate_versions
+    where child_id = v_child_id and period = v_period
+    for update;
+    if current_version <> p_version then
+        return false;
+    end if;
+
+    insert into monthly_aggregates
+    select * from jsonb_populate_record(null::monthly_aggregates, p_aggregate || jsonb_build_object('updated_at', now()))
+    on conflict (child_id, period) do update set
+        observation_count = excluded.observation_count,
+        observations_by_date = excluded.observations_by_date,
+        strength_counts = excluded.strength_counts,
+        development_counts = excluded.development_counts,
+        goal_scores = excluded.goal_scores,
+        student_name = excluded.student_name,
+        observer_name = excluded.observer_name,
+        updated_at = excluded.updated_at;
+    return true;
+end;
+$$;
+
+create or replace function observations_maintain_aggregate()
+returns trigger language plpgsql as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        perform touch_monthly_aggregate(old.student_id::text, observation_period(old.date::text), true);
+    end if;
+    if tg_op = 'UPDATE' then
+        perform touch_monthly_aggregate(new.student_id::text, observation_period(new.date::text), true);
+    elsif tg_op = 'INSERT' then
+        perform touch_monthly_aggregate(new.student_id::text, observation_period(new.date::text), false);
+        perform record_observation_aggregate(
+            new.student_id::text,
+            observation_period(new.date::text),
+            new.date::text,
+            jsonb_text_array(to_jsonb(new.strengths)),
+            jsonb_text_array(to_jsonb(new.areas_of_development)),
+            nullif(new.student_name, ''),
+            nullif(new.observer_name, '')
+        );
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists observations_maintain_aggregate on observations;
+create trigger observations_maintain_aggregate
+    after insert or delete or update of student_id, date, strengths, areas_of_development, student_name, observer_name
+    on observations
+    for each row execute function observations_maintain_aggregate();
+
+-- (child_id, period) an alignment counts towards: its goal's child and its observation's month
+create or replace function alignment_month(p_goal_id text, p_report_id text)
+returns table (child_id text, period text) language sql stable as $$
+    select g.child_id::text, observation_period(o.date::text)
+    from goals g, observations o
+    where g.id::text = p_goal_id and o.id::text = p_report_id
+$$;
+
+create or replace function goal_alignments_maintain_aggregate()
+returns trigger language plpgsql as $$
+declare
+    target record;
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        for target in select * from alignment_month(old.goal_id::text, old.report_id::text) loop
+            perform touch_monthly_aggregate(target.child_id, target.period, true);
+        end loop;
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') then
+        for target in select * from alignment_month(new.goal_id::text, new.report_id::text) loop
+            perform touch_monthly_aggregate(target.child_id, target.period, tg_op = 'UPDATE');
+            if tg_op = 'INSERT' then
+                perform record_goal_alignment_aggregate(target.child_id, target.period, array[new.goal_id::text],
+                                                        array[coalesce(new.alignment_score, 0)::numeric]);
+            end if;
+        end loop;
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists goal_alignments_maintain_aggregate on goal_alignments;
+create trigger goal_alignments_maintain_aggregate
+    after insert or delete or update of goal_id, report_id, alignment_score
+    on goal_alignments
+    for each row execute function goal_alignments_maintain_aggregate();
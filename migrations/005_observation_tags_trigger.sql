@@ -0,0 +1,35 @@
+-- Maintain observation_tags (003) inside the transaction that writes the observation, and record
+-- when the backfill of older rows has finished. Apply after 004 (it uses jsonb_text_array), then run
+-- migrations/convert_observation_json.py (with --restart if it already ran before this file). When
+-- the script completes it sets the observation_tags_backfilled flag, and from then on
+-- ObservationStore counts tags from observation_tags instead of decoding observation rows.
+create table if not exists migration_flags (
+    name text primary key,
+    completed_at timestamptz not null default now()
+);
+
+create or replace function observations_maintain_tags()
+returns trigger language plpgsql as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        delete from observation_tags where observation_id = old.id::text;
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') and new.student_id is not null then
+        insert into observation_tags (observation_id, child_id, date, kind, tag)
+        select new.id::text, new.student_id::text, new.date::text, tags.kind, tags.tag
+        from (
+            select 'strength' as kind, tag from unnest(jsonb_text_array(to_jsonb(new.strengths))) as tag
+            union all
+            select 'development', tag from unnest(jsonb_text_array(to_jsonb(new.areas_of_development))) as tag
+        ) as tags
+        where tags.tag is not null and tags.tag <> '';
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists observations_maintain_tags on observations;
+create trigger observations_maintain_tags
+    after insert or delete or update of id, student_id, date, strengths, areas_of_development
+    on observations
+    for each row execute function observations_maintain_tags();
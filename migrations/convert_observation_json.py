@@ -0,0 +1,134 @@
+"""Convert observations' JSON-string columns to native JSONB and backfill observation_tags.
+
+Apply migrations/003_native_observation_json.sql through
+005_observation_tags_trigger.sql first, then run:
+
+    python migrations/convert_observation_json.py --batch-size 500
+
+Rows are read in id order one batch at a time (keyset on id), so memory use is
+bounded by the batch size. Any of strengths, areas_of_development,
+recommendations or full_data that still holds a JSON string is parsed and
+written back as a native value with one convert_observation_json_batch call per
+batch. The batch's observation_tags rows are then rewritten. After each batch,
+the last id is saved to the checkpoint file. An interrupted run resumes after
+it. --restart starts from the first row again. Strings that don't parse as JSON
+are left untouched and counted. A run that reaches the last row sets the
+observation_tags_backfilled flag, and rebuilds then count tags from
+observation_tags. If writing a batch fails, the script stops without saving
+that batch. Run it again to resume from that batch.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observation_store import ObservationStore, decode_json  # noqa: E402
+
+JSON_COLUMNS = ('strengths', 'areas_of_development', 'recommendations', 'full_data')
+UNPARSABLE = object()
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {"last_id": None, "scanned": 0, "converted": 0, "unparsable": 0, "tags": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    # Write then rename so a crash never leaves a half-written checkpoint
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def convert_row(row):
+    """(native column values to write, number of unparsable string columns) for one row"""
+    changes, unparsable = {}, 0
+    for column in JSON_COLUMNS:
+        value = row.get(column)
+        if not isinstance(value, str):
+            continue
+        decoded = decode_json(value, UNPARSABLE)
+        if decoded is UNPARSABLE:
+            unparsable += 1
+        elif decoded is not None:
+            changes[column] = decoded
+    return changes, unparsable
+
+
+def run(client, checkpoint_path, batch_size, dry_run=False):
+    store = ObservationStore(client)
+    checkpoint = load_checkpoint(checkpoint_path)
+    started = time.perf_counter()
+
+    while True:
+        query = client.table('observations') \
+            .select("id, student_id, date, " + ", ".join(JSON_COLUMNS)) \
+            .order('id') \
+            .limit(batch_size)
+        if checkpoint["last_id"] is not None:
+            query = query.gt('id', checkpoint["last_id"])
+        rows = query.execute().data or []
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            changes, unparsable = convert_row(row)
+            checkpoint["unparsable"] += unparsable
+            if changes:
+                updates.append({"id": row['id'], **changes})
+                row.update(changes)
+
+        if not dry_run:
+            if updates:
+                client.rpc('convert_observation_json_batch', {"p_rows": updates}).execute()
+            checkpoint["tags"] += store.write_tags([row['id'] for row in rows], rows)
+
+        checkpoint["scanned"] += len(rows)
+        checkpoint["converted"] += len(updates)
+        checkpoint["last_id"] = rows[-1]['id']
+        if not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+        elapsed = time.perf_counter() - started
+        print(f"scanned {checkpoint['scanned']}, converted {checkpoint['converted']}, "
+              f"unparsable {checkpoint['unparsable']}, tags {checkpoint['tags']} "
+              f"(last id {checkpoint['last_id']}, {elapsed:.1f}s)")
+
+        if len(rows) < batch_size:
+            break
+
+    if not dry_run:
+        # Every row up to the end has been converted and tagged; new rows are tagged by the trigger
+        store.mark_tags_backfilled()
+        print("observation_tags backfill complete")
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--checkpoint", default=".cache/convert_observation_json.json")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first row")
+    parser.add_argument("--dry-run", action="store_true", help="scan and count without writing anything")
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = create_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY"))
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    checkpoint = run(client, args.checkpoint, args.batch_size, args.dry_run)
+    print(json.dumps(checkpoint, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Observation and goal alignment writes that also maintain monthly aggregates.
+
+monthly_aggregates holds one row per (child, 'YYYY-MM') with the observation
+count, observations per date, strength and development-area counts and goal
+score sums (see migrations/002_monthly_aggregates.sql). Triggers on
+observations and goal_alignments (migrations/004_monthly_aggregate_triggers.sql)
+bump the counters in the same transaction as each insert, and drop the row
+when an observation or alignment is updated or deleted. Monthly views read the
+row in one query. A missing row is rebuilt from observations and alignments
+the first time its month is read. The rebuilt row is stored only if no write
+touched the month while it was being rebuilt.
+
+Each observation's strengths and development areas are also kept in
+observation_tags (migrations/003_native_observation_json.sql), one row per
+tag, by a trigger (migrations/005_observation_tags_trigger.sql), so tag
+frequencies are counted by the database with GROUP BY. Rebuilds only use those
+counts once migrations/convert_observation_json.py has backfilled every older
+row and set the observation_tags_backfilled flag. Until then they decode the
+observation rows.
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_TABLE = 'monthly_aggregates'
+VERSIONS_TABLE = 'monthly_aggregate_versions'
+TAGS_TABLE = 'observation_tags'
+FLAGS_TABLE = 'migration_flags'
+TAGS_BACKFILL_FLAG = 'observation_tags_backfilled'
+# Columns a report list renders; full_data (the raw model output) is left out of list reads
+REPORT_LIST_COLUMNS = "id, date, observer_name, observations, strengths, areas_of_development, recommendations"
+
+
+def month_range(year, month):
+    """[start, end) ISO dates for a month"""
+    start_date = f"{year}-{month:02d}-01"
+    end_date = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
+    return start_date, end_date
+
+
+def decode_json(value, default=None):
+    """A JSON column value stored natively or as a JSON string; default if the string won't parse"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return default
+    return value
+
+
+def decode_list(value):
+    """A list stored natively or as a JSON string; [] for anything unreadable"""
+    value = decode_json(value, [])
+    return value if isinstance(value, list) else []
+
+
+def observation_tag_rows(observation_id, row):
+    """observation_tags rows for an observation's strengths and development areas"""
+    tags = [("strength", tag) for tag in decode_list(row.get('strengths'))]
+    tags += [("development", tag) for tag in decode_list(row.get('areas_of_development'))]
+    return [{
+        "observation_id": str(observation_id),
+        "child_id": str(row['student_id']),
+        "date": row.get('date'),
+        "kind": kind,
+        "tag": str(tag)
+    } for kind, tag in tags if tag and row.get('student_id')]
+
+
+def _count(counts, keys):
+    for key in keys:
+        if key:
+            counts[key] = counts.get(key, 0) + 1
+
+
+class ObservationStore:
+    def __init__(self, client):
+        self.supabase = client
+        self._tags_backfilled = False
+
+    def insert_observation(self, row):
+        """Insert an observations row; triggers write its tags and count it in its month's aggregate"""
+        return self.supabase.table('observations').insert(row).execute()
+
+    def write_tags(self, observation_ids, rows):
+        """Replace the observation_tags rows of the given observations (used by the backfill)"""
+        ids = [str(i) for i in observation_ids if i is not None]
+        tag_rows = [tag for observation_id, row in zip(observation_ids, rows) if observation_id is not None
+                    for tag in observation_tag_rows(observation_id, row)]
+        if not ids:
+            return 0
+        self.supabase.table(TAGS_TABLE).delete().in_("observation_id", ids).execute()
+        if tag_rows:
+            self.supabase.table(TAGS_TABLE).insert(tag_rows).execute()
+        return len(tag_rows)
+
+    def tags_backfilled(self):
+        """Whether observation_tags covers every observation, i.e. the backfill flag is set"""
+        if not self._tags_backfilled:
+            try:
+                self._tags_backfilled = bool(self.supabase.table(FLAGS_TABLE).select("name")
+                                             .eq("name", TAGS_BACKFILL_FLAG).execute().data)
+            except Exception as e:
+                logger.warning(f"Reading the {TAGS_BACKFILL_FLAG} flag failed: {str(e)}")
+        return self._tags_backfilled
+
+    def mark_tags_backfilled(self):
+        self.supabase.table(FLAGS_TABLE).upsert({"name": TAGS_BACKFILL_FLAG}, on_conflict="name").execute()
+
+    def insert_alignments(self, alignment_rows):
+        """Insert goal_alignments rows; the aggregate trigger adds their scores"""
+        return self.supabase.table('goal_alignments').insert(alignment_rows).execute()
+
+    def monthly_aggregate(self, child_id, year, month):
+        """The (child, month) aggregate row, rebuilt and stored first if missing"""
+        rows = self.supabase.table(AGGREGATE_TABLE).select("*") \
+            .eq("child_id", str(child_id)) \
+            .eq("period", f"{year}-{month:02d}") \
+            .execute().data
+        if rows:
+            return rows[0]
+        return self.rebuild(child_id, year, month)
+
+    def rebuild(self, child_id, year, month):
+        """Recompute a month's aggregate from observations and goal alignments and store it"""
+        start_date, end_date = month_range(year, month)
+        period = f"{year}-{month:02d}"
+        # Read before anything else: a write after this point makes store_monthly_aggregate skip the row
+        version = self._version(child_id, period)
+        tag_counts = self.tag_counts(child_id, start_date, end_date)
+        columns = "date, student_name, observer_name"
+        if tag_counts is None:
+            columns += ", strengths, areas_of_development"
+        observations = self.supabase.table('observations') \
+            .select(columns) \
+            .eq("student_id", child_id) \
+            .gte("date", start_date) \
+            .lt("date", end_date) \
+            .execute().data or []
+
+        aggregate = {
+            "child_id": str(child_id),
+            "period": period,
+            "observation_count": len(observations),
+            "observations_by_date": {},
+            "strength_counts": {},
+            "development_counts": {},
+            "goal_scores": self._goal_scores(child_id, start_date, end_date),
+            "student_name": next((o['student_name'] for o in observations if o.get('student_name')), None),
+            "observer_name": next((o['observer_name'] for o in observations if o.get('observer_name')), None)
+        }
+        for observation in observations:
+            _count(aggregate["observations_by_date"], [observation.get('date')])
+        if tag_counts is not None:
+            aggregate["strength_counts"] = tag_counts["strength"]
+            aggregate["development_counts"] = tag_counts["development"]
+        else:
+            for observation in observations:
+                _count(aggregate["strength_counts"], [str(s) for s in decode_list(observation.get('strengths'))])
+                _count(aggregate["development_counts"],
+                       [str(a) for a in decode_list(observation.get('areas_of_development'))])
+
+        try:
+            stored = self.supabase.rpc('store_monthly_aggregate', {
+                "p_aggregate": aggregate,
+                "p_version": version
+            }).execute().data
+            if not stored:
+                logger.info(f"Monthly aggregate for {child_id} {period} changed during rebuild; not stored")
+        except Exception as e:
+            logger.warning(f"Storing monthly aggregate for {child_id} {period} failed: {str(e)}")
+        return aggregate
+
+    def _version(self, child_id, period):
+        """Current change counter of a (child, month), 0 if it was never written"""
+        rows = self.supabase.table(VERSIONS_TABLE).select("version") \
+            .eq("child_id", str(child_id)) \
+            .eq("period", period) \
+            .execute().data
+        return rows[0]['version'] if rows else 0
+
+    def tag_counts(self, child_id, start_date, end_date):
+        """{'strength': {tag: n}, 'development': {tag: n}} counted server-side, or None if unavailable"""
+        if not self.tags_backfilled():
+            return None
+        try:
+            rows = self.supabase.rpc('observation_tag_counts', {
+                "p_child_id": str(child_id),
+                "p_start": start_date,
+                "p_end": end_date
+            }).execute().data or []
+        except Exception as e:
+            logger.warning(f"Counting observation tags for {child_id} failed: {str(e)}")
+            return None
+        counts = {"strength": {}, "development": {}}
+        for row in rows:
+            if row.get('kind') in counts and row.get('tag'):
+                counts[row['kind']][row['tag']] = row.get('count') or 0
+        return counts
+
+    def _goal_scores(self, child_id, start_date, end_date):
+        """Scores of the child's goals from alignments whose observation is dated in [start, end)"""
+        goal_ids = [g['id'] for g in self.supabase.table('goals').select("id").eq("child_id", child_id)
+                    .execute().data or []]
+        if not goal_ids:
+            return {}
+        alignments = self.supabase.table('goal_alignments').select("goal_id, report_id, alignment_score") \
+            .in_("goal_id", goal_ids) \
+            .execute().data or []
+        report_ids = list({a['report_id'] for a in alignments if a.get('report_id')})
+        if not report_ids:
+            return {}
+        in_month = {r['id'] for r in self.supabase.table('observations').select("id")
+                    .in_("id", report_ids).gte("date", start_date).lt("date", end_date).execute().data or []}
+
+        goal_scores = {}
+        for alignment in alignments:
+            if alignment.get('report_id') not in in_month:
+                continue
+            score = alignment.get('alignment_score') or 0
+            entry = goal_scores.setdefault(str(alignment['goal_id']), {"sum": 0, "count": 0, "scores": []})
+            entry["sum"] += score
+            entry["count"] += 1
+            entry["scores"].append(score)
+        return goal_scores
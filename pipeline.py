@@ -0,0 +1,111 @@
+"""Stage-graph execution for the observation ingestion pipeline.
+
+A StageGraph is a set of named stages. Each stage is a callable that takes
+the results of the stages it runs after. A stage starts on a thread pool as
+soon as all of its inputs are ready. Independent stages, such as the Storage
+upload and the OCR -> Groq -> Gemini chain, therefore overlap, and wall-clock
+time follows the critical path instead of the sum of the stages. Every stage
+is timed. When a stage fails, the stages that depend on it are skipped. The
+results of all other stages are kept in the PipelineResult.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineResult:
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.timings = {}  # stage -> ms
+        self.skipped = {}  # stage -> the failed or skipped stage it depended on
+        self.wall_ms = 0.0
+
+    @property
+    def ok(self):
+        return not self.errors and not self.skipped
+
+    def get(self, name, default=None):
+        return self.results.get(name, default)
+
+    def raise_for(self, name):
+        """Re-raise the failure that kept a stage from producing a result, if any"""
+        while name in self.skipped:
+            name = self.skipped[name]
+        if name in self.errors:
+            raise self.errors[name]
+
+    def summary(self):
+        stages = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.timings.items())
+        return f"{stages} (wall {self.wall_ms:.0f} ms, stages total {sum(self.timings.values()):.0f} ms)"
+
+
+class StageGraph:
+    def __init__(self, max_workers=4, initializer=None):
+        self.max_workers = max_workers
+        # Runs in every worker thread before its first stage, e.g. to attach a Streamlit script context
+        self.initializer = initializer
+        self.stages = {}
+
+    def add(self, name, fn, after=()):
+        """Add a stage called as fn(*results of `after`); dependencies must already be added"""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [dep for dep in after if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(missing)}")
+        self.stages[name] = (fn, tuple(after))
+        return self
+
+    @staticmethod
+    def _timed(fn, args):
+        started = time.perf_counter()
+        try:
+            value, error = fn(*args), None
+        except Exception as e:
+            value, error = None, e
+        return value, (time.perf_counter() - started) * 1000, error
+
+    def _schedule(self, pending, result, executor, running):
+        """Submit every pending stage whose inputs are ready and skip those whose inputs failed"""
+        changed = True
+        while changed:
+            changed = False
+            for name, (fn, after) in list(pending.items()):
+                blocked = next((dep for dep in after if dep in result.errors or dep in result.skipped), None)
+                if blocked:
+                    result.skipped[name] = blocked
+                elif all(dep in result.results for dep in after):
+                    running[executor.submit(self._timed, fn, [result.results[dep] for dep in after])] = name
+                else:
+                    continue
+                del pending[name]
+                changed = True
+
+    def run(self):
+        result = PipelineResult()
+        pending = dict(self.stages)
+        running = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage",
+                                initializer=self.initializer) as executor:
+            self._schedule(pending, result, executor, running)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    value, elapsed_ms, error = future.result()
+                    result.timings[name] = elapsed_ms
+                    if error is None:
+                        result.results[name] = value
+                    else:
+                        logger.warning(f"Stage {name} failed after {elapsed_ms:.0f} ms: {str(error)}")
+                        result.errors[name] = error
+                self._schedule(pending, result, executor, running)
+
+        result.wall_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Pipeline: {result.summary()}")
+        return result
@@ -0,0 +1,94 @@
+"""Read models for admin views.
+
+Each model loads its source tables with one paged query per table and joins
+them in memory, so render cost no longer grows with one lookup per row.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+FETCH_PAGE_SIZE = 1000
+
+
+def fetch_all(build_query, page_size=FETCH_PAGE_SIZE):
+    """Run a select page by page (PostgREST caps each response) and return all rows"""
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+
+def admin_stat_queries(client):
+    """Dashboard counters as query builders; each is an exact count with no rows transferred"""
+    return {
+        "total_users": lambda: client.table('users').select("id", count="exact", head=True),
+        "total_children": lambda: client.table('children').select("id", count="exact", head=True),
+        "total_reports": lambda: client.table('observations').select("id", count="exact", head=True),
+        "active_observers": lambda: client.table('users').select("id", count="exact", head=True).eq("role", "Observer")
+    }
+
+
+def count_admin_stats(client):
+    """Run the admin_stat_queries concurrently and return {name: count}"""
+    queries = admin_stat_queries(client)
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = {name: executor.submit(lambda build=build: build().execute().count or 0)
+                   for name, build in queries.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+class ObserverMappingReadModel:
+    """observer_child_mappings joined with observer and child names"""
+
+    def __init__(self, mappings, observers, children):
+        self.observers = observers
+        self.children = children
+        observers_by_id = {o['id']: o for o in observers}
+        children_by_id = {c['id']: c for c in children}
+
+        self.rows = []
+        for mapping in mappings:
+            observer = observers_by_id.get(mapping['observer_id'])
+            child = children_by_id.get(mapping['child_id'])
+            self.rows.append({
+                "id": mapping['id'],
+                "observer_id": mapping['observer_id'],
+                "observer_name": observer.get('name', 'N/A') if observer else mapping['observer_id'],
+                "observer_email": observer.get('email', '') if observer else '',
+                "child_id": mapping['child_id'],
+                "child_name": child.get('name', 'N/A') if child else mapping['child_id']
+            })
+        self.rows.sort(key=lambda row: (str(row['observer_name']).lower(), str(row['child_name']).lower()))
+
+    @classmethod
+    def load(cls, client):
+        """Three queries: mappings, observers and children"""
+        mappings = fetch_all(lambda: client.table('observer_child_mappings').select("id, observer_id, child_id")
+                             .order('id'))
+        observers = fetch_all(lambda: client.table('users').select("id, name, email").eq('role', 'Observer')
+                              .order('id'))
+        children = fetch_all(lambda: client.table('children').select("id, name").order('id'))
+        return cls(mappings, observers, children)
+
+    def search(self, query=''):
+        """Rows whose observer name/email or child name contains query (case-insensitive)"""
+        query = (query or '').strip().lower()
+        if not query:
+            return self.rows
+        return [row for row in self.rows
+                if query in f"{row['observer_name']} {row['observer_email']} {row['child_name']}".lower()]
+
+    def page_count(self, query='', page_size=25):
+        return max(1, math.ceil(len(self.search(query)) / page_size))
+
+    def page(self, query='', page=1, page_size=25):
+        """Return (rows, total_matches, total_pages) for a 1-based page of search results"""
+        matches = self.search(query)
+        pages = max(1, math.ceil(len(matches) / page_size))
+        page = min(max(1, page), pages)
+        start = (page - 1) * page_size
+        return matches[start:start + page_size], len(matches), pages
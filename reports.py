@@ -0,0 +1,91 @@
+"""Paginated, projected reads of a child's observation reports.
+
+Reports are listed newest first and keyset-paginated on (date, id). The
+`before` cursor of a page's last report fetches the next page. Each page costs
+the same however many reports the child has. Callers pick the columns they need
+with a fields list. List views leave out the large full_data blob, which the
+detail read returns for one report.
+"""
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+REPORT_FIELDS = (
+    "id", "student_id", "username", "student_name", "observer_name", "class_name", "date", "observations",
+    "strengths", "areas_of_development", "recommendations", "timestamp", "filename", "full_data",
+    "theme_of_day", "curiosity_seed", "processed_by_admin", "file_url"
+)
+LIST_FIELDS = ("id", "date", "student_name", "observer_name", "observations")
+# The list's keyset columns, always selected so every page can produce a cursor
+KEY_FIELDS = ("id", "date")
+
+
+def parse_fields(fields, default):
+    """Column list from a comma-separated fields parameter; raises ValueError on unknown columns"""
+    if not fields:
+        return list(default)
+    requested = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in requested if f not in REPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown report fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+def encode_cursor(report):
+    """Opaque, URL-safe cursor for a report's (date, id) position"""
+    raw = json.dumps([report.get('date'), report['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (date, id) from encode_cursor output; raises ValueError if malformed"""
+    try:
+        date, report_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Invalid report cursor")
+    return date, report_id
+
+
+def _quote(value):
+    # PostgREST filter values containing reserved characters (":", ".", ",") must be double-quoted
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class ReportStore:
+    def __init__(self, client, page_size=DEFAULT_PAGE_SIZE):
+        self.supabase = client
+        self.page_size = page_size
+
+    def page(self, child_id, fields=LIST_FIELDS, before=None, limit=None):
+        """Newest-first page of a child's reports; returns (reports, next_cursor or None)"""
+        limit = max(1, min(limit or self.page_size, MAX_PAGE_SIZE))
+        columns = list(dict.fromkeys([*KEY_FIELDS, *fields]))
+        query = self.supabase.table('observations').select(", ".join(columns)).eq("student_id", child_id)
+
+        if before:
+            date, report_id = decode_cursor(before)
+            # Undated reports sort after every dated one
+            if date is None:
+                query = query.is_("date", "null").lt("id", report_id)
+            else:
+                query = query.or_(f"date.lt.{_quote(date)},"
+                                  f"and(date.eq.{_quote(date)},id.lt.{_quote(report_id)}),"
+                                  f"date.is.null")
+
+        rows = query.order('date', desc=True, nullsfirst=False) \
+            .order('id', desc=True) \
+            .limit(limit + 1) \
+            .execute().data or []
+
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def get(self, report_id, fields=None):
+        """One report with the given columns (all of them by default), or None"""
+        rows = self.supabase.table('observations').select(", ".join(fields) if fields else "*") \
+            .eq("id", report_id) \
+            .limit(1) \
+            .execute().data
+        return rows[0] if rows else None
@@ -425,7 +425,7 @@ async function processImage() {
                 })
             });
 
-            const data = await response.json();
+            const data = await waitForJob(await response.json());
             hideLoading();
 
             if (data.success) {
@@ -466,7 +466,7 @@ async function processAudio() {
             body: formData
         });
 
-        const data = await response.json();
+        const data = await waitForJob(await response.json());
         hideLoading();
 
         if (data.success) {
@@ -487,6 +487,35 @@ async function processAudio() {
     }
 }
 
+// Poll a background processing job until it finishes (or timeoutMs passes) and return its result.
+// The default allows for the server's 15 minute transcription deadline plus report generation.
+async function waitForJob(submitData, intervalMs = 2000, timeoutMs = 20 * 60 * 1000) {
+    if (!submitData.success || !submitData.job_id) {
+        return submitData;
+    }
+
+    const giveUpAt = Date.now() + timeoutMs;
+    while (true) {
+        if (Date.now() >= giveUpAt) {
+            return { success: false, message: 'Processing is taking too long. Please check back later.' };
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+
+        const response = await fetch(`${API_BASE}/jobs/${submitData.job_id}`);
+        const data = await response.json();
+
+        if (!data.success) {
+            return data;
+        }
+        if (data.job.status === 'succeeded') {
+            return { success: true, ...data.job.result };
+        }
+        if (data.job.status === 'failed') {
+            return { success: false, message: data.job.error || 'Processing failed' };
+        }
+    }
+}
+
 async function regenerateReport() {
     const editedTranscript = document.getElementById('transcript-text').value;
     const sessionInfo = getSessionInfo();
@@ -672,16 +701,73 @@ async function markGoalComplete(goalId) {
 }
 
 // Message System
-async function loadObserverMessages() {
+// Newest-message cursor per conversation, so refreshes fetch only new messages
+const messageCursors = {};
+// Oldest loaded page per conversation ({query, containerId, before}), for "Load older messages"
+const olderMessageCursors = {};
+
+async function fetchConversation(query, cursorKey, containerId, incremental) {
+    const since = incremental && messageCursors[cursorKey] ? `&since=${encodeURIComponent(messageCursors[cursorKey])}` : '';
+    const response = await fetch(`${API_BASE}/messages?${query}${since}`);
+    const data = await response.json();
+
+    if (data.success) {
+        if (since && data.has_more) {
+            // Too many new messages for one page: start over from the newest page
+            return fetchConversation(query, cursorKey, containerId, false);
+        }
+        if (since) {
+            appendMessages(data.messages, containerId);
+        } else {
+            displayMessages(data.messages, containerId);
+            olderMessageCursors[cursorKey] = { query, containerId, before: data.has_more ? data.before : null };
+            renderLoadOlderButton(cursorKey);
+        }
+        messageCursors[cursorKey] = data.since;
+    }
+    return data;
+}
+
+function renderLoadOlderButton(cursorKey) {
+    const older = olderMessageCursors[cursorKey];
+    const container = document.getElementById(older.containerId);
+    const existingButton = container.querySelector('.load-older-messages');
+    if (existingButton) existingButton.remove();
+    if (older.before) {
+        container.insertAdjacentHTML('afterbegin',
+            `<button class="secondary-btn load-older-messages" onclick="loadOlderMessages('${cursorKey}')">Load older messages</button>`);
+    }
+}
+
+async function loadOlderMessages(cursorKey) {
+    const older = olderMessageCursors[cursorKey];
+    if (!older || !older.before) return;
+
+    try {
+        const response = await fetch(`${API_BASE}/messages?${older.query}&before=${encodeURIComponent(older.before)}`);
+        const data = await response.json();
+
+        if (data.success) {
+            prependMessages(data.messages, older.containerId);
+            older.before = data.has_more ? data.before : null;
+            renderLoadOlderButton(cursorKey);
+        } else {
+            showMessage(data.message, 'error');
+        }
+    } catch (error) {
+        showMessage('Failed to load older messages', 'error');
+    }
+}
+
+async function loadObserverMessages(incremental = false) {
     const parentId = document.getElementById('parent-select').value;
     if (!parentId) return;
 
     try {
-        const response = await fetch(`${API_BASE}/messages?observer_id=${currentUser.id}&parent_id=${parentId}`);
-        const data = await response.json();
+        const data = await fetchConversation(`observer_id=${currentUser.id}&parent_id=${parentId}`,
+            `observer:${parentId}`, 'message-history', incremental);
 
         if (data.success) {
-            displayMessages(data.messages, 'message-history');
             document.getElementById('send-message-section').classList.remove('hidden');
 
             // Show child info
@@ -704,7 +790,40 @@ function displayMessages(messages, containerId) {
         return;
     }
 
-    container.innerHTML = messages.map(message => `
+    container.innerHTML = messages.map(messageHTML).join('');
+
+    container.scrollTop = container.scrollHeight;
+}
+
+function appendMessages(messages, containerId) {
+    const container = document.getElementById(containerId);
+    if (messages.length === 0) return;
+
+    if (!container.querySelector('.message-item')) {
+        displayMessages(messages, containerId);
+        return;
+    }
+    container.insertAdjacentHTML('beforeend', messages.map(messageHTML).join(''));
+    container.scrollTop = container.scrollHeight;
+}
+
+function prependMessages(messages, containerId) {
+    const container = document.getElementById(containerId);
+    if (messages.length === 0) return;
+
+    // Keep the messages the user is looking at in place while older ones are added above them
+    const distanceFromBottom = container.scrollHeight - container.scrollTop;
+    const firstMessage = container.querySelector('.message-item');
+    if (firstMessage) {
+        firstMessage.insertAdjacentHTML('beforebegin', messages.map(messageHTML).join(''));
+    } else {
+        container.insertAdjacentHTML('beforeend', messages.map(messageHTML).join(''));
+    }
+    container.scrollTop = container.scrollHeight - distanceFromBottom;
+}
+
+function messageHTML(message) {
+    return `
         <div class="message-item ${message.sender_id === currentUser.id ? 'sent' : 'received'}">
             <div class="message-bubble ${message.sender_id === currentUser.id ? 'sent' : 'received'}">
                 <div class="message-sender">${message.sender_name}</div>
@@ -712,9 +831,7 @@ function displayMessages(messages, containerId) {
                 <div class="message-time">${formatDateTime(message.timestamp)}</div>
             </div>
         </div>
-    `).join('');
-
-    container.scrollTop = container.scrollHeight;
+    `;
 }
 
 async function sendMessage() {
@@ -741,7 +858,7 @@ async function sendMessage() {
 
         if (data.success) {
             document.getElementById('new-message').value = '';
-            loadObserverMessages();
+            loadObserverMessages(true);
             showMessage('Message sent!');
         } else {
             showMessage(data.message, 'error');
@@ -991,40 +1108,70 @@ async function loadParentData() {
             document.getElementById('child-observer').textContent = child.observer_name || 'N/A';
         }
 
-        // Load reports
-        const reportsResponse = await fetch(`${API_BASE}/reports?child_id=${currentUser.child_id}`);
-        const reportsData = await reportsResponse.json();
-
-        if (reportsData.success) {
-            displayReports(reportsData.reports);
-        }
+        await loadParentReports();
     } catch (error) {
         showMessage('Error loading parent data', 'error');
     }
 }
 
-function displayReports(reports) {
+// Report list paging: next_cursor of the last loaded page, null once everything is loaded
+let reportsCursor = null;
+
+async function loadParentReports(append = false) {
+    const params = new URLSearchParams({
+        child_id: currentUser.child_id,
+        fields: 'id,date,observer_name,observations'
+    });
+    if (append && reportsCursor) {
+        params.set('before', reportsCursor);
+    }
+
+    const response = await fetch(`${API_BASE}/reports?${params}`);
+    const data = await response.json();
+
+    if (data.success) {
+        reportsCursor = data.next_cursor;
+        displayReports(data.reports, append);
+    }
+}
+
+function displayReports(reports, append = false) {
     const container = document.getElementById('reports-container');
+    const existingButton = document.getElementById('load-more-reports');
+    if (existingButton) {
+        existingButton.remove();
+    }
 
-    if (reports.length === 0) {
+    if (!append && reports.length === 0) {
         container.innerHTML = '<p>No reports available yet.</p>';
         return;
     }
 
-    container.innerHTML = reports.map(report => `
+    const html = reports.map(report => `
         <div class="report-item" onclick="viewReport('${report.id}')">
             <div class="report-date">${formatDate(report.date)}</div>
             <div class="report-preview">
                 Observer: ${report.observer_name}<br>
-                ${report.observations.substring(0, 150)}...
+                ${(report.observations || '').substring(0, 150)}...
             </div>
         </div>
     `).join('');
+
+    if (append) {
+        container.insertAdjacentHTML('beforeend', html);
+    } else {
+        container.innerHTML = html;
+    }
+
+    if (reportsCursor) {
+        container.insertAdjacentHTML('beforeend',
+            '<button id="load-more-reports" onclick="loadParentReports(true)" class="secondary-btn">Load more reports</button>');
+    }
 }
 
 async function viewReport(reportId) {
     try {
-        const response = await fetch(`${API_BASE}/reports/${reportId}`);
+        const response = await fetch(`${API_BASE}/reports/${reportId}?fields=id,full_data`);
         const data = await response.json();
 
         if (data.success) {
@@ -1038,13 +1185,12 @@ async function viewReport(reportId) {
     }
 }
 
-async function loadParentMessages() {
+async function loadParentMessages(incremental = false) {
     try {
-        const response = await fetch(`${API_BASE}/messages?parent_id=${currentUser.id}`);
-        const data = await response.json();
+        const data = await fetchConversation(`parent_id=${currentUser.id}`, 'parent', 'parent-message-history',
+            incremental);
 
         if (data.success) {
-            displayMessages(data.messages, 'parent-message-history');
 
             // Show observer info
             const observerInfo = document.getElementById('observer-info');
@@ -1081,7 +1227,7 @@ async function sendParentMessage() {
 
         if (data.success) {
             document.getElementById('parent-new-message').value = '';
-            loadParentMessages();
+            loadParentMessages(true);
             showMessage('Message sent!');
         } else {
             showMessage(data.message, 'error');
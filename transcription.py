@@ -0,0 +1,189 @@
+"""AssemblyAI transcription client shared by the Streamlit app (main.py) and the Flask API (app.py).
+
+Completion is detected either by polling with exponential backoff and jitter
+under an overall deadline, or (app.py only) by AssemblyAI calling a local
+webhook route, in which case no thread waits on the transcript at all.
+The API base URL is configurable so both modes can run against a local
+stand-in for AssemblyAI.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+DEFAULT_BASE_URL = "https://api.assemblyai.com/v2"
+WEBHOOK_AUTH_HEADER = "X-Observer-Webhook-Secret"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class TranscriptionError(Exception):
+    """Transcription failed; the message is suitable for showing to the user"""
+
+
+class TranscriptionTimeout(TranscriptionError):
+    """The transcript did not complete before the deadline"""
+
+
+def iter_chunks(file_obj, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Yield a file-like object's contents in chunks, from its current position"""
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def backoff_delays(initial=1.0, maximum=15.0, multiplier=2.0):
+    """Yield exponentially growing delays with equal jitter (half fixed, half random)"""
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(maximum, delay * multiplier)
+
+
+class AssemblyAITranscriber:
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, deadline=900, initial_delay=1.0, max_delay=15.0,
+                 webhook_url=None, webhook_secret=None, http=None):
+        self.api_key = api_key
+        # Anything with requests-style get/post, e.g. a pooled http_client.HTTPClient
+        self.http = http or requests
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+
+    @property
+    def headers(self):
+        return {"authorization": self.api_key}
+
+    def upload(self, data, chunk_size=UPLOAD_CHUNK_SIZE):
+        """Upload audio and return its upload URL.
+
+        data may be bytes or a file-like object; file-like objects are streamed
+        with chunked transfer encoding so only one chunk is held in memory.
+        """
+        if hasattr(data, 'read'):
+            data = iter_chunks(data, chunk_size)
+        response = self.http.post(f"{self.base_url}/upload", headers=self.headers, data=data)
+        if response.status_code != 200:
+            raise TranscriptionError(f"Error uploading audio: {response.text}")
+        return response.json()["upload_url"]
+
+    def request_transcript(self, upload_url):
+        """Start transcription of an uploaded file and return the transcript ID"""
+        transcript_request = {
+            "audio_url": upload_url,
+            "language_code": "en"
+        }
+        if self.webhook_url:
+            transcript_request["webhook_url"] = self.webhook_url
+            if self.webhook_secret:
+                transcript_request["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+                transcript_request["webhook_auth_header_value"] = self.webhook_secret
+
+        response = self.http.post(f"{self.base_url}/transcript", json=transcript_request, headers=self.headers)
+        if response.status_code != 200:
+            raise TranscriptionError(f"Error requesting transcription: {response.text}")
+        return response.json()["id"]
+
+    def submit(self, data):
+        """Upload audio and start its transcription; returns the transcript ID"""
+        return self.request_transcript(self.upload(data))
+
+    def get_transcript(self, transcript_id):
+        response = self.http.get(f"{self.base_url}/transcript/{transcript_id}", headers=self.headers)
+        if response.status_code != 200:
+            raise TranscriptionError(f"Error checking transcription status: {response.text}")
+        return response.json()
+
+    def result_text(self, transcript_id):
+        """Return the text of a finished transcript, raising if it failed or is still running"""
+        data = self.get_transcript(transcript_id)
+        if data["status"] == "completed":
+            return data["text"]
+        if data["status"] == "error":
+            raise TranscriptionError(f"Transcription error: {data.get('error', 'Unknown error')}")
+        raise TranscriptionTimeout("Error: Transcription timed out or failed.")
+
+    def wait(self, transcript_id, on_progress=None):
+        """Poll until the transcript completes, backing off between requests.
+
+        on_progress(percent) is called with AssemblyAI's percent_done when reported.
+        Raises TranscriptionTimeout once the deadline has passed.
+        """
+        deadline_at = time.monotonic() + self.deadline
+        for delay in backoff_delays(self.initial_delay, self.max_delay):
+            data = self.get_transcript(transcript_id)
+            if data["status"] == "completed":
+                return data["text"]
+            if data["status"] == "error":
+                raise TranscriptionError(f"Transcription error: {data.get('error', 'Unknown error')}")
+            if on_progress and data.get("percent_done"):
+                on_progress(data["percent_done"])
+
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+        raise TranscriptionTimeout("Error: Transcription timed out or failed.")
+
+    def transcribe(self, data, on_progress=None):
+        """Upload, start and wait for a transcript by polling; returns the text"""
+        return self.wait(self.submit(data), on_progress)
+
+
+class WebhookRegistry:
+    """Callbacks for transcripts awaiting AssemblyAI's completion webhook.
+
+    callback(status) is invoked once: with the webhook's status when it
+    arrives, or with None when the deadline passes first. Webhooks that arrive
+    before their transcript is registered are remembered briefly.
+    """
+
+    def __init__(self, max_early=1000):
+        self.max_early = max_early
+        self._pending = {}
+        self._early = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, transcript_id, callback, deadline=None):
+        with self._lock:
+            if transcript_id in self._early:
+                status = self._early.pop(transcript_id)
+            else:
+                timer = None
+                if deadline:
+                    timer = threading.Timer(deadline, self._expire, args=(transcript_id,))
+                    timer.daemon = True
+                    timer.start()
+                self._pending[transcript_id] = (callback, timer)
+                return
+        callback(status)
+
+    def notify(self, transcript_id, status):
+        """Deliver a webhook; returns False if no transcript was waiting for it"""
+        with self._lock:
+            entry = self._pending.pop(transcript_id, None)
+            if entry is None:
+                self._early[transcript_id] = status
+                while len(self._early) > self.max_early:
+                    self._early.popitem(last=False)
+                return False
+        callback, timer = entry
+        if timer:
+            timer.cancel()
+        callback(status)
+        return True
+
+    def _expire(self, transcript_id):
+        with self._lock:
+            entry = self._pending.pop(transcript_id, None)
+        if entry:
+            entry[0](None)
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,7 @@
+"""Production entry point for the Flask API.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`python app.py` still starts the single-process Werkzeug development server.
+"""
+from app import app  # noqa: F401